@@ -0,0 +1,109 @@
+"""
+ -------------------------------------------------------------------------
+ spygame - broad_phase.py
+
+ compares the Stage's Sprite-vs-Sprite collision solving (Stage.solve_collisions) with
+ different broad-phases: brute-force (no broad-phase), SpatialHashGrid and SweepAndPrune,
+ and with the batched NumpyAABBCollision detector
+
+ the Sprites are spread randomly over a long horizontal corridor (the typical
+ platformer level shape) and move a few pixels each frame
+
+ usage: python broad_phase.py [--frames 20] [--sizes 100,1000,10000] [--max-brute 1000]
+ -------------------------------------------------------------------------
+"""
+
+import argparse
+import os
+import random
+import time
+
+# we don't need a window for this
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import spygame as spyg
+
+
+class BenchSprite(spyg.Sprite):
+    """
+    A simple 16x16 Sprite that counts its collisions.
+    """
+    def __init__(self, x, y):
+        super().__init__(x, y, width_height=(16, 16))
+        self.num_collisions = 0
+        self.register_event("collision")
+        self.on_event("collision")
+
+    def collision(self, col):
+        self.num_collisions += 1
+
+
+def setup_stage(display, num_sprites, options, corridor_w, corridor_h, seed=0):
+    """
+    Creates a new Stage with num_sprites randomly placed 16x16 Sprites in a corridor of the given size.
+
+    :param spyg.Display display: the Display to use for the Stage's Screen
+    :param int num_sprites: the number of Sprites to add to the Stage
+    :param dict options: the options for the Stage (e.g. broad_phase and physics_collision_detector)
+    :param int corridor_w: the width of the corridor in pixels
+    :param int corridor_h: the height of the corridor in pixels
+    :param int seed: the random seed to use for placing the Sprites
+    :return: the new Stage object
+    :rtype: spyg.Stage
+    """
+    rnd = random.Random(seed)
+    stage = spyg.Stage(spyg.SimpleScreen("bench", display=display), dict(options))
+    for _ in range(num_sprites):
+        stage.add_sprite(BenchSprite(rnd.randrange(corridor_w), rnd.randrange(corridor_h)), "bench")
+    return stage
+
+
+def run(stage, frames, seed=1):
+    """
+    Moves all Sprites of the Stage a little and solves all collisions for the given number of frames.
+
+    :param spyg.Stage stage: the Stage to run
+    :param int frames: the number of frames to run
+    :param int seed: the random seed to use for moving the Sprites
+    :return: tuple of seconds per frame and number of collisions found over all frames
+    :rtype: Tuple[float,int]
+    """
+    rnd = random.Random(seed)
+    total = 0.0
+    for _ in range(frames):
+        for sprite in stage.sprites:
+            sprite.rect.x += rnd.randint(-2, 2)
+            sprite.rect.y += rnd.randint(-2, 2)
+        start = time.perf_counter()
+        stage.solve_collisions()
+        total += time.perf_counter() - start
+    return total / frames, sum(sprite.num_collisions for sprite in stage.sprites)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="spygame broad-phase benchmark")
+    parser.add_argument("--frames", type=int, default=20, help="number of frames to run per setup")
+    parser.add_argument("--sizes", type=str, default="100,1000,10000", help="comma separated list of Sprite counts")
+    parser.add_argument("--max-brute", type=int, default=1000, help="skip the brute-force run for Sprite counts above this (it's O(n^2))")
+    args = parser.parse_args()
+
+    display = spyg.Display(320, 240, "broad-phase benchmark")
+    setups = [
+        ("brute-force", {"broad_phase": None}),
+        ("SpatialHashGrid", {"broad_phase": spyg.SpatialHashGrid}),
+        ("SweepAndPrune", {"broad_phase": spyg.SweepAndPrune}),
+        ("NumpyAABB", {"physics_collision_detector": spyg.NumpyAABBCollision}),
+    ]
+
+    print("{:>7} {:>16} {:>14} {:>11}".format("sprites", "broad-phase", "ms/frame", "collisions"))
+    for num in [int(n) for n in args.sizes.split(",")]:
+        # keep the density constant: a 256px high corridor that's as long as needed for ~1 Sprite per 4x4 tiles
+        corridor_h = 256
+        corridor_w = max(num * 64 * 64 // corridor_h, 320)
+        for name, options in setups:
+            if name == "brute-force" and num > args.max_brute:
+                print("{:>7} {:>16} {:>14} {:>11}".format(num, name, "skipped", "-"))
+                continue
+            stage = setup_stage(display, num, options, corridor_w, corridor_h)
+            secs, cols = run(stage, args.frames)
+            print("{:>7} {:>16} {:>14.3f} {:>11}".format(num, name, secs * 1000, cols))
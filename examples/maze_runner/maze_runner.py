@@ -19,7 +19,7 @@ import spygame as spyg
 
 class MyAgent(spyg.Sprite):
     def __init__(self, x, y):
-        super().__init__(x, y, sprite_sheet=spyg.SpriteSheet("data/erik.tsx"), tile=0)
+        super().__init__(x, y, sprite_sheet=spyg.AssetCache.get_sprite_sheet("data/erik.tsx"), tile=0)
 
         # some custom settings
         self.handles_own_collisions = True  # our agent handles its own collisions (instead of letting the Stage do it for us)
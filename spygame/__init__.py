@@ -20,6 +20,11 @@ import math
 import re
 import numpy as np
 import functools
+from operator import attrgetter
+import bisect
+import json
+import hashlib
+import threading
 
 VERSION_ = '0.1'
 RELEASE_ = '0.1a9'
@@ -284,12 +289,31 @@ class KeyboardInputs(EventObject):
                 # signal that we might trigger the following events:
                 self.register_event("key_down." + desc, "key_up." + desc)
 
+    def set_pressed_keys(self, descriptions):
+        """
+        Sets all our registered keys to pressed (if their description is in the given list) or released (if not) without going through
+        the event queue (e.g. to play actions of a reinforcement learning agent). Triggers the 'key_down.[desc]'/'key_up.[desc]' events for all
+        keys that change their state.
+
+        :param Union[str,List[str]] descriptions: the description (or list of descriptions) of the keys to be pressed, e.g. ["left", "space"]
+        """
+        if isinstance(descriptions, str):
+            descriptions = [descriptions]
+        for key, desc in self.descriptions.items():
+            pressed = desc in descriptions
+            if self.keyboard_registry[key] != pressed:
+                self.keyboard_registry[key] = pressed
+                self.trigger_event(("key_down." if pressed else "key_up.") + desc)
+
     def tick(self):
         """
         Pulls all keyboard events from the event queue and processes them according to our keyboard_registry/descriptions.
         Triggers events for all registered keys like: 'key_down.[desc]' (when  pressed) and 'key_up.[desc]' (when released),
         where desc is the lowercase string after `pygame.K_`... (e.g. 'down', 'up', etc..).
         """
+        # no video system (e.g. running headless) -> no event queue to pull from
+        if not pygame.display.get_init():
+            return
         events = pygame.event.get([pygame.KEYDOWN, pygame.KEYUP])
         for e in events:
             # a key was pressed that we are interested in -> set to True or False
@@ -382,11 +406,44 @@ class GameObject(EventObject):
         pass
 
 
+class FlippedTiles(object):
+    """
+    A list-like (indexable by tile ID) collection of the flipped versions of a SpriteSheet's tiles.
+    Each flipped tile is only created when it is accessed for the first time and then memoised (most tiles are never drawn flipped).
+    """
+
+    def __init__(self, tiles, flip_x, flip_y):
+        """
+        :param List[pygame.Surface] tiles: the (unflipped) tiles of the SpriteSheet
+        :param bool flip_x: whether to flip the tiles on the x-axis
+        :param bool flip_y: whether to flip the tiles on the y-axis
+        """
+        self.tiles = tiles
+        self.flip_x = flip_x
+        self.flip_y = flip_y
+        self.flipped = [None] * len(tiles)  # the already created flipped tiles (None if not created yet)
+        self.created = set()  # the same already created flipped tiles (for fast `in` checks)
+
+    def __getitem__(self, tile_id):
+        surf = self.flipped[tile_id]
+        if surf is None:
+            surf = self.flipped[tile_id] = pygame.transform.flip(self.tiles[tile_id], self.flip_x, self.flip_y)
+            self.created.add(surf)
+        return surf
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __contains__(self, surface):
+        # only the already created flipped tiles (creating all of them just to check would defeat the purpose)
+        return surface in self.created
+
+
 class SpriteSheet(object):
     """
     Represents a spritesheet loaded from a tsx file.
-    Stores each single image (as pygame.Surface) in the sheet by its position.
-    Allows for already doing flip transformations (x/y and/or both axes) so we save time during the game.
+    Stores each single image (as pygame.Surface) in the sheet by its position (as subsurface views into the sheet's image, so no pixels are copied).
+    Flipped versions of the tiles (x/y and/or both axes) are created on first use and then kept (see FlippedTiles).
     Stores single tile properties in tile_props_by_id dict (only for those tiles that actually have custom properties defined in the tsx file).
     """
 
@@ -394,6 +451,7 @@ class SpriteSheet(object):
         """
         :param str file: the tsx file name to be loaded into this object
         :param dict store_flips: dictionary ({"x": [True|False], "y": [True|False]}) with the flip-options; None for default (only x)
+            (obsolete: all flipped tiles are now created lazily on first use)
         """
         try:
             tree = xml.etree.ElementTree.parse(file)
@@ -408,26 +466,26 @@ class SpriteSheet(object):
         assert "tilecount" in props, "ERROR: no `tilecount` property in properties of tsx file: `{}`!".format(file)
         self.count = int(props["tilecount"])
         self.cols = int(props["columns"])
-        self.tiles = []  # the list of all Surfaces
-        self.tiles_flipped_x = []  # the list of all Surfaces (flipped on x-axis)
-        self.tiles_flipped_y = []  # the list of all Surfaces (flipped on y-axis)
-        self.tiles_flipped_xy = []  # the list of all Surfaces (flipped on both axes)
+        self.image = None  # the entire (converted) image of the sheet
+        self.tiles = []  # the list of all Surfaces (subsurfaces of self.image)
+        self.tiles_flipped_x = FlippedTiles(self.tiles, True, False)  # all Surfaces (flipped on x-axis)
+        self.tiles_flipped_y = FlippedTiles(self.tiles, False, True)  # all Surfaces (flipped on y-axis)
+        self.tiles_flipped_xy = FlippedTiles(self.tiles, True, True)  # all Surfaces (flipped on both axes)
 
         self.tile_props_by_id = {}  # contains tile properties set in the tmx file for each tile by tile ID
 
-        # by default, only flip on x-axis (usually that's enough for 2D games)
-        if not store_flips:
-            store_flips = {"x": True, "y": False}
-
         for child in elem:
-            # the image asset -> load and save all Surfaces
+            # the image asset -> load it and create all tiles as subsurfaces
             if child.tag == "image":
                 props = child.attrib
                 self.w = int(props["width"])
                 self.h = int(props["height"])
                 image_file = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(file)), os.path.relpath(props["source"])))
                 # image_file = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(file)), os.path.relpath("../images/debug.png")))
-                image = pygame.image.load(image_file).convert_alpha()
+                # the transparent color of the image (if any; Tiled's `trans` attribute)
+                colorkey = pygame.Color("#" + props["trans"]) if "trans" in props else None
+                self.image = convert_surface(pygame.image.load(image_file), colorkey)
+                image_rect = self.image.get_rect()
                 col = -1
                 row = 0
                 for tile in range(self.count):
@@ -435,18 +493,18 @@ class SpriteSheet(object):
                     if col >= self.cols:
                         col = 0
                         row += 1
-                    surf = pygame.Surface((self.tw, self.th), flags=pygame.SRCALPHA)
-                    surf.blit(image, (0, 0),
-                              area=pygame.Rect(col * self.tw, row * self.th, self.tw, self.th))  # blits the correct frame of the image to this new surface
-                    self.tiles.append(surf)
-                    # do the necessary flippings (will save time later when rendering the Sprite)
-                    if store_flips["x"]:
-                        surf_x_flipped = pygame.transform.flip(surf, True, False)
-                        self.tiles_flipped_x.append(surf_x_flipped)
-                        if store_flips["y"]:  # x and y
-                            self.tiles_flipped_xy.append(pygame.transform.flip(surf_x_flipped, False, True))
-                    if store_flips["y"]:
-                        self.tiles_flipped_y.append(pygame.transform.flip(surf, False, True))
+                    rect = pygame.Rect(col * self.tw, row * self.th, self.tw, self.th)
+                    # a view into the sheet's image (shares its pixels, colorkey and alpha settings)
+                    if image_rect.contains(rect):
+                        self.tiles.append(self.image.subsurface(rect))
+                    # tile (partially) outside the image: copy what's there into a transparent Surface
+                    else:
+                        surf = pygame.Surface((self.tw, self.th), flags=pygame.SRCALPHA)
+                        surf.blit(self.image, (0, 0), area=rect)
+                        self.tiles.append(surf)
+                # the flipped tiles need to know the new number of tiles
+                for flipped in (self.tiles_flipped_x, self.tiles_flipped_y, self.tiles_flipped_xy):
+                    flipped.flipped = [None] * len(self.tiles)
 
             # single tiles (and their properties)
             elif child.tag == "tile":
@@ -468,6 +526,257 @@ class SpriteSheet(object):
                         raise ("ERROR: expected only <properties> tag within <tile> in tsx file {}".format(file))
 
 
+class AssetCache(object):
+    """
+    A static, process-wide cache for loaded assets (SpriteSheets and static images), so that the same file is only loaded (parsed, sliced and
+    converted) once, no matter how many Sprites use it.
+    Assets are keyed by their resolved file path (plus the image section).
+    Sprites acquire the cached assets they use (and release them when destroyed or when their Stage is destroyed); assets that are not used by
+    any Sprite anymore stay in the cache until they are explicitly evicted (which happens each time a different Screen/Level gets staged, not when
+    the same Level is staged again, e.g. after a restart).
+    Note: Cached assets are shared: all Sprites using the same image file get the very same Surface, so changing a cached image in place (e.g.
+    drawing on it) changes it for all of them; copy the image first (and assign the copy to the Sprite's `image`) to change it.
+    """
+
+    assets = {}  # key=asset key (see above); value=the cached asset
+    ref_counts = {}  # key=asset key; value=the number of Sprites currently using the asset
+    keys = {}  # key=id of the cached asset object; value=the asset key (to find the key of an asset that gets acquired/released)
+
+    @staticmethod
+    def get_sprite_sheet(file, store_flips=None):
+        """
+        Returns the SpriteSheet for the given tsx file (loads it only if not cached yet).
+
+        :param str file: the tsx file name
+        :param dict store_flips: obsolete (see SpriteSheet); flipped tiles are created lazily, so all flip-options share the same SpriteSheet
+        :return: the cached SpriteSheet
+        :rtype: SpriteSheet
+        """
+        key = ("tsx", os.path.realpath(file))
+        sheet = AssetCache.assets.get(key)
+        if sheet is None:
+            sheet = AssetCache.add(key, SpriteSheet(file, store_flips))
+        return sheet
+
+    @staticmethod
+    def get_image(file, section=None):
+        """
+        Returns the (converted) image for the given image file (loads it only if not cached yet).
+
+        :param str file: the image file name
+        :param Union[Tuple[int,int,int,int],None] section: offset-x, offset-y, width, height defining a rect to use only a subsection of the image
+            (the subsection is returned as an opaque Surface); None for the entire image
+        :return: the cached image (shared by all callers; must not be changed in place)
+        :rtype: pygame.Surface
+        """
+        key = ("image", os.path.realpath(file), section)
+        image = AssetCache.assets.get(key)
+        if image is None:
+            if section is None:
+                image = convert_surface(pygame.image.load(file))
+            else:
+                image = pygame.Surface((section[2], section[3]))
+                image.blit(AssetCache.get_image(file), dest=(0, 0), area=pygame.Rect(*section))
+                image = convert_surface(image)
+            AssetCache.add(key, image)
+        return image
+
+    @staticmethod
+    def add(key, asset):
+        """
+        Stores a newly loaded asset in the cache (with a reference count of 0).
+
+        :param tuple key: the key of the asset
+        :param any asset: the asset to store
+        :return: the stored asset
+        :rtype: any
+        """
+        AssetCache.assets[key] = asset
+        AssetCache.ref_counts[key] = 0
+        AssetCache.keys[id(asset)] = key
+        return asset
+
+    @staticmethod
+    def acquire(asset):
+        """
+        Increases the reference count of the given asset (if it is cached).
+
+        :param any asset: the asset (e.g. a SpriteSheet) that is being used
+        :return: whether the asset is cached (only then it has to be released later)
+        :rtype: bool
+        """
+        key = AssetCache.keys.get(id(asset))
+        if key is None:
+            return False
+        AssetCache.ref_counts[key] += 1
+        return True
+
+    @staticmethod
+    def release(asset):
+        """
+        Decreases the reference count of the given asset (if it is cached). The asset stays in the cache until the next `evict`.
+
+        :param any asset: the asset (e.g. a SpriteSheet) that is no longer being used
+        """
+        key = AssetCache.keys.get(id(asset))
+        if key is not None and AssetCache.ref_counts[key] > 0:
+            AssetCache.ref_counts[key] -= 1
+
+    @staticmethod
+    def evict(all_assets=False):
+        """
+        Removes all assets that are not used anymore (reference count 0) from the cache.
+
+        :param bool all_assets: if True, removes all assets (no matter whether they are still in use)
+        """
+        for key in [key for key, count in AssetCache.ref_counts.items() if all_assets or count == 0]:
+            del AssetCache.keys[id(AssetCache.assets[key])]
+            del AssetCache.assets[key]
+            del AssetCache.ref_counts[key]
+
+
+class TextureAtlas(object):
+    """
+    Packs many small images (the tiles of all SpriteSheets used by a Stage) into a few large Surfaces (pages), so that blitting Sprites doesn't
+    jump between many small allocations and the Stage's batched blits mostly read from the same few Surfaces.
+    Only SpriteSheet tiles (and their flipped versions) are packed: they never change after loading. Any other image (e.g. a Sprite's static image or
+    an image assigned to Sprite.image at runtime) is not packed and simply blitted as is.
+    Note: Changing the pixels of a packed tile in place (e.g. drawing onto a SpriteSheet's image) is not supported: the atlas would keep on rendering
+    the old pixels.
+    Each packed image is referenced by an (atlas Surface, area Rect) entry, which can be blitted instead of the image itself
+    (`surface.blit(atlas_surface, dest, area_rect)`).
+    Images are only packed together with images of the same pixel format (per-pixel alpha, colorkey or fully opaque; see convert_surface) and are
+    copied into their page pixel by pixel, so blitting an entry yields exactly the same result as blitting the image.
+    Pages are filled shelf by shelf (rows of images); images are added incrementally (e.g. flipped tiles, which are only created on first use).
+    """
+
+    def __init__(self, page_size=1024):
+        """
+        :param int page_size: the width and height of each page (images that don't fit into one page are not packed)
+        """
+        self.page_size = page_size
+        # the pages by format-key (see get_format_key); each page is a list: [Surface, shelf-x, shelf-y, shelf-height]
+        self.pages = {}
+        # key=packed image (pygame.Surface); value=(atlas Surface, area Rect) or None if the image can't be packed
+        self.entries = {}
+        self.sprite_sheets = set()  # the SpriteSheets, whose tiles are packed into this atlas (flipped tiles are packed on demand)
+
+    @staticmethod
+    def get_format_key(surface):
+        """
+        Returns the key of the pages that the given Surface can be packed into (None if it can't be packed at all, e.g. because of surface alpha).
+
+        :param pygame.Surface surface: the Surface to pack
+        :return: tuple of (bitsize, masks, per-pixel-alpha flag, colorkey, palette) or None
+        :rtype: Union[tuple,None]
+        """
+        srcalpha = surface.get_flags() & pygame.SRCALPHA
+        alpha = surface.get_alpha()
+        if (srcalpha and alpha not in (None, 255)) or (not srcalpha and alpha is not None):
+            return None
+        # 8-bit images (e.g. unconverted images when running without a display) can only share pages with images using the same palette
+        palette = tuple(tuple(color) for color in surface.get_palette()) if surface.get_bytesize() == 1 else None
+        return surface.get_bitsize(), surface.get_masks(), srcalpha, surface.get_colorkey(), palette
+
+    def add(self, surface):
+        """
+        Packs the given Surface into one of our pages (if not already packed).
+
+        :param pygame.Surface surface: the Surface to pack
+        :return: the (atlas Surface, area Rect) entry of the packed Surface; None if the Surface can't be packed
+        :rtype: Union[Tuple[pygame.Surface,pygame.Rect],None]
+        """
+        if surface in self.entries:
+            return self.entries[surface]
+
+        w, h = surface.get_size()
+        format_key = TextureAtlas.get_format_key(surface)
+        if format_key is None or w > self.page_size or h > self.page_size or w == 0 or h == 0:
+            self.entries[surface] = None
+            return None
+
+        page = self.pages.get(format_key)
+        # start a new shelf
+        if page and page[1] + w > self.page_size:
+            page[1] = 0
+            page[2] += page[3]
+            page[3] = 0
+        # start a new page (the full one is still referenced by its entries)
+        if not page or page[2] + h > self.page_size:
+            page = self.pages[format_key] = [TextureAtlas.create_page(surface, self.page_size), 0, 0, 0]
+
+        area = pygame.Rect(page[1], page[2], w, h)
+        # per-pixel alpha: copy (don't blend) the pixels into the transparent page
+        if format_key[2]:
+            page[0].blit(surface, area, special_flags=pygame.BLEND_RGBA_MAX)
+        # colorkey (the page is filled with the colorkey) or opaque
+        else:
+            page[0].blit(surface, area)
+        page[1] += w
+        page[3] = max(page[3], h)
+
+        entry = self.entries[surface] = (page[0], area)
+        return entry
+
+    @staticmethod
+    def create_page(surface, page_size):
+        """
+        Creates a new (empty) page with the same pixel format (and colorkey) as the given Surface.
+
+        :param pygame.Surface surface: the Surface that will be packed into the new page
+        :param int page_size: the width and height of the new page
+        :return: the new page
+        :rtype: pygame.Surface
+        """
+        page = pygame.Surface((page_size, page_size), surface.get_flags() & pygame.SRCALPHA, surface)
+        if surface.get_bytesize() == 1:
+            page.set_palette(surface.get_palette())
+        colorkey = surface.get_colorkey()
+        if colorkey is not None:
+            page.fill(colorkey)
+            page.set_colorkey(colorkey, surface.get_flags() & pygame.RLEACCEL)
+        elif page.get_flags() & pygame.SRCALPHA:
+            page.fill((0, 0, 0, 0))
+        return page
+
+    def add_sprite_sheet(self, sprite_sheet):
+        """
+        Packs all (unflipped) tiles of a SpriteSheet; its flipped tiles are packed on demand (see get_entry).
+
+        :param SpriteSheet sprite_sheet: the SpriteSheet to pack
+        """
+        if sprite_sheet in self.sprite_sheets:
+            return
+        self.sprite_sheets.add(sprite_sheet)
+        for tile in sprite_sheet.tiles:
+            self.add(tile)
+
+    def add_sprite(self, sprite):
+        """
+        Packs the images of a Sprite: all tiles of its SpriteSheet (static images are not packed, see above).
+
+        :param Sprite sprite: the Sprite, whose images to pack
+        """
+        if sprite.spritesheet:
+            self.add_sprite_sheet(sprite.spritesheet)
+
+    def get_entry(self, surface, sprite_sheet=None):
+        """
+        Returns the (atlas Surface, area Rect) entry for the given image.
+        Flipped tiles of our SpriteSheets that haven't been packed yet are packed now.
+
+        :param pygame.Surface surface: the image to look up
+        :param Union[SpriteSheet,None] sprite_sheet: the SpriteSheet of the Sprite that shows the image (if any)
+        :return: the (atlas Surface, area Rect) entry; None if the image is not packed
+        :rtype: Union[Tuple[pygame.Surface,pygame.Rect],None]
+        """
+        entry = self.entries.get(surface)
+        if entry is None and sprite_sheet in self.sprite_sheets and surface not in self.entries and \
+                any(surface in flipped for flipped in (sprite_sheet.tiles_flipped_x, sprite_sheet.tiles_flipped_y, sprite_sheet.tiles_flipped_xy)):
+            entry = self.add(surface)
+        return entry
+
+
 class Sprite(GameObject, pygame.sprite.Sprite):
     """
     A Sprite can be added to a Stage; has a type and a collision mask for collision detection with other Sprites or TiledTileLayers also on the Stage.
@@ -516,7 +825,8 @@ class Sprite(GameObject, pygame.sprite.Sprite):
         :param int y: the initial y position of this Sprite
         :param any **kwargs:
          - sprite_sheet: a ready SpriteSheet object to use (set initial image to first frame in the SpriteSheet)
-         - image_file: use image_file (str) as a file name for a static image
+         - image_file: use image_file (str) as a file name for a static image (the image is shared with all other Sprites using the same file, see
+           AssetCache)
          - image_section (Tuple[int,int,int,int]): offset-x, offset-y, width, height defining a rect to use only a subsection of the given static image
          - width_height (Tuple[int,int]): the dimensions of the collision rect; if not given, we'll try to derive the collision rect from
            the given image/spritesheet
@@ -527,15 +837,27 @@ class Sprite(GameObject, pygame.sprite.Sprite):
         pygame.sprite.Sprite.__init__(self)
         GameObject.__init__(self)
 
+        # whether our rect has changed since our Stage last looked at us (set by `move` and by assigning a new rect)
+        # - rects that are changed in place (e.g. rect.x += 1) are detected by the Stage comparing the rect with last_rect
+        self.moved = True
+        self.moved_in_frame = True  # set by the Stage at the beginning of each collision pass: did we move since the last collision pass?
+        self.last_rect = None  # a copy of our rect from the last time the Stage looked at us
+        # our (type, collision_mask, active) from the last time the Stage looked at us (a change of any of these counts as a move, see
+        # Stage.update_moved_flags)
+        self.last_collision_state = None
+
         # can be set to the number of ticks to ignore by the containing stage depending on whether this Sprite is within the Stage's viewable borders
         self.ignore_after_n_ticks = 1  # >0: not to be ignored; <=0: ignore this sprite for one tick
 
+        self.cached_assets = []  # the assets from the AssetCache that we use (and have to release once we are destroyed)
+
         # determine the image of this Sprite, its collision rect, and its image-offset-rect (where with respect to the collision rect do we draw the image?)
         # - with SpriteSheet
         if "sprite_sheet" in kwargs:
             sheet = kwargs["sprite_sheet"]
             assert isinstance(sheet, SpriteSheet), "ERROR: in Sprite's ctor: kwargs[`sprite_sheet`] must be of type `SpriteSheet`!"
             self.spritesheet = sheet
+            self.acquire_asset(sheet)
             # TODO: make it possible to create a Sprite from more than one tile (e.g. for a platform/elevator). Either in x-direction or y-direction or both
             self.image = sheet.tiles[kwargs.get("tile", 0)]
             width_height = kwargs.get("width_height", (self.spritesheet.tw, self.spritesheet.th))
@@ -549,15 +871,12 @@ class Sprite(GameObject, pygame.sprite.Sprite):
             image = kwargs["image_file"]
             assert isinstance(image, str), "ERROR: in Sprite's ctor: kwargs[`image_file`] must be of type str!"
             self.spritesheet = None
-            source = pygame.image.load(image)
-            if "image_section" in kwargs:
-                sec = kwargs["image_section"]
-                assert isinstance(sec, tuple) and len(sec) == 4,\
-                    "ERROR: in Sprite's ctor: kwargs[`image_section`] must be of type tuple and of len 4 (offset-x, offset-y, width, height)!"
-                self.image = pygame.Surface((sec[2], sec[3]))
-                self.image.blit(source, dest=(0, 0), area=pygame.Rect(*sec))
-            else:
-                self.image = source
+            sec = kwargs.get("image_section")
+            assert sec is None or (isinstance(sec, tuple) and len(sec) == 4),\
+                "ERROR: in Sprite's ctor: kwargs[`image_section`] must be of type tuple and of len 4 (offset-x, offset-y, width, height)!"
+            # shared (and already converted) image from the AssetCache
+            self.image = AssetCache.get_image(image, sec)
+            self.acquire_asset(self.image)
             self.image_rect = self.image.get_rect()
             width_height = kwargs.get("width_height", (self.image_rect.width, self.image_rect.height))
             self.rect = pygame.Rect(x, y, width_height[0], width_height[1])  # collision
@@ -585,11 +904,13 @@ class Sprite(GameObject, pygame.sprite.Sprite):
             self.do_render = True if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_RECTS else False
 
         # GameObject specific stuff
+        self.stage = None  # the current Stage this Sprite is in
+        self._type = 0
         self.type = Sprite.get_type("default")  # specifies the type of the Sprite (can be used e.g. for collision detection)
         self.handles_own_collisions = False  # set to True if this object takes care of its own collision handling
         self.collision_mask = Sprite.get_type("default")  # set the bits here that we would like to collide with (all other types will be ignored)
 
-        self.stage = None  # the current Stage this Sprite is in
+        self.stage_order = 0  # increasing number given to us by the Stage when added (used to sort broad-phase results into the Stage's Sprite order)
         self.sprite_groups = []  # the current Groups that this Sprite belongs to
         self.do_render = kwargs.get("do_render", self.do_render)  # we may overwrite this
         self.render_order = kwargs.get("render_order", 50)  # the higher this number the later this Sprite will be rendered in the Stage's render function
@@ -620,6 +941,47 @@ class Sprite(GameObject, pygame.sprite.Sprite):
             if self.y_max == "auto":
                 self.y_max = stage.screen.height - self.rect.height
 
+    @property
+    def rect(self):
+        """
+        Our collision rect.
+
+        :return: the collision rect
+        :rtype: pygame.Rect
+        """
+        return self._rect
+
+    @rect.setter
+    def rect(self, rect):
+        """
+        Sets a new collision rect and flags us as moved.
+
+        :param pygame.Rect rect: the new collision rect
+        """
+        self._rect = rect
+        self.moved = True
+
+    @property
+    def type(self):
+        """
+        The type bitmask of this Sprite (see Sprite.get_type).
+
+        :return: the type bitmask
+        :rtype: int
+        """
+        return self._type
+
+    @type.setter
+    def type(self, type_):
+        """
+        Sets our type bitmask and lets our Stage know about the change (so it can keep its type-buckets up to date).
+
+        :param int type_: the new type bitmask
+        """
+        self._type = type_
+        if self.stage:
+            self.stage.sprite_type_changed(self)
+
     def move(self, x, y, absolute=False):
         """
         Moves us by x/y pixels (or to x,y if absolute=True).
@@ -654,9 +1016,15 @@ class Sprite(GameObject, pygame.sprite.Sprite):
         elif self.y_min is not None and self.rect.y < self.y_min:
             self.rect.y = self.y_min
 
+        self.moved = True
+        # keep our Stage's spatial index up to date
+        if self.stage and self.stage.broad_phase:
+            self.stage.broad_phase.update(self)
+
     # @override(GameObject)
     def destroy(self):
         super().destroy()
+        self.release_assets()
 
         # if we are on a stage -> remove us from that stage
         if self.stage:
@@ -666,19 +1034,83 @@ class Sprite(GameObject, pygame.sprite.Sprite):
         for sprite_group in self.sprite_groups:
             sprite_group.remove(self)
 
+    def acquire_asset(self, asset):
+        """
+        Keeps an asset of the AssetCache in the cache for as long as we live (until `release_assets` is called), e.g. our SpriteSheet or the
+        SpriteSheet of the shots we spawn (so that spawning a shot never has to load the SpriteSheet again).
+
+        :param any asset: the cached asset (e.g. a SpriteSheet) to acquire (nothing happens if the asset is not cached)
+        """
+        if AssetCache.acquire(asset):
+            self.cached_assets.append(asset)
+
+    def release_assets(self):
+        """
+        Releases all assets that we use from the AssetCache (so they can be evicted from the cache).
+        """
+        for asset in self.cached_assets:
+            AssetCache.release(asset)
+        self.cached_assets = []
+
+    def get_screen_rect(self, display):
+        """
+        Returns the area of the Display's Surface that our `render` method paints on (given the Display's current offsets).
+        Used by the dirty-rect rendering mode (see Stage.render_stages_dirty_rects) to figure out, which regions of the Display need to be redrawn.
+
+        :param Display display: the Display object to render on
+        :return: the on-screen Rect that this Sprite covers when rendered
+        :rtype: pygame.Rect
+        """
+        if self.image:
+            r = pygame.Rect((self.rect.x + self.image_rect.x - display.offsets[0], self.rect.y + self.image_rect.y - display.offsets[1]),
+                            self.image.get_size())
+        else:
+            r = pygame.Rect((self.rect.x - display.offsets[0], self.rect.y - display.offsets[1]), (0, 0))
+        if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_RECTS:
+            r.union_ip(pygame.Rect((self.rect.x - display.offsets[0], self.rect.y - display.offsets[1]), (self.rect.w, self.rect.h)))
+        return r
+
+    def get_blit(self, display):
+        """
+        Returns the (image, destination) pair that our `render` method blits onto the given Display object's Surface.
+        If our image is packed in our Stage's TextureAtlas, returns the (atlas Surface, destination, area Rect) triple instead.
+        Used by Stage.render to submit the images of many Sprites in one single pygame.Surface.blits call.
+
+        :param Display display: the Display object to render on
+        :return: tuple of our image (or atlas Surface), the destination (x/y on the Display's Surface) (and the area Rect in the atlas Surface)
+            or None if we have no image
+        :rtype: Union[tuple,None]
+        """
+        if self.image:
+            dest = (self.rect.x + self.image_rect.x - display.offsets[0], self.rect.y + self.image_rect.y - display.offsets[1])
+            atlas = self.stage.texture_atlas if self.stage else None
+            if atlas:
+                entry = atlas.get_entry(self.image, self.spritesheet)
+                if entry:
+                    return entry[0], dest, entry[1]
+            return self.image, dest
+        return None
+
     def render(self, display):
         """
         Paints the Sprite with its current image onto the given Display object.
 
         :param Display display: the Display object to render on (Display has a pygame.Surface, on which we blit our image)
         """
-        if self.image:
-            #print("render at x={}".format(self.rect.x + self.image_rect.x - display.offsets[0]))
-            display.surface.blit(self.image, (self.rect.x + self.image_rect.x - display.offsets[0], self.rect.y + self.image_rect.y - display.offsets[1]))
+        blit = self.get_blit(display)
+        if blit:
+            display.surface.blit(*blit)
         if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_RECTS:
-            pygame.draw.rect(display.surface, DEBUG_RENDER_SPRITES_RECTS_COLOR,
-                             pygame.Rect((self.rect.x - display.offsets[0], self.rect.y - display.offsets[1]),
-                                         (self.rect.w, self.rect.h)), 1)
+            self.render_debug_rect(display)
+
+    def render_debug_rect(self, display):
+        """
+        Paints our collision rect (DEBUG_RENDER_SPRITES_RECTS) onto the given Display object.
+
+        :param Display display: the Display object to render on
+        """
+        pygame.draw.rect(display.surface, DEBUG_RENDER_SPRITES_RECTS_COLOR,
+                         pygame.Rect((self.rect.x - display.offsets[0], self.rect.y - display.offsets[1]), (self.rect.w, self.rect.h)), 1)
 
 
 class Repeater(Sprite):
@@ -694,10 +1126,56 @@ class Repeater(Sprite):
         self.repeat_y = kwargs.get("repeat_y", True)
         self.repeat_w = kwargs.get("repeat_w", self.rect.width)
         self.repeat_h = kwargs.get("repeat_h", self.rect.height)
+        # our image pre-tiled over the Display (plus one repeat period) and the Display dims it was built for (rebuilt when the dims change)
+        self.tiled_image = None
+        self.tiled_image_dims = None
         # don't collide with anything
         self.type = Sprite.get_type("none")
         self.collision_mask = 0
 
+    # @override(Sprite)
+    def get_screen_rect(self, display):
+        # we are repeated over the entire Display
+        return display.surface.get_rect()
+
+    def build_tiled_image(self, display):
+        """
+        Builds a Surface with our image repeated (every repeat_w/repeat_h pixels) over the size of the given Display plus one repeat period
+        (in each repeated direction), so that rendering only needs one blit per frame.
+
+        :param Display display: the Display object to build the tiled image for
+        :return: the pre-tiled Surface or None if our image cannot be pre-tiled without changing the rendered result (overlapping tiles would have
+            to be alpha-blended onto each other; gaps between the tiles of an image without transparency)
+        :rtype: Union[pygame.Surface,None]
+        """
+        w, h = self.image.get_size()
+        if (self.repeat_x and self.repeat_w < w) or (self.repeat_y and self.repeat_h < h):
+            return None
+        num_x = math.ceil(display.width / self.repeat_w) + 1 if self.repeat_x else 1
+        num_y = math.ceil(display.height / self.repeat_h) + 1 if self.repeat_y else 1
+        size = ((num_x - 1) * self.repeat_w + w, (num_y - 1) * self.repeat_h + h)
+
+        # per-pixel alpha: copy the pixels 1:1 (no blending) onto a fully transparent Surface
+        if self.image.get_flags() & pygame.SRCALPHA:
+            tiled_image = pygame.Surface(size, pygame.SRCALPHA, self.image)
+            special_flags = pygame.BLEND_RGBA_MAX
+        else:
+            colorkey = self.image.get_colorkey()
+            has_gaps = (num_x > 1 and self.repeat_w > w) or (num_y > 1 and self.repeat_h > h)
+            if self.image.get_alpha() is not None or (colorkey is None and has_gaps):
+                return None
+            tiled_image = pygame.Surface(size, 0, self.image)
+            # colorkey: leave all pixels that are not covered by a tile transparent
+            if colorkey is not None:
+                tiled_image.fill(colorkey)
+                tiled_image.set_colorkey(colorkey, self.image.get_flags() & pygame.RLEACCEL)
+            special_flags = 0
+
+        for y in range(num_y):
+            for x in range(num_x):
+                tiled_image.blit(self.image, (x * self.repeat_w, y * self.repeat_h), special_flags=special_flags)
+        return tiled_image
+
     # @override(Sprite)
     def render(self, display):
         # debug rendering (no backgrounds) -> early out
@@ -725,11 +1203,20 @@ class Repeater(Sprite):
         else:
             start_y = self.rect.y - view_y
 
-        scale = 1.0
+        # (re)build our pre-tiled image (only if the Display's dims changed)
+        if self.tiled_image_dims != (display.width, display.height):
+            self.tiled_image = self.build_tiled_image(display)
+            self.tiled_image_dims = (display.width, display.height)
+        # one blit of the pre-tiled image (covers the entire Display)
+        if self.tiled_image:
+            display.surface.blit(self.tiled_image, dest=(math.floor(start_x), math.floor(start_y)))
+            return
+
+        # image could not be pre-tiled: blit each single tile
         cur_y = start_y
-        while cur_y < display.height / scale:
+        while cur_y < display.height:
             cur_x = start_x
-            while cur_x < display.width / scale:
+            while cur_x < display.width:
                 #display.surface.blit(self.image, dest=(math.floor(cur_x + view_x), math.floor(cur_y + view_y)))
                 display.surface.blit(self.image, dest=(math.floor(cur_x), math.floor(cur_y)))
                 cur_x += self.repeat_w
@@ -892,21 +1379,43 @@ class Display(object):
     """
 
     instantiated = False
+    # whether `get_pixels` returns a view of our pixels (that gets overwritten by the next rendered frame) instead of a copy
+    pixels_are_views = False
 
-    def __init__(self, width=600, height=400, title="Spygame Rocks!"):
+    def __init__(self, width=600, height=400, title="Spygame Rocks!", dirty_rect_rendering=False):
         """
         :param int width: the width of the Display
         :param int height: the height of the Display
         :param str title: the caption to use on the pygame display
+        :param bool dirty_rect_rendering: whether Stage.render_stages should only redraw (and update) those regions of the Display that changed since
+            the last frame (see Stage.render_stages_dirty_rects); useful for screens with a static camera
         """
-        assert not Display.instantiated, "ERROR: can only create one {} object!".format(type(self).__name__)
-        Display.instantiated = True
-
-        pygame.display.set_caption(title)
+        self.title = title
         self.width = width
         self.height = height
-        self.surface = pygame.display.set_mode((width, height))
+        self.surface = self.create_surface()
         self.offsets = [0, 0]
+        self.do_render = True  # whether Stage.render_stages should render anything at all onto this Display
+
+        self.dirty_rect_rendering = dirty_rect_rendering
+        # the state (offsets, dims, Stages and layers) of the last frame rendered in dirty-rect mode (if anything in here changes -> full redraw)
+        self.dirty_rect_state = None
+        # key=Sprite; value=tuple of the Sprite's screen Rect and image in the last frame rendered in dirty-rect mode
+        self.last_screen_rects = {}
+
+    def create_surface(self):
+        """
+        Opens the pygame display (window) with our width/height and title.
+        There can only be one (windowed) Display (use HeadlessDisplay for more).
+
+        :return: the pygame display's Surface
+        :rtype: pygame.Surface
+        """
+        assert not Display.instantiated, "ERROR: can only create one {} object!".format(type(self).__name__)
+        Display.instantiated = True
+
+        pygame.display.set_caption(self.title)
+        return pygame.display.set_mode((self.width, self.height))
 
     def change_dims(self, width, height):
         """
@@ -920,12 +1429,130 @@ class Display(object):
         pygame.display.set_mode((width, height))
         assert self.surface is pygame.display.get_surface(), "ERROR: self.display is not same object as pygame.display.get_surface() anymore!"
 
+    def get_pixels(self):
+        """
+        Returns a copy of the RGB pixels of our Surface as a (height x width x 3) uint8 numpy array.
+        (A direct reference (pygame.surfarray.pixels3d) would lock the display Surface for as long as the caller keeps the array, so that no
+        further frames could be rendered.)
+
+        :return: the (height x width x 3) numpy array of our pixels
+        :rtype: np.ndarray
+        """
+        return pygame.surfarray.array3d(self.surface).swapaxes(0, 1)
+
+    def get_pixels_view(self):
+        """
+        Returns a view (no copy) of the RGB pixels of our Surface as a (height x width x 3) uint8 numpy array.
+        The view locks our Surface (no further frames can be rendered) until it (and every array derived from it) is deleted.
+
+        :return: the (height x width x 3) numpy array view of our pixels
+        :rtype: np.ndarray
+        """
+        return pygame.surfarray.pixels3d(self.surface).swapaxes(0, 1)
+
+    def get_observation(self, sprite=None, size=None, grayscale=False, downsample=1):
+        """
+        Returns the last rendered frame (or a region of it around a Sprite) as a numpy array (e.g. as an observation for reinforcement learning).
+        The region and the downsampling are applied to a view of the pixels, so only the returned pixels get copied.
+        The returned array is never changed by later frames, so it can be kept (e.g. for frame stacking).
+
+        :param Union[Sprite,None] sprite: if given, only return the region (of the given size) around this Sprite (the region is moved, so that it
+            lies within the Display); None for the entire Display
+        :param Union[Tuple[int,int],None] size: the width and height of the region around the Sprite (needed if sprite is given)
+        :param bool grayscale: whether to convert the pixels to grayscale luminance values (returns a new (height x width) array)
+        :param int downsample: the integer factor to downsample the frame with (only every n-th pixel in x and y direction is returned)
+        :return: the (height x width x 3) array of the pixels or - if grayscale is True - the (height x width) array of luminance values
+        :rtype: np.ndarray
+        """
+        view = self.get_pixels_view()
+        pixels = view
+        if sprite is not None:
+            assert size is not None, "ERROR: Display.get_observation needs a `size` for the region around the given Sprite!"
+            bounds = pygame.Rect(0, 0, self.width, self.height)
+            region = pygame.Rect((0, 0), size)
+            region.center = (sprite.rect.centerx - self.offsets[0], sprite.rect.centery - self.offsets[1])
+            region = region.clamp(bounds).clip(bounds)
+            pixels = pixels[region.top:region.bottom, region.left:region.right]
+        if downsample > 1:
+            pixels = pixels[::downsample, ::downsample]
+        if grayscale:
+            # integer luminance (ITU-R 601 weights times 256)
+            observation = (np.dot(pixels, np.array([77, 150, 29], dtype=np.uint16)) >> 8).astype(np.uint8)
+        # only copy the pixels we return
+        else:
+            observation = np.array(pixels, copy=True)
+        # release the view (unlocks our Surface)
+        del view, pixels
+        return observation
+
+    def refresh(self, rects=None):
+        """
+        Updates the pygame display (window) with the content of our Surface.
+
+        :param Union[List[pygame.Rect],None] rects: if given, only update these regions of the window; None for the entire window
+        """
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
     def debug_refresh(self):
         """
         Force-refreshes the display (used only for debug purposes).
         """
-        pygame.display.flip()
-        pygame.event.get([])  # we seem to have to do this
+        self.refresh()
+        if pygame.display.get_init():
+            pygame.event.get([])  # we seem to have to do this
+
+
+class HeadlessDisplay(Display):
+    """
+    A Display without a window: renders into a plain pygame.Surface (or doesn't render at all) and does not need a video driver.
+    Can be used e.g. for simulations/training runs on headless machines. Any number of HeadlessDisplays can coexist.
+    """
+
+    pixels_are_views = True
+
+    def __init__(self, width=600, height=400, title="Spygame Rocks!", dirty_rect_rendering=False, do_render=True):
+        """
+        :param int width: the width of the Display
+        :param int height: the height of the Display
+        :param str title: the title of the Display (not shown anywhere)
+        :param bool dirty_rect_rendering: whether Stage.render_stages should only redraw the changed regions of the Display (see Display)
+        :param bool do_render: whether Stage.render_stages should render anything at all onto this Display (False for pure simulations)
+        """
+        super().__init__(width, height, title, dirty_rect_rendering)
+        self.do_render = do_render
+
+    # @override(Display)
+    def create_surface(self):
+        # render into our own (height x width x 4) numpy array, so that we can hand out views of the pixels without locking the Surface
+        self.pixels = np.zeros(shape=(self.height, self.width, 4), dtype=np.uint8)
+        # pygame can't wrap empty buffers (Display size not determined yet)
+        if self.width == 0 or self.height == 0:
+            return pygame.Surface((self.width, self.height))
+        return pygame.image.frombuffer(self.pixels, (self.width, self.height), "RGBX")
+
+    # @override(Display)
+    def get_pixels(self):
+        # a view of our own array (does not lock the Surface, but gets overwritten by the next frame)
+        return self.pixels[:, :, :3]
+
+    # @override(Display)
+    def get_pixels_view(self):
+        # our own array doesn't lock the Surface
+        return self.pixels[:, :, :3]
+
+    # @override(Display)
+    def change_dims(self, width, height):
+        self.width = width
+        self.height = height
+        self.surface = self.create_surface()
+
+    # @override(Display)
+    def refresh(self, rects=None):
+        # nothing to update: we have no window
+        pass
 
 
 class GameLoop(object):
@@ -956,12 +1583,14 @@ class GameLoop(object):
                 - game_loop (Union[str,GameLoop]): the GameLoop to use (instead of creating a new one); "new" or [empty] for new one
                 - dont_play (bool): whether - after creating the GameLoop - it should be played. Can be used for openAI gym purposes, where we just step,
                   not tick
+                - sim_rate (int): the fixed rate (ticks per second) at which to tick the Stages (independent of the frame rate); None for one tick per frame
+                - render_every (int): render only every n-th frame; 0 for never rendering
         :return: the created/played GameLoop object or None
         :rtype: Union[GameLoop,None]
         """
 
         defaults(kwargs, {"force_loop": False, "screen_obj": None, "keyboard_inputs": None, "display": None, "max_fps": None,
-                          "game_loop" : "new", "dont_play": False})
+                          "game_loop" : "new", "dont_play": False, "sim_rate": None, "render_every": 1})
 
         # - if there's no other loop active, run the default stageGameLoop
         # - or: there is an active loop, but we force overwrite it
@@ -993,7 +1622,7 @@ class GameLoop(object):
                     max_fps = kwargs["screen_obj"].max_fps
 
                 loop = GameLoop(Stage.stage_default_game_loop_callback, display=display,
-                                keyboard_inputs=keyboard_inputs, max_fps=max_fps)
+                                keyboard_inputs=keyboard_inputs, max_fps=max_fps, sim_rate=kwargs["sim_rate"], render_every=kwargs["render_every"])
                 if not kwargs["dont_play"]:
                     loop.play()
                 return loop
@@ -1006,13 +1635,16 @@ class GameLoop(object):
             # do nothing
             return None
 
-    def __init__(self, callback, display, keyboard_inputs=None, max_fps=60):
+    def __init__(self, callback, display, keyboard_inputs=None, max_fps=60, sim_rate=None, render_every=1):
         """
         :param callable callback: the callback function to call each time we `tick` (after collecting keyboard events)
         :param Display display: the Display object associated with the loop
         :param KeyboardInputs keyboard_inputs: the KeyboardInputs object to use for collecting keyboard information each tick (we simply call the
         KeyboardInputs' `tick` method during our own `tick` method)
         :param int max_fps: the maximum frame rate per second to allow when ticking. fps can be slower, but never faster
+        :param Union[int,None] sim_rate: if given, the default callback ticks all Stages at this fixed rate (ticks per second; e.g. 60), no matter
+            how often frames are rendered (0, 1 or more Stage ticks per frame); None for ticking the Stages exactly once per frame (with the frame's dt)
+        :param int render_every: the default callback only renders every n-th frame (see `render_this_frame`); 0 for never rendering
         """
         self.is_paused = True  # True -> Game loop will be paused (no frames, no ticks)
         self.callback = callback  # gets called each tick with this GameLoop instance as the first parameter (can then extract dt as `game_loop.dt`)
@@ -1024,6 +1656,25 @@ class GameLoop(object):
         self.keyboard_inputs = keyboard_inputs or KeyboardInputs(None)
         self.display = display
         self.max_fps = max_fps
+        # the kwargs to pass into Display.get_observation when returning an observation from `step` (e.g. {"grayscale": True, "downsample": 2})
+        self.observation_options = {}
+        # decoupled simulation and render rates
+        self.sim_dt = 1 / sim_rate if sim_rate else None  # the fixed dt (in sec) to tick the Stages with (None: tick once per frame with self.dt)
+        self.sim_time = 0.0  # the frame time (in sec) not yet simulated by fixed-dt Stage ticks
+        self.render_every = render_every
+
+    def render_this_frame(self):
+        """
+        Decides whether the current frame should be rendered (called by the default callback once per frame after ticking the Stages).
+        By default, renders every `render_every`-th frame (never if render_every is 0 or our Display doesn't render at all).
+        Can be overridden for other strategies (e.g. only render while someone is watching).
+
+        :return: whether to render the current frame
+        :rtype: bool
+        """
+        if self.display is None or not self.display.do_render or not self.render_every:
+            return False
+        return self.frame % self.render_every == 0
 
     def pause(self):
         """
@@ -1060,8 +1711,8 @@ class GameLoop(object):
         # move the clock and store the dt (since last frame) in sec
         self.dt = self.timer.tick(max_fps) / 1000
 
-        # default global events?
-        events = pygame.event.get(pygame.QUIT)  # TODO: add more here?
+        # default global events? (no event queue if no video system, e.g. running headless)
+        events = pygame.event.get(pygame.QUIT) if pygame.display.get_init() else []  # TODO: add more here?
         for e in events:
             if e.type == pygame.QUIT:
                 raise Exception(SystemExit, "QUIT")
@@ -1075,29 +1726,115 @@ class GameLoop(object):
         # increase global frame counter
         self.frame += 1
 
-    def step(self, action):
+    def step(self, action=None, dt=None):
         """
-        (!)for reinforcement learning only(!) WIP:
-        Executes one action on the game.
-        The action gets translated into a keyboard sequence first, then is played.
+        (!)for reinforcement learning only(!):
+        Executes one action on the game (one frame) without waiting for our clock and returns the observation.
+        The action gets translated into the set of keys pressed during this frame first, then the frame is played.
 
-        :param str action: the action to execute on the MDP
+        :param Union[str,List[str],None] action: the description(s) of the key(s) to press during this frame (all other keys are released);
+            e.g. "left" or ["right", "space"]; None for keeping the keys as they are
+        :param Union[float,None] dt: the time (in sec) to simulate in this frame (default: 1/max_fps; 1/60 if we have no max_fps)
+        :return: the observation (the rendered frame as numpy array, see Display.get_observation and self.observation_options) or None if this
+            frame was not rendered (see `render_this_frame`)
+        :rtype: Union[np.ndarray,None]
         """
-        # default global events?
-        events = pygame.event.get(pygame.QUIT)  # TODO: add more here?
+        if dt is None:
+            dt = 1 / self.max_fps if self.max_fps else 1 / 60
+        self.dt = dt
+
+        # default global events? (no event queue if no video system, e.g. running headless)
+        events = pygame.event.get(pygame.QUIT) if pygame.display.get_init() else []  # TODO: add more here?
         for e in events:
             if e.type == pygame.QUIT:
-                raise (SystemExit, "QUIT")
+                raise Exception(SystemExit, "QUIT")
 
-        # collect keyboard events
+        # collect keyboard events, then apply the action
         self.keyboard_inputs.tick()
+        if action is not None:
+            self.keyboard_inputs.set_pressed_keys(action)
 
         # call the callback with self (for references to important game parameters)
+        rendered = self.render_this_frame()
         self.callback(self)
 
         # increase global frame counter
         self.frame += 1
 
+        if not rendered:
+            return None
+        return self.display.get_observation(**self.observation_options)
+
+
+class RenderQueue(object):
+    """
+    Holds TiledTileLayers and Sprites ordered by their render_order property (lowest renders first) for a Stage to render.
+    Objects with the same render_order are rendered in the order in which they were added.
+    Each render_order value gets its own insertion-ordered bucket (a dict), so that adding and removing objects is O(1) and the sorted list of
+    render_order values only needs to be touched when a new render_order value shows up.
+    """
+
+    def __init__(self, objects=None):
+        """
+        :param Union[iterable,None] objects: the TiledTileLayers and Sprites to start with
+        """
+        self.buckets = {}  # key=render_order; value=dict of all objects with that render_order (values are all None; used as an ordered set)
+        self.render_orders = []  # sorted list of all render_order values that we have a bucket for
+        self.entries = {}  # key=object; value=the render_order under which the object is stored (in case the object's render_order changes later)
+        if objects is not None:
+            self.extend(objects)
+
+    def add(self, obj):
+        """
+        Adds a TiledTileLayer or a Sprite to the end of its render_order's bucket.
+
+        :param Union[TiledTileLayer,Sprite] obj: the object to add
+        """
+        self.extend((obj,))
+
+    def extend(self, objects):
+        """
+        Adds many TiledTileLayers and/or Sprites at once (each one to the end of its render_order's bucket).
+        Sorts the render_order values only once (and only if new values showed up).
+
+        :param iterable objects: the objects to add
+        """
+        new_render_orders = False
+        for obj in objects:
+            if obj in self.entries:
+                continue
+            render_order = self.entries[obj] = obj.render_order
+            bucket = self.buckets.get(render_order)
+            if bucket is None:
+                bucket = self.buckets[render_order] = {}
+                self.render_orders.append(render_order)
+                new_render_orders = True
+            bucket[obj] = None
+        if new_render_orders:
+            self.render_orders.sort()
+
+    def remove(self, obj):
+        """
+        Removes a TiledTileLayer or a Sprite from the queue.
+
+        :param Union[TiledTileLayer,Sprite] obj: the object to remove
+        :raises ValueError: if the object is not in the queue (same as list.remove)
+        """
+        render_order = self.entries.pop(obj, None)
+        if render_order is None:
+            raise ValueError("ERROR: RenderQueue.remove(x): x not in RenderQueue!")
+        del self.buckets[render_order][obj]
+
+    def __contains__(self, obj):
+        return obj in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        for render_order in self.render_orders:
+            yield from self.buckets[render_order]
+
 
 class Stage(GameObject):
     """
@@ -1109,6 +1846,7 @@ class Stage(GameObject):
     # list of all Stages
     max_stages = 10
     stages = [None for x in range(max_stages)]
+    staged_screens = [None for x in range(max_stages)]  # the Screen that was last staged on each Stage index (see stage_screen)
     active_stage = 0  # the currently ticked/rendered Stage
     locate_obj = Sprite(0, 0, width_height=(0, 0))  # used to do test collisions on a Stage
 
@@ -1116,7 +1854,8 @@ class Stage(GameObject):
     def stage_default_game_loop_callback(game_loop: GameLoop):
         """
         The default game loop callback to use if none is given when staging a Scene.
-        Order: Clamps dt (to avoid extreme values), ticks all stages, renders all stages, updates the pygame.display
+        Order: Clamps dt (to avoid extreme values), ticks all stages (once or - with the GameLoop's sim_dt set - at a fixed rate), renders all stages
+        and updates the pygame.display (only if the GameLoop decides to render this frame)
 
         :param GameLoop game_loop: the currently playing (active) GameLoop
         """
@@ -1126,17 +1865,37 @@ class Stage(GameObject):
         elif game_loop.dt > 1.0 / 15:
             game_loop.dt = 1.0 / 15
 
-        # tick all Stages
-        for i, stage in enumerate(Stage.stages):
-            Stage.active_stage = i
-            if stage:
-                stage.tick(game_loop)
+        # tick all Stages at a fixed rate: as many sim_dt steps as fit into the (clamped) frame time (keep the rest for the next frame)
+        if game_loop.sim_dt:
+            frame_dt = game_loop.dt
+            game_loop.sim_time += frame_dt
+            game_loop.dt = game_loop.sim_dt
+            while game_loop.sim_time >= game_loop.sim_dt:
+                game_loop.sim_time -= game_loop.sim_dt
+                Stage.tick_stages(game_loop)
+            game_loop.dt = frame_dt
+        # tick all Stages once
+        else:
+            Stage.tick_stages(game_loop)
 
         # render all Stages and refresh the pygame.display
-        Stage.render_stages(game_loop.display, refresh_after_render=True)
+        if game_loop.render_this_frame():
+            Stage.render_stages(game_loop.display, refresh_after_render=True)
 
         Stage.active_stage = 0
 
+    @staticmethod
+    def tick_stages(game_loop):
+        """
+        Loops through all Stages and ticks all of them.
+
+        :param GameLoop game_loop: the currently playing (active) GameLoop
+        """
+        for i, stage in enumerate(Stage.stages):
+            Stage.active_stage = i
+            if stage:
+                stage.tick(game_loop)
+
     @staticmethod
     def render_stages(display, refresh_after_render=False):
         """
@@ -1145,6 +1904,12 @@ class Stage(GameObject):
         :param Display display: Display object on which to render
         :param bool refresh_after_render: do we refresh the pygame.display after all Stages have been called with `render`?
         """
+        if not display.do_render:
+            return
+        if display.dirty_rect_rendering:
+            Stage.render_stages_dirty_rects(display, refresh_after_render)
+            return
+
         # black out display (really necessary? I think so)
         display.surface.fill(pygame.Color("#000000"))
         # call render on all Stages
@@ -1154,7 +1919,100 @@ class Stage(GameObject):
                 stage.render(display)
         # for debugging purposes
         if refresh_after_render:
-            pygame.display.flip()
+            display.refresh()
+
+    @staticmethod
+    def render_stages_dirty_rects(display, refresh_after_render=False):
+        """
+        Renders all Stages, but only redraws those regions of the Display that changed since the last frame (the old and new screen Rects of all
+        Sprites that moved, changed their image, appeared or disappeared). All other regions keep their content from the last frame.
+        Falls back to a full redraw if the Display's offsets (camera) or dims, the set of Stages or the Stages' TiledTileLayers changed.
+        Note: "post_render" listeners only show up on the screen inside the redrawn regions.
+
+        :param Display display: Display object on which to render
+        :param bool refresh_after_render: do we update the pygame.display (only the redrawn regions) after all Stages have been rendered?
+        """
+        stages = [(i, stage) for i, stage in enumerate(Stage.stages) if stage and not stage.is_hidden]
+        # let our Stages (their Viewports) set the Display's offsets first
+        for i, stage in stages:
+            Stage.active_stage = i
+            stage.trigger_event("pre_render", display)
+
+        # collect the screen Rects (and images) of all Sprites that get rendered in this frame
+        screen_rects = {}
+        layers = []
+        for i, stage in stages:
+            for layer_or_sprite in stage.to_render:
+                if getattr(layer_or_sprite, "ignore_after_n_ticks", 1) <= 0:
+                    continue
+                if isinstance(layer_or_sprite, Sprite):
+                    screen_rects[layer_or_sprite] = (layer_or_sprite.get_screen_rect(display), layer_or_sprite.image)
+                else:
+                    layers.append(layer_or_sprite)
+
+        state = (display.offsets[0], display.offsets[1], display.width, display.height, tuple(stage for i, stage in stages), tuple(layers))
+        full_redraw = state != display.dirty_rect_state
+        if full_redraw:
+            dirty_rects = [display.surface.get_rect()]
+        else:
+            dirty_rects = []
+            for sprite, (rect, image) in screen_rects.items():
+                last = display.last_screen_rects.get(sprite)
+                if last is None:
+                    dirty_rects.append(rect)
+                elif last[0] != rect or last[1] is not image:
+                    dirty_rects.append(rect)
+                    dirty_rects.append(last[0])
+            # Sprites that are gone
+            for sprite, (rect, image) in display.last_screen_rects.items():
+                if sprite not in screen_rects:
+                    dirty_rects.append(rect)
+            dirty_rects = Stage.merge_dirty_rects(dirty_rects, display.surface.get_rect())
+
+        display.dirty_rect_state = state
+        display.last_screen_rects = screen_rects
+
+        # redraw all dirty regions (clipped) from our layers' cached (chunk) surfaces and the Sprites touching the region
+        for rect in dirty_rects:
+            display.surface.set_clip(rect)
+            display.surface.fill(pygame.Color("#000000"))
+            for i, stage in stages:
+                Stage.active_stage = i
+                stage.render(display, area=rect)
+        display.surface.set_clip(None)
+
+        for i, stage in stages:
+            Stage.active_stage = i
+            stage.trigger_event("post_render", display)
+
+        if refresh_after_render:
+            if full_redraw:
+                display.refresh()
+            elif len(dirty_rects) > 0:
+                display.refresh(dirty_rects)
+
+    @staticmethod
+    def merge_dirty_rects(rects, bounds):
+        """
+        Clips the given Rects to the given bounds and merges all overlapping ones (so that no region gets redrawn twice).
+
+        :param List[pygame.Rect] rects: the list of dirty Rects
+        :param pygame.Rect bounds: the Rect to clip all dirty Rects to (usually the Display's area)
+        :return: the list of clipped, non-overlapping dirty Rects
+        :rtype: List[pygame.Rect]
+        """
+        merged = []
+        for rect in rects:
+            rect = rect.clip(bounds)
+            if rect.w == 0 or rect.h == 0:
+                continue
+            # swallow all already merged Rects that overlap with this one
+            i = rect.collidelist(merged)
+            while i != -1:
+                rect.union_ip(merged.pop(i))
+                i = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
 
     @staticmethod
     def clear_stage(idx):
@@ -1229,6 +2087,12 @@ class Stage(GameObject):
         screen_func(stage)
         Stage.active_stage = 0
 
+        # a different Screen (e.g. the next Level) than before: the old Stage (if any) is gone and the new one has acquired all its assets
+        # -> evict all assets that are not used anymore (staging the same Screen again (e.g. restarting a Level) keeps all cached assets)
+        if screen is not Stage.staged_screens[stage_idx]:
+            Stage.staged_screens[stage_idx] = screen
+            AssetCache.evict()
+
         # finally return the stage to the user for use if needed
         return stage
 
@@ -1239,26 +2103,78 @@ class Stage(GameObject):
          components (list): a list of components to add to this Stage during construction (usually, a Viewport gets added)
          tile_sprite_handler (callable): a method taking a TiledTileLayer and returning an ndarray (tile-x/y position) of TileSprite objects (None if tile is
           empty)
-         physics_collision_detector (callable): a method to use to detect a possible collision between two Sprites (defaults to AABBCollision.collide)
+         physics_collision_detector (Union[callable,type]): a method to use to detect a possible collision between two Sprites (defaults to
+          AABBCollision.collide); or a CollisionAlgorithm class (e.g. NumpyAABBCollision), whose `collide` method is then used for single pairs and -
+          if the class is `batched` - whose `collide_all` method is used to find all Sprite-vs-Sprite collisions of a frame in one pass
          tick_sprites_in_range_only (bool): if set to True (default), we will not tick those Sprite objects that are currently outside a) our Viewport
           component or b) outside the display
+         temporal_coherence (bool): if set to True, Sprites that haven't moved since the last collision pass skip their broad-phase query and only
+          test the Sprites they collided with in the last pass plus the Sprites that moved close to them (only use with physics_collision_detectors that
+          only depend on the Sprites' rects); a change of a Sprite's type, collision_mask or ignored state counts as a move; the number of skipped
+          pair tests is reported in frame_stats["pair_tests_skipped"]; useful for scenes where most Sprites stand still; defaults to False
+         broad_phase (callable): a BroadPhase class (or any callable taking this Stage and returning a BroadPhase object, e.g. a functools.partial of
+          SpatialHashGrid) to use for finding candidate Sprites before calling the physics_collision_detector (used by the Stage's and the physics
+          Components' collision detection); defaults to None (testing each Sprite against all other Sprites). Note: Sprites that change their rect
+          in place (e.g. rect.x += 5) instead of calling Sprite.move are only re-indexed at the beginning of each collision pass (see solve_collisions)
+         tile_layer_chunk_size (int): the width and height (in tiles) of the chunk surfaces that our rendered TiledTileLayers are split into
+          (chunks are only built once they first show up in the viewport); defaults to 16
+         render_cull_margin (Union[int,None]): Sprites that are (with their images) farther than this many pixels outside the visible region of the
+          Display are not rendered (culled); defaults to 0; None for no culling
+         batched_rendering (bool): if set to True (default), the images of all consecutive (in render order) Sprites that don't override
+          Sprite.render are blitted with one single pygame.Surface.blits call (the DEBUG_RENDER_SPRITES_RECTS rects are then drawn in a separate
+          overlay pass after all layers and Sprites)
+         texture_atlas (bool): if set to True, the images of our Sprites (all tiles of their SpriteSheets; not their static images) are packed
+          into a TextureAtlas and rendered from there; defaults to False (note: SpriteSheet images must then not be changed in place)
+         texture_atlas_page_size (int): the width and height of the TextureAtlas' pages; defaults to 1024
         """
         super().__init__()
         self.screen = screen  # the screen object associated with this Stage
         self.tiled_tile_layers = {}  # TiledLayer objects by name
         self.tiled_object_groups = {}  # TiledObjectGroup objects by name
-        self.to_render = []  # list of all layers and sprites by name (TiledTileLayers AND Sprites) in the order in which they have to be rendered
+        self.to_render = RenderQueue()  # all layers and sprites (TiledTileLayers AND Sprites) in the order in which they have to be rendered
 
         # dict of pygame.sprite.Group objects (by name) that contain Sprites (each TiledObjectGroup results in one Group)
         # - the name of the group is always the name of the TiledObjectGroup in the tmx file
         self.sprite_groups = {}
         self.sprites = []  # a plain list of all Sprites in this Stage
+        self.next_stage_order = 0  # the stage_order value to give to the next Sprite being added
+        self.type_buckets = {}  # key=type bit (see Sprite.types); value=set of all our Sprites that have this bit set in their type
+        self.sprite_types = {}  # key=Sprite; value=the type with which the Sprite is currently stored in self.type_buckets
+        # key=type mask; value=list of all our Sprites matching that mask in Stage order (see get_sprites_by_type; cleared when a type-bucket changes)
+        self.sprites_by_type_mask = {}
 
         self.remove_list = []  # sprites to be removed from the Stage (only remove when Stage gets ticked)
 
-        defaults(options, {"physics_collision_detector": AABBCollision.collide, "tick_sprites_in_range_only": True, "tick_sprites_n_more_frames": 500})
+        defaults(options, {"physics_collision_detector": AABBCollision.collide, "tick_sprites_in_range_only": True, "tick_sprites_n_more_frames": 500,
+                           "broad_phase": None, "temporal_coherence": False,
+                           "tile_layer_chunk_size": 16, "render_cull_margin": 0,
+                           "batched_rendering": True, "texture_atlas": False, "texture_atlas_page_size": 1024})
         self.options = options
 
+        # the TextureAtlas that all SpriteSheet tiles of our Sprites get packed into (when they are added to us)
+        self.texture_atlas = TextureAtlas(self.options["texture_atlas_page_size"]) if self.options["texture_atlas"] else None  # type: Union[TextureAtlas,None]
+
+        # a CollisionAlgorithm class was given as detector: use its collide method for single pairs (and maybe its batched collide_all for all Sprites)
+        self.collision_algorithm = None  # type: Union[type,None]
+        if isinstance(self.options["physics_collision_detector"], type):
+            self.collision_algorithm = self.options["physics_collision_detector"]
+            assert issubclass(self.collision_algorithm, CollisionAlgorithm), \
+                "ERROR: Stage's options['physics_collision_detector'] must be a callable or a CollisionAlgorithm class!"
+            self.options["physics_collision_detector"] = self.collision_algorithm.collide
+        # the persistent NumPy mirror of our Sprites' data for a batched CollisionAlgorithm (updated in place each collision pass)
+        self.sprite_arrays = SpriteArrays() if self.collision_algorithm and self.collision_algorithm.batched else None  # type: Union[SpriteArrays,None]
+
+        # key=Sprite; value=list of the Sprites that it collided with (as sprite1) in the last collision pass (for temporal coherence)
+        self.contacts = {}
+        # key=Sprite; value=the number of pair tests it did (as sprite1) the last time it checked all its candidates (for temporal coherence)
+        self.pair_test_counts = {}
+        # some statistics about the last frame (e.g. how many Sprite-vs-Sprite pair tests we could skip thanks to temporal coherence or how many
+        # Sprites were culled in the last render pass for being outside the visible region)
+        self.frame_stats = {"collision_tests": 0, "pair_tests_skipped": 0, "sprites_culled": 0}
+
+        # the spatial index of our Sprites (if any) used to narrow down the Sprite-vs-Sprite collision candidates
+        self.broad_phase = self.options["broad_phase"](self) if self.options["broad_phase"] else None  # type: Union[BroadPhase,None]
+
         self.is_paused = False
         self.is_hidden = False
 
@@ -1288,6 +2204,9 @@ class Stage(GameObject):
 
     def destroyed(self):
         self.invoke("debind_events")
+        # our Sprites don't use their cached assets anymore
+        self.invoke("release_assets")
+        self.texture_atlas = None
 
     def for_each(self, callback, params=None):
         """
@@ -1333,7 +2252,7 @@ class Stage(GameObject):
     def locate(self, x, y, w=1, h=1, type_=Sprite.get_type("default"), collision_mask=Sprite.get_type("default")):
         """
         Returns the first Collision found by colliding the given measurements (Rect) against this Stage's objects.
-        Starts with all TiledTileLayer objects, then all other Sprites.
+        Starts with all TiledTileLayer objects, then all other Sprites (only those returned by our broad-phase, if we have one).
 
         :param int x: the x-coordinate of the Rect to check
         :param int y: the y-coordinate of the Rect to check
@@ -1344,19 +2263,7 @@ class Stage(GameObject):
         :return: the first Collision encountered
         :rtype: Union[Collision,None]
         """
-        obj = self.locate_obj
-        obj.rect.x = x
-        obj.rect.y = y
-        obj.rect.width = w
-        obj.rect.height = h
-        obj.type = type_
-        obj.collision_mask = collision_mask
-
-        if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_RECTS:
-            pygame.draw.rect(self.screen.display.surface, DEBUG_RENDER_SPRITES_RECTS_COLOR,
-                             pygame.Rect((obj.rect.x - self.screen.display.offsets[0], obj.rect.y - self.screen.display.offsets[1]),
-                                         (obj.rect.w, obj.rect.h)), 1)
-            GameLoop.active_loop.display.debug_refresh()
+        obj = self.get_locate_obj(x, y, w, h, type_, collision_mask)
 
         # collide with all matching tile layers
         for tiled_tile_layer in self.tiled_tile_layers.values():
@@ -1367,7 +2274,8 @@ class Stage(GameObject):
                     return col
 
         # collide with all Sprites (only if both collision masks match each others types)
-        for sprite in self.sprites:
+        # - with a broad-phase: only with those Sprites close to the Rect (in Stage order)
+        for sprite in self.get_sprites_near(obj.rect, obj.collision_mask):
             if obj.collision_mask & sprite.type and sprite.collision_mask & obj.type:
                 col = self.options["physics_collision_detector"](obj, sprite)
                 if col:
@@ -1375,6 +2283,124 @@ class Stage(GameObject):
         # nothing found
         return None
 
+    def query_rect(self, x, y, w=1, h=1, type_=Sprite.get_type("default"), collision_mask=Sprite.get_type("default")):
+        """
+        Returns all Collisions found by colliding the given measurements (Rect) against this Stage's objects (unlike `locate`, which only returns
+        the first one).
+        Starts with all tiles of all TiledTileLayer objects, then all other Sprites (only those returned by our broad-phase, if we have one).
+        Each returned Collision is a new object (not one of the collision detector's recycled ones), so they can all be kept.
+
+        :param int x: the x-coordinate of the Rect to check
+        :param int y: the y-coordinate of the Rect to check
+        :param int w: the width of the Rect to check
+        :param int h: the height of the Rect to check
+        :param int type_: the type of the Rect (has to match collision_mask of Stage's objects)
+        :param int collision_mask: the collision mask of the Rect (only layers and Sprites that match this mask are checked)
+        :return: a list of all Collisions encountered (empty list if none)
+        :rtype: List[Collision]
+        """
+        obj = self.get_locate_obj(x, y, w, h, type_, collision_mask)
+        detector = self.options["physics_collision_detector"]
+        ret = []
+
+        # collide with all tiles of all matching tile layers
+        for tiled_tile_layer in self.tiled_tile_layers.values():
+            if obj.collision_mask & tiled_tile_layer.type:
+                tile_start_x, tile_end_x, tile_start_y, tile_end_y = tiled_tile_layer.get_overlapping_tiles(obj)
+                for tile_x in range(tile_start_x, tile_end_x + 1):
+                    for tile_y in range(tile_start_y, tile_end_y + 1):
+                        tile_sprite = tiled_tile_layer.tile_sprites[tile_x, tile_y]
+                        if tile_sprite:
+                            col = detector(obj, tile_sprite, collision_objects=(Collision(), Collision()))
+                            if col:
+                                ret.append(col)
+
+        # collide with all Sprites close to the Rect (only if both collision masks match each others types)
+        for sprite in self.get_sprites_near(obj.rect, obj.collision_mask):
+            if obj.collision_mask & sprite.type and sprite.collision_mask & obj.type:
+                col = detector(obj, sprite, collision_objects=(Collision(), Collision()))
+                if col:
+                    ret.append(col)
+
+        return ret
+
+    def get_locate_obj(self, x, y, w, h, type_, collision_mask):
+        """
+        Sets up our (static) locate_obj Sprite with the given measurements, type and collision_mask (used by `locate` and `query_rect`).
+
+        :param int x: the x-coordinate of the Rect
+        :param int y: the y-coordinate of the Rect
+        :param int w: the width of the Rect
+        :param int h: the height of the Rect
+        :param int type_: the type of the Rect
+        :param int collision_mask: the collision mask of the Rect
+        :return: the locate_obj Sprite
+        :rtype: Sprite
+        """
+        obj = self.locate_obj
+        obj.rect.x = x
+        obj.rect.y = y
+        obj.rect.width = w
+        obj.rect.height = h
+        obj.type = type_
+        obj.collision_mask = collision_mask
+
+        if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_RECTS:
+            pygame.draw.rect(self.screen.display.surface, DEBUG_RENDER_SPRITES_RECTS_COLOR,
+                             pygame.Rect((obj.rect.x - self.screen.display.offsets[0], obj.rect.y - self.screen.display.offsets[1]),
+                                         (obj.rect.w, obj.rect.h)), 1)
+            GameLoop.active_loop.display.debug_refresh()
+
+        return obj
+
+    def get_swept_motion(self, sprite, dx, dy, layer_type_mask=None, full_tiles_only=False, sprite_type_mask=0, ignore=None, mutual_masks=False):
+        """
+        Returns the given motion vector of a Sprite clipped at the earliest contact (time of impact) with any tile of the matching TiledTileLayers
+        (and - optionally - with any matching Sprite) along the way.
+        Used by fast moving Sprites to take large steps without tunneling through (thin) obstacles.
+
+        :param Sprite sprite: the moving Sprite (at the position before the move)
+        :param float dx: the x-component of the motion vector (in px)
+        :param float dy: the y-component of the motion vector (in px)
+        :param Union[int,None] layer_type_mask: only sweep against the tiles of layers whose type matches this mask (None for the Sprite's
+            collision_mask)
+        :param bool full_tiles_only: whether to only sweep against full collision tiles (not against slopes)
+        :param int sprite_type_mask: also sweep against all Sprites whose type matches this mask (0 for no Sprites)
+        :param Union[Sprite,None] ignore: a Sprite to not sweep against (e.g. the shooter of a Shot)
+        :param bool mutual_masks: whether the other Sprites' collision_masks also have to match the moving Sprite's type (like in `solve_collisions`)
+        :return: the (clipped) motion vector
+        :rtype: Tuple[float,float]
+        """
+        if layer_type_mask is None:
+            layer_type_mask = sprite.collision_mask
+        swept_rect = sprite.rect.union(sprite.rect.move(int(dx), int(dy)))
+        swept_rect.inflate_ip(2, 2)
+        others = []
+        for layer in self.tiled_tile_layers.values():
+            if layer.type & layer_type_mask:
+                others.extend(layer.get_tile_sprites_in_rect(swept_rect, full_tiles_only))
+        if sprite_type_mask:
+            others.extend(s for s in self.get_sprites_near(swept_rect, sprite_type_mask)
+                          if s is not ignore and (not mutual_masks or s.collision_mask & sprite.type))
+        return AABBCollision.clip_motion(dx, dy, AABBCollision.sweep(sprite, others, dx, dy, (Collision(), Collision())))
+
+    def get_sprites_near(self, rect, type_mask=None):
+        """
+        Returns all Sprites of this Stage that could possibly overlap with the given rect (in the order in which they were added to the Stage).
+        Uses our broad-phase (if we have one), otherwise returns all our Sprites (or only those from the type-buckets selected by type_mask).
+
+        :param pygame.Rect rect: the rect to look for Sprites
+        :param Union[int,None] type_mask: if given, only return Sprites whose type matches this mask (e.g. the colliding Sprite's collision_mask)
+        :return: a list of candidate Sprites (may contain Sprites that do not actually overlap with rect)
+        :rtype: List[Sprite]
+        """
+        if not self.broad_phase:
+            return self.sprites if type_mask is None else self.get_sprites_by_type(type_mask)
+        candidates = self.broad_phase.query(rect)
+        if type_mask is not None:
+            candidates = [sprite for sprite in candidates if sprite.type & type_mask]
+        return sorted(candidates, key=attrgetter("stage_order"))
+
     def add_tiled_layer(self, pytmx_layer, pytmx_tiled_map):
         """
         Adds a pytmx.TiledElement to the Stage with all its tiles or objects.
@@ -1385,17 +2411,17 @@ class Stage(GameObject):
         :param pytmx.pytmx.TiledMap pytmx_tiled_map: the original pytmx TiledMap object (the tmx file) to which this layer belongs
         """
         # a TiledObjectGroup ("Object Layer" in the tmx file)
-        if isinstance(pytmx_layer, pytmx.pytmx.TiledObjectGroup):
+        if isinstance(pytmx_layer, (pytmx.pytmx.TiledObjectGroup, CompiledTiledObjectGroup)):
             assert pytmx_layer.name not in self.tiled_object_groups, "ERROR: TiledObjectGroup with name {} already exists in Stage!".format(pytmx_layer.name)
             l = TiledObjectGroup(pytmx_layer, pytmx_tiled_map)
             self.add_tiled_object_group(l)
 
         # a TiledTileLayer ("Tile Layer" in the tmx file)
-        elif isinstance(pytmx_layer, pytmx.pytmx.TiledTileLayer):
+        elif isinstance(pytmx_layer, (pytmx.pytmx.TiledTileLayer, CompiledTiledTileLayer)):
             assert pytmx_layer.name not in self.tiled_tile_layers, "ERROR: TiledTileLayer with name {} already exists in Stage!".format(pytmx_layer.name)
             assert "tile_sprite_handler" in self.options, \
                 "ERROR: a TiledTileLayer needs a tile_sprite_handler callable to generate all TileSprite objects in the layer!"
-            l = TiledTileLayer(pytmx_layer, pytmx_tiled_map, self.options["tile_sprite_handler"])
+            l = TiledTileLayer(pytmx_layer, pytmx_tiled_map, self.options["tile_sprite_handler"], self.options["tile_layer_chunk_size"])
             self.add_tiled_tile_layer(l)
 
         else:
@@ -1417,9 +2443,8 @@ class Stage(GameObject):
                 format(tiled_object_group.name)
         self.sprite_groups[tiled_object_group.name] = tiled_object_group.sprite_group
 
-        # add each single sprite of the group to the Stage
-        for sprite in tiled_object_group.sprite_group.sprites():
-            self.add_sprite(sprite, tiled_object_group.name)
+        # add all single sprites of the group to the Stage
+        self.add_sprites(tiled_object_group.sprite_group.sprites(), tiled_object_group.name)
 
     def add_tiled_tile_layer(self, tiled_tile_layer):
         """
@@ -1436,10 +2461,9 @@ class Stage(GameObject):
         # put only TiledTileLayers in to_render (iff do_render=true) and single Sprites (from the TiledObjectGroup) all ordered by render_order
         self.tiled_tile_layers[tiled_tile_layer.name] = tiled_tile_layer
 
-        # add it to the to_render list and re-sort the list by render_order values (note: this list also contains single Sprites)
+        # add it to the to_render queue (sorted by render_order values; note: this queue also contains single Sprites)
         if tiled_tile_layer.do_render:
-            self.to_render.append(tiled_tile_layer)
-            self.to_render.sort(key=lambda x: x.render_order)
+            self.to_render.add(tiled_tile_layer)
 
         # capture ladders and other autobuild structures?
         if tiled_tile_layer.properties.get("autobuild_objects") == "true":
@@ -1452,29 +2476,52 @@ class Stage(GameObject):
         Adds a new single Sprite to an existing or a new pygame.sprite.Group.
 
         :param Sprite sprite: the Sprite to be added to this Stage (the Sprite's position is defined in its rect.x/y properties)
-        :param str group_name: the name of the group to which the GameObject should be added (group will not be created if it doesn't exist yet)
+        :param str group_name: the name of the group to which the GameObject should be added (group will be created if it doesn't exist yet)
         :return: the Sprite that was added
         :rtype: Sprite
         """
+        return self.add_sprites((sprite,), group_name)[0]
+
+    def add_sprites(self, sprites, group_name):
+        """
+        Adds many new single Sprites at once to an existing or a new pygame.sprite.Group.
+        All Sprites are added first (the render queue only gets ordered once), then the "added_to_stage" events are triggered for each Sprite.
+
+        :param iterable sprites: the Sprites to be added to this Stage (the Sprites' positions are defined in their rect.x/y properties)
+        :param str group_name: the name of the group to which the Sprites should be added (group will be created if it doesn't exist yet)
+        :return: the list of Sprites that were added
+        :rtype: List[Sprite]
+        """
+        sprites = list(sprites)
         # if the group doesn't exist yet, create it
         if group_name not in self.sprite_groups:
             self.sprite_groups[group_name] = pygame.sprite.Group()
-        sprite.stage = self  # set the Stage of this GameObject
-        self.sprite_groups[group_name].add(sprite)
-        self.sprites.append(sprite)
-        sprite.sprite_groups.append(self.sprite_groups[group_name])
-
-        # add each single Sprite to the sorted (by render_order) to_render list and to the "all"-sprites list
-        # - note: the to_render list also contains entire TiledTileLayer objects
-        if sprite.do_render:
-            self.to_render.append(sprite)
-            self.to_render.sort(key=lambda x: x.render_order)
-
-        # trigger two events, one on the Stage with the object as target and one on the object with the Stage as target
-        self.trigger_event("added_to_stage", sprite)
-        sprite.trigger_event("added_to_stage", self)
-
-        return sprite
+        group = self.sprite_groups[group_name]
+
+        for sprite in sprites:
+            sprite.stage = self  # set the Stage of this GameObject
+            sprite.stage_order = self.next_stage_order
+            self.next_stage_order += 1
+            group.add(sprite)
+            self.sprites.append(sprite)
+            sprite.sprite_groups.append(group)
+            self.sprite_types[sprite] = 0
+            self.sprite_type_changed(sprite)
+            if self.broad_phase:
+                self.broad_phase.add(sprite)
+            if self.texture_atlas:
+                self.texture_atlas.add_sprite(sprite)
+
+        # add all Sprites to the sorted (by render_order) to_render queue
+        # - note: the to_render queue also contains entire TiledTileLayer objects
+        self.to_render.extend(sprite for sprite in sprites if sprite.do_render)
+
+        # trigger two events per Sprite, one on the Stage with the object as target and one on the object with the Stage as target
+        for sprite in sprites:
+            self.trigger_event("added_to_stage", sprite)
+            sprite.trigger_event("added_to_stage", self)
+
+        return sprites
 
     def remove_sprite(self, sprite: Sprite):
         """
@@ -1497,10 +2544,69 @@ class Stage(GameObject):
         except ValueError:
             return
 
+        self.remove_from_type_buckets(sprite)
+        del self.sprite_types[sprite]
+        if self.broad_phase:
+            self.broad_phase.remove(sprite)
+
         # destroy the object
         sprite.destroy()
         self.trigger_event("removed_from_stage", sprite)
 
+    def sprite_type_changed(self, sprite):
+        """
+        Moves a Sprite into the correct type-buckets after its type has changed (gets called automatically by Sprite's type setter).
+        Does nothing if the Sprite is not (or no longer) part of this Stage.
+
+        :param Sprite sprite: the Sprite whose type has changed
+        """
+        if sprite not in self.sprite_types or self.sprite_types[sprite] == sprite.type:
+            return
+        self.remove_from_type_buckets(sprite)
+        type_ = self.sprite_types[sprite] = sprite.type
+        if type_:
+            self.sprites_by_type_mask = {}
+        while type_:
+            bit = type_ & -type_  # lowest set bit
+            type_ ^= bit
+            bucket = self.type_buckets.get(bit)
+            if bucket is None:
+                bucket = self.type_buckets[bit] = set()
+            bucket.add(sprite)
+
+    def remove_from_type_buckets(self, sprite):
+        """
+        Removes a Sprite from all type-buckets it is currently stored in.
+
+        :param Sprite sprite: the Sprite to remove
+        """
+        type_ = self.sprite_types[sprite]
+        if type_:
+            self.sprites_by_type_mask = {}
+        while type_:
+            bit = type_ & -type_
+            type_ ^= bit
+            self.type_buckets[bit].discard(sprite)
+
+    def get_sprites_by_type(self, type_mask):
+        """
+        Returns all our Sprites whose type matches (at least one bit of) the given type mask (in the order in which they were added to the Stage).
+        The ordered list is built once per type mask and then reused until a Sprite is added, removed or changes its type (e.g. once per collision
+        pass for all Sprites with the same collision_mask), so the returned list must not be changed.
+
+        :param int type_mask: the type mask to look for (e.g. a Sprite's collision_mask or Sprite.get_type("enemy,friendly"))
+        :return: the list of matching Sprites
+        :rtype: List[Sprite]
+        """
+        ret = self.sprites_by_type_mask.get(type_mask)
+        if ret is None:
+            matches = set()
+            for bit, bucket in self.type_buckets.items():
+                if bit & type_mask:
+                    matches.update(bucket)
+            ret = self.sprites_by_type_mask[type_mask] = sorted(matches, key=attrgetter("stage_order"))
+        return ret
+
     def pause(self):
         """
         Pauses playing the Stage.
@@ -1589,14 +2695,52 @@ class Stage(GameObject):
                         if col:
                             sprite.trigger_event("collision", col)
 
+        # re-index all Sprites that moved (also those that changed their rects in place) in our broad-phase (also needed by `locate`, etc..
+        # between collision passes)
+        if self.broad_phase:
+            self.broad_phase.update_all()
+        temporal_coherence = self.options["temporal_coherence"]
+        if temporal_coherence:
+            self.update_moved_flags()
+
         # collide all Sprites with all other Sprites (both ways!)
+        # - a batched CollisionAlgorithm finds all colliding pairs at once (in the same order as the loop below)
+        if self.sprite_arrays is not None:
+            for col in self.collision_algorithm.collide_all(self.sprites, arrays=self.sprite_arrays):
+                col.sprite1.trigger_event("collision", col)
+                col.sprite2.trigger_event("collision", col.invert())
+            return
+
         # - only check if sprite1's collision_matrix matches sprite2's type
+        # - with a broad-phase: only check those sprite2s that are close to sprite1 (in the same Stage order as without a broad-phase)
+        # - with temporal coherence: Sprites that haven't moved only check the Sprites they touched last frame and the moved Sprites close to them
+        # - the number of skipped pair tests of an unmoved Sprite is estimated from the number of pair tests it did the last time it checked all its
+        #   candidates
+        if temporal_coherence:
+            last_contacts = self.contacts
+            contacts = self.contacts = {}
+            last_pair_test_counts = self.pair_test_counts
+            pair_test_counts = self.pair_test_counts = {}
+            moved_neighbours = self.get_moved_neighbours()
+        num_tests = num_skipped = 0
         for sprite in self.sprites:
             # not ignored (one-tick) and if this Sprite completely handles its own collisions within its tick -> ignore it
             if sprite.ignore_after_n_ticks > 0 and not sprite.handles_own_collisions and sprite.collision_mask > 0:
-                for sprite2 in self.sprites:
+                direction = None
+                skipping = temporal_coherence and not (sprite.moved_in_frame or sprite.moved)
+                if skipping:
+                    candidates = set(sprite2 for sprite2 in last_contacts.get(sprite, ()) if sprite2 in self.sprite_types)
+                    candidates.update(moved_neighbours.get(sprite, ()))
+                    candidates = sorted(candidates, key=attrgetter("stage_order"))
+                else:
+                    candidates = self.get_sprites_near(sprite.rect, sprite.collision_mask)
+                num_sprite_tests = 0
+                for sprite2 in candidates:
                     if sprite is not sprite2 and sprite2.collision_mask > 0 and sprite.collision_mask & sprite2.type and sprite2.collision_mask & sprite.type:
-                        direction, v = self.estimate_sprite_direction(sprite)
+                        num_sprite_tests += 1
+                        # only (re)estimate our direction when needed (sprite1's velocity can only change through a collision handler)
+                        if direction is None:
+                            direction, v = self.estimate_sprite_direction(sprite)
                         col = self.options["physics_collision_detector"](sprite, sprite2, direction=direction, direction_veloc=v)
                         if col:
                             # trigger "collision" for sprite1
@@ -1604,6 +2748,60 @@ class Stage(GameObject):
                             ## but only for sprite2 if it does NOT handle its own collisions
                             #if not sprite2.handles_own_collisions:
                             sprite2.trigger_event("collision", col.invert())
+                            direction = None
+                            if temporal_coherence:
+                                contacts.setdefault(sprite, []).append(sprite2)
+                num_tests += num_sprite_tests
+                if skipping:
+                    last_count = last_pair_test_counts.get(sprite, 0)
+                    pair_test_counts[sprite] = last_count
+                    num_skipped += max(last_count - num_sprite_tests, 0)
+                elif temporal_coherence:
+                    pair_test_counts[sprite] = num_sprite_tests
+
+        self.frame_stats["collision_tests"] = num_tests
+        self.frame_stats["pair_tests_skipped"] = num_skipped
+
+    def get_moved_neighbours(self):
+        """
+        Returns - for each Sprite that hasn't moved since the last collision pass - the Sprites that have moved (`moved_in_frame`) and could now
+        overlap with it (found via the broad-phase queries of the moved Sprites; without a broad-phase all moved Sprites).
+        Used by the temporal-coherence mode of `solve_collisions`.
+
+        :return: dict with key=unmoved Sprite; value=list of moved Sprites close to it
+        :rtype: Dict[Sprite,List[Sprite]]
+        """
+        ret = {}
+        moved = [sprite for sprite in self.sprites if sprite.moved_in_frame]
+        if not moved:
+            return ret
+        # no broad-phase: all moved Sprites are close to all unmoved ones (all unmoved Sprites share the same list)
+        if not self.broad_phase:
+            return dict.fromkeys((sprite for sprite in self.sprites if not sprite.moved_in_frame), moved)
+        for sprite2 in moved:
+            for sprite in self.broad_phase.query(sprite2.rect):
+                if not sprite.moved_in_frame and sprite.collision_mask & sprite2.type:
+                    bucket = ret.get(sprite)
+                    if bucket is None:
+                        bucket = ret[sprite] = []
+                    bucket.append(sprite2)
+        return ret
+
+    def update_moved_flags(self):
+        """
+        Sets the `moved_in_frame` flag of all our Sprites (whether they have moved since the last collision pass, either via `move`, by getting
+        a new rect or by changing their rect in place (e.g. rect.x += 1)) and resets their `moved` flags.
+        A change of a Sprite's type, collision_mask or active state (ignored via ignore_after_n_ticks or handles_own_collisions) also counts as a move:
+        its contacts from the last pass are then no longer valid.
+        Everything that moves from here on counts as moved (`moved` flag) for the rest of this collision pass and for the next one.
+        """
+        for sprite in self.sprites:
+            rect = sprite.rect
+            state = (sprite.type, sprite.collision_mask, sprite.ignore_after_n_ticks > 0 and not sprite.handles_own_collisions)
+            sprite.moved_in_frame = sprite.moved or rect != sprite.last_rect or state != sprite.last_collision_state
+            sprite.moved = False
+            sprite.last_rect = rect.copy()
+            sprite.last_collision_state = state
 
     @staticmethod
     def estimate_sprite_direction(sprite):
@@ -1648,38 +2846,397 @@ class Stage(GameObject):
         """
         self.is_hidden = False
 
-    def stop(self):
+    def stop(self):
+        """
+        Stops playing the Stage (stops calling `tick` on all GameObjects).
+        """
+        self.hide()
+        self.pause()
+
+    def start(self):
+        """
+        Starts running the Stage (and calling all GameObject's `tick` method).
+        """
+        self.show()
+        self.unpause()
+
+    def render(self, display, area=None):
+        """
+        Gets called each frame by the GameLoop (after 'tick' is called on all Stages).
+        Renders all its layers (ordered by 'render_order' property of the TiledTileLayer in the tmx file).
+        TODO: renders Sprites that are not part of any layer.
+
+        :param Display display: the Display object to render on
+        :param Union[pygame.Rect,None] area: if given, only redraw the given (already clipped) region of the Display and skip all Sprites not touching it;
+            the pre_render and post_render events are not triggered in this case (see Stage.render_stages_dirty_rects)
+        """
+        if self.is_hidden:
+            return False
+
+        if area is None:
+            self.trigger_event("pre_render", display)
+            # the visible region of the Display (plus margin) outside of which we don't render any Sprites
+            margin = self.options["render_cull_margin"]
+            cull_rect = pygame.Rect(-margin, -margin, display.width + 2 * margin, display.height + 2 * margin) if margin is not None else None
+        else:
+            cull_rect = area
+
+        num_culled = 0
+        # the (image, destination) pairs of the current run of Sprites (in render order) that use the default Sprite.render
+        batch = [] if self.options["batched_rendering"] else None
+        # the batched Sprites, whose rects still have to be drawn in the debug overlay pass
+        debug_sprites = [] if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_RECTS else None
+        # loop through the sorted to_render list and render all TiledTileLayer and Sprite objects in this list
+        for layer_or_sprite in self.to_render:
+            if getattr(layer_or_sprite, "ignore_after_n_ticks", 1) <= 0:
+                continue
+            # cull Sprites whose on-screen Rect (after applying the Display's offsets) is not visible
+            if cull_rect is not None and isinstance(layer_or_sprite, Sprite) and not cull_rect.colliderect(layer_or_sprite.get_screen_rect(display)):
+                num_culled += 1
+                continue
+            # collect the blit for the batch
+            if batch is not None and type(layer_or_sprite).render is Sprite.render:
+                blit = layer_or_sprite.get_blit(display)
+                if blit:
+                    batch.append(blit)
+                if debug_sprites is not None:
+                    debug_sprites.append(layer_or_sprite)
+                continue
+            # a layer or a Sprite with its own render method: flush the batch first to keep the render order
+            if batch:
+                display.surface.blits(batch, doreturn=False)
+                batch.clear()
+            layer_or_sprite.render(display)
+
+        if batch:
+            display.surface.blits(batch, doreturn=False)
+        # debug overlay pass for the batched Sprites
+        if debug_sprites:
+            for sprite in debug_sprites:
+                sprite.render_debug_rect(display)
+
+        if area is None:
+            self.frame_stats["sprites_culled"] = num_culled
+            self.trigger_event("post_render", display)
+
+
+class CompiledTiledMap(object):
+    """
+    A pytmx.pytmx.TiledMap replacement that is loaded from a compiled (binary) cache file stored next to its tmx file (see `load`).
+    The cache holds everything the tmx file (and its external tsx files) define: the gid grids of all tile layers (as np.ndarrays), the tile-property
+    table (by gid) and the object spawn lists of all object layers. Only the tileset images are still loaded from their image files (see
+    `load_images`).
+    The cache file is a numpy .npz archive holding only data (the gid grids plus one JSON string for everything else); it is loaded without pickle,
+    so a manipulated cache file can't execute any code.
+    Offers the same interface as pytmx.pytmx.TiledMap (and its layers) as far as spygame uses it (width, height, tilewidth, tileheight, properties,
+    layers, images and get_tile_properties_by_gid).
+    """
+
+    # the version of the cache file's format (cache files with a different version are recompiled)
+    CACHE_VERSION = 2
+
+    def __init__(self, filename, map_data):
+        """
+        :param str filename: the tmx file this map was compiled from
+        :param dict map_data: the compiled map data (see `compile`)
+        """
+        self.filename = filename
+        self.width = map_data["width"]
+        self.height = map_data["height"]
+        self.tilewidth = map_data["tilewidth"]
+        self.tileheight = map_data["tileheight"]
+        self.properties = map_data["properties"]
+        self.tile_properties = map_data["tile_properties"]
+        self.image_specs = map_data["image_specs"]
+        self.num_gids = map_data["num_gids"]
+        self.images = [None] * self.num_gids  # the tile images by gid (see `load_images`)
+        self.layers = []
+        for layer_data in map_data["layers"]:
+            if layer_data["type"] == "tiles":
+                self.layers.append(CompiledTiledTileLayer(self, layer_data))
+            else:
+                self.layers.append(CompiledTiledObjectGroup(self, layer_data))
+
+    def get_tile_properties_by_gid(self, gid):
+        """
+        Returns the tile properties of the given gid (same as pytmx.pytmx.TiledMap.get_tile_properties_by_gid).
+
+        :param int gid: the gid of the tile
+        :return: the properties dict of the tile (None if the tile doesn't have any properties)
+        :rtype: Union[dict,None]
+        """
+        return self.tile_properties.get(gid)
+
+    @staticmethod
+    def get_cache_file(tmx_file):
+        """
+        Returns the name of the cache file for the given tmx file (e.g. data/level1.tmx -> data/level1.tmxc).
+
+        :param str tmx_file: the tmx file
+        :return: the name of the cache file
+        :rtype: str
+        """
+        return os.path.splitext(tmx_file)[0] + ".tmxc"
+
+    @staticmethod
+    def get_file_hash(file):
+        """
+        :param str file: the file to hash
+        :return: the sha1 hex-digest of the file's contents
+        :rtype: str
+        """
+        with open(file, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+
+    @staticmethod
+    def get_dependencies(tmx_file):
+        """
+        Returns the (mtime, hash)-records of all files that the compiled tmx file depends on (the tmx file and all its external tsx files).
+
+        :param str tmx_file: the tmx file
+        :return: list of (file, mtime, hash)-tuples
+        :rtype: List[tuple]
+        """
+        files = [tmx_file]
+        for tileset in xml.etree.ElementTree.parse(tmx_file).getroot().iter("tileset"):
+            source = tileset.get("source")
+            if source:
+                files.append(os.path.join(os.path.dirname(tmx_file), source))
+        return [(f, os.path.getmtime(f), CompiledTiledMap.get_file_hash(f)) for f in files]
+
+    @staticmethod
+    def is_fresh(dependencies):
+        """
+        Checks whether a cache file is still fresh: all files it depends on must have either the same mtime or (if touched) still the same hash.
+
+        :param List[tuple] dependencies: the (file, mtime, hash)-records stored in the cache file
+        :return: whether the cache file is fresh
+        :rtype: bool
+        """
+        for file, mtime, hash_ in dependencies:
+            if not os.path.isfile(file):
+                return False
+            if os.path.getmtime(file) != mtime and CompiledTiledMap.get_file_hash(file) != hash_:
+                return False
+        return True
+
+    @staticmethod
+    def load(tmx_file):
+        """
+        Loads the given tmx file from its cache file (if the cache file is fresh) or - if not - compiles the tmx file (and writes a new cache file).
+        Doesn't load any images (see `load_images`), so this can be done on a background thread.
+
+        :param str tmx_file: the tmx file to load
+        :return: the loaded map (a pytmx.pytmx.TiledMap (without images) if the tmx file can't be compiled (e.g. because it has image layers))
+        :rtype: Union[CompiledTiledMap,pytmx.pytmx.TiledMap]
+        """
+        cache_file = CompiledTiledMap.get_cache_file(tmx_file)
+        cache = None
+        if os.path.isfile(cache_file):
+            try:
+                cache = CompiledTiledMap.read_cache_file(cache_file)
+                if cache["version"] != CompiledTiledMap.CACHE_VERSION or not CompiledTiledMap.is_fresh(cache["dependencies"]):
+                    cache = None
+            # a broken cache file -> recompile
+            except Exception:
+                cache = None
+
+        if cache:
+            return CompiledTiledMap(tmx_file, cache["map"])
+
+        # compile and write a new cache file (pytmx' default image loader doesn't load any images)
+        pytmx_tiled_map = pytmx.TiledMap(tmx_file)
+        map_data = CompiledTiledMap.compile(pytmx_tiled_map)
+        if map_data is None:
+            return pytmx_tiled_map
+        try:
+            CompiledTiledMap.write_cache_file(cache_file, {"version": CompiledTiledMap.CACHE_VERSION,
+                                                           "dependencies": CompiledTiledMap.get_dependencies(tmx_file), "map": map_data})
+        # not writable (or some property values can't be stored as JSON) -> just don't cache
+        except Exception:
+            if os.path.isfile(cache_file):
+                os.remove(cache_file)
+        return CompiledTiledMap(tmx_file, map_data)
+
+    @staticmethod
+    def write_cache_file(cache_file, cache):
+        """
+        Writes a cache (version, dependencies and compiled map data) into a cache file: the gid grids of all tile layers are stored as arrays, all
+        other data as one JSON string (int dict-keys, e.g. gids, are stored as lists of key/value pairs).
+
+        :param str cache_file: the name of the cache file to write
+        :param dict cache: the cache to write (see `load`)
+        """
+        map_data = dict(cache["map"])
+        arrays = {}
+        layers = []
+        for i, layer_data in enumerate(map_data["layers"]):
+            layer_data = dict(layer_data)
+            if layer_data["type"] == "tiles":
+                arrays["gids_{}".format(i)] = layer_data.pop("gids")
+            layers.append(layer_data)
+        map_data["layers"] = layers
+        map_data["image_specs"] = list(map_data["image_specs"].items())
+        map_data["tile_properties"] = list(map_data["tile_properties"].items())
+        meta = json.dumps({"version": cache["version"], "dependencies": cache["dependencies"], "map": map_data})
+        # write into an open file (np.savez would otherwise append .npz to the file name)
+        with open(cache_file, "wb") as f:
+            np.savez(f, meta=np.array(meta), **arrays)
+
+    @staticmethod
+    def read_cache_file(cache_file):
+        """
+        Reads a cache file written by `write_cache_file` (without allowing pickled objects).
+
+        :param str cache_file: the name of the cache file to read
+        :return: the cache (version, dependencies and compiled map data)
+        :rtype: dict
+        """
+        with np.load(cache_file, allow_pickle=False) as npz:
+            cache = json.loads(str(npz["meta"]))
+            map_data = cache["map"]
+            for i, layer_data in enumerate(map_data["layers"]):
+                if layer_data["type"] == "tiles":
+                    layer_data["gids"] = npz["gids_{}".format(i)]
+        map_data["image_specs"] = {gid: (path, colorkey, tuple(rect) if rect else None, tuple(flags) if flags else None)
+                                   for gid, (path, colorkey, rect, flags) in map_data["image_specs"]}
+        map_data["tile_properties"] = {gid: props for gid, props in map_data["tile_properties"]}
+        return cache
+
+    @staticmethod
+    def compile(pytmx_tiled_map):
+        """
+        Compiles a loaded pytmx.pytmx.TiledMap into a dict of plain data (that can be written to a cache file).
+
+        :param pytmx.pytmx.TiledMap pytmx_tiled_map: the pytmx TiledMap to compile
+        :return: the compiled map data (None if the map has layers that can't be compiled (e.g. image layers))
+        :rtype: Union[dict,None]
+        """
+        m = pytmx_tiled_map
+        if not all(isinstance(l, (pytmx.pytmx.TiledTileLayer, pytmx.pytmx.TiledObjectGroup)) for l in m.layers):
+            return None
+
+        # the image specs (image file, colorkey, rect, flip flags) by gid (same procedure as in pytmx.pytmx.TiledMap.reload_images)
+        image_specs = {}
+        for ts in m.tilesets:
+            if ts.source is None:
+                continue
+            path = os.path.relpath(os.path.join(os.path.dirname(m.filename), ts.source), os.path.dirname(m.filename))
+            colorkey = getattr(ts, "trans", None)
+            positions = ((x, y) for y in range(ts.margin, ts.height + ts.margin - ts.tileheight + 1, ts.tileheight + ts.spacing)
+                         for x in range(ts.margin, ts.width + ts.margin - ts.tilewidth + 1, ts.tilewidth + ts.spacing))
+            for real_gid, (x, y) in enumerate(positions, ts.firstgid):
+                for gid, flags in m.map_gid(real_gid) or []:
+                    image_specs[gid] = (path, colorkey, (x, y, ts.tilewidth, ts.tileheight), tuple(flags))
+        # tiles with their own images
+        for real_gid, props in m.tile_properties.items():
+            if props.get("source"):
+                image_specs[real_gid] = (props["source"], props.get("trans"), None, None)
+
+        tile_properties = {gid: dict(props) for gid, props in m.tile_properties.items()}
+
+        layers = []
+        for layer in m.layers:
+            if isinstance(layer, pytmx.pytmx.TiledTileLayer):
+                gids = np.array(layer.data, dtype=np.uint32).reshape((layer.height, layer.width))
+                layers.append({"type": "tiles", "name": layer.name, "properties": dict(layer.properties), "gids": gids})
+            else:
+                objects = [{"name": obj.name, "type": obj.type, "x": obj.x, "y": obj.y, "width": obj.width, "height": obj.height, "visible": obj.visible,
+                            "properties": dict(obj.properties)} for obj in layer]
+                layers.append({"type": "objects", "name": layer.name, "properties": dict(layer.properties), "objects": objects})
+
+        return {"width": m.width, "height": m.height, "tilewidth": m.tilewidth, "tileheight": m.tileheight, "properties": dict(m.properties),
+                "num_gids": len(m.images), "image_specs": image_specs, "tile_properties": tile_properties, "layers": layers}
+
+    def load_images(self, image_loader):
+        """
+        Loads all tile images (by gid) given by our image specs into self.images (each image file is only loaded once).
+
+        :param callable image_loader: the pytmx image loader to use (e.g. pytmx.util_pygame.pygame_image_loader)
+        """
+        images = [None] * max(self.num_gids, max(self.image_specs) + 1 if self.image_specs else 1)
+        loaders = {}
+        for gid, (path, colorkey, rect, flags) in self.image_specs.items():
+            loader = loaders.get((path, colorkey))
+            if loader is None:
+                loader = loaders[(path, colorkey)] = image_loader(os.path.join(os.path.dirname(self.filename), path), colorkey)
+            images[gid] = loader(rect, pytmx.pytmx.TileFlags(*flags)) if rect else loader()
+        self.images = images
+
+
+class CompiledTiledTileLayer(object):
+    """
+    A tile layer of a CompiledTiledMap (offers the same interface as pytmx.pytmx.TiledTileLayer as far as spygame uses it).
+    """
+
+    def __init__(self, parent, layer_data):
         """
-        Stops playing the Stage (stops calling `tick` on all GameObjects).
+        :param CompiledTiledMap parent: the CompiledTiledMap this layer belongs to
+        :param dict layer_data: the compiled layer data (see CompiledTiledMap.compile)
         """
-        self.hide()
-        self.pause()
+        self.parent = parent
+        self.name = layer_data["name"]
+        self.properties = dict(layer_data["properties"])
+        self.gids = layer_data["gids"]  # the gid grid (indexed by [y, x])
+        self.height, self.width = self.gids.shape
+        self.data = self.gids.tolist()  # the gid grid as lists of rows (python ints are faster to look up than numpy scalars)
 
-    def start(self):
+    def iter_data(self):
         """
-        Starts running the Stage (and calling all GameObject's `tick` method).
+        Iterates over all tiles (also empty ones) and yields (x, y, gid)-tuples.
         """
-        self.show()
-        self.unpause()
+        for y, row in enumerate(self.data):
+            for x, gid in enumerate(row):
+                yield x, y, gid
 
-    def render(self, display):
+    def tiles(self):
         """
-        Gets called each frame by the GameLoop (after 'tick' is called on all Stages).
-        Renders all its layers (ordered by 'render_order' property of the TiledTileLayer in the tmx file).
-        TODO: renders Sprites that are not part of any layer.
+        Iterates over all non-empty tiles and yields (x, y, image)-tuples.
+        """
+        images = self.parent.images
+        for x, y, gid in self.iter_data():
+            if gid:
+                yield x, y, images[gid]
 
-        :param Display display: the Display object to render on
+
+class CompiledTiledObjectGroup(object):
+    """
+    An object layer of a CompiledTiledMap (offers the same interface as pytmx.pytmx.TiledObjectGroup as far as spygame uses it).
+    Iterating over it yields fresh CompiledTiledObjects (with their own properties dicts) each time.
+    """
+
+    def __init__(self, parent, layer_data):
         """
-        if self.is_hidden:
-            return False
+        :param CompiledTiledMap parent: the CompiledTiledMap this layer belongs to
+        :param dict layer_data: the compiled layer data (see CompiledTiledMap.compile)
+        """
+        self.parent = parent
+        self.name = layer_data["name"]
+        self.properties = dict(layer_data["properties"])
+        self.objects = layer_data["objects"]  # the object spawn list
 
-        self.trigger_event("pre_render", display)
-        # loop through the sorted to_render list and render all TiledTileLayer and Sprite objects in this list
-        for layer_or_sprite in self.to_render:
-            if getattr(layer_or_sprite, "ignore_after_n_ticks", 1) <= 0:
-                continue
-            layer_or_sprite.render(display)
-        self.trigger_event("post_render", display)
+    def __iter__(self):
+        for obj in self.objects:
+            yield CompiledTiledObject(obj)
+
+
+class CompiledTiledObject(object):
+    """
+    A single object of a CompiledTiledObjectGroup (offers the same interface as pytmx.pytmx.TiledObject as far as spygame uses it).
+    """
+
+    def __init__(self, obj):
+        """
+        :param dict obj: the compiled object data (see CompiledTiledMap.compile)
+        """
+        self.name = obj["name"]
+        self.type = obj["type"]
+        self.x = obj["x"]
+        self.y = obj["y"]
+        self.width = obj["width"]
+        self.height = obj["height"]
+        self.visible = obj["visible"]
+        self.properties = dict(obj["properties"])
 
 
 class TmxLayer(object, metaclass=ABCMeta):
@@ -1707,11 +3264,17 @@ class TiledTileLayer(TmxLayer):
     Implements `render`.
     """
 
-    def __init__(self, pytmx_layer, pytmx_tiled_map, tile_sprite_handler):
+    # the classes of tiles stored in a TiledTileLayer's tile_classes grid
+    TILE_CLASS_EMPTY = 0  # no tile
+    TILE_CLASS_FULL = 1  # a full collision tile (slope=0.0 and offset=1.0)
+    TILE_CLASS_PARTIAL = 2  # any other tile (sloped or special tiles that need the TileSprite's own collision logic)
+
+    def __init__(self, pytmx_layer, pytmx_tiled_map, tile_sprite_handler, chunk_size=16):
         """
         :param pytmx.pytmx.TiledTileLayer pytmx_layer: the underlying pytmx TiledTileLayer
         :param pytmx.pytmx.TiledMap pytmx_tiled_map: the underlying pytmx TiledMap object (representing the tmx file)
         :param callable tile_sprite_handler: the callable that returns an ndarray, populated with TileSprite objects for storage in this layer
+        :param int chunk_size: the width and height (in tiles) of the chunk surfaces that this layer is rendered from
         """
         super().__init__(pytmx_layer, pytmx_tiled_map)
 
@@ -1724,60 +3287,122 @@ class TiledTileLayer(TmxLayer):
         # an ndarray holding all single tiles (by x/y position) from this layer
         # non-existing tiles are not(!) stored in this ndarray and return None at the respective x/y position
         self.tile_sprites = tile_sprite_handler(self)
+        # compact (x/y) grids of the same shape as tile_sprites for answering the common collision cases by array slicing:
+        # - tile_classes: one of the TILE_CLASS_... values for each tile
+        # - occupancy: True wherever there is a tile
+        # - max_heights: the max height (see SlopedTileSprite.max_y; 0 for empty or non-sloped tiles) of each tile
+        self.tile_classes, self.occupancy, self.max_heights = self.build_occupancy_grids()
 
         # update do_render indicator depending on some debug settings
         self.do_render = (self.properties["do_render"] == "true" and not (DEBUG_FLAGS & DEBUG_DONT_RENDER_TILED_TILE_LAYERS)) or \
                          (self.type != Sprite.get_type("none") and (DEBUG_FLAGS & DEBUG_RENDER_COLLISION_TILES))
         self.render_order = int(self.properties["render_order"])
 
-        # put this layer in one single Sprite that we can then blit on the display (with 'area=[some rect]' to avoid drawing the entire layer each time)
-        self.pygame_sprite = None
-        # we are rendering this layer, need to store entire image in this structure
+        # the rendered image of this layer is split into chunk surfaces of chunk_size x chunk_size tiles each
+        # - chunks are only built (see build_chunk_surface) once they intersect the viewport for the first time
+        self.chunk_size = chunk_size
+        self.chunk_width = self.chunk_size * self.pytmx_tiled_map.tilewidth
+        self.chunk_height = self.chunk_size * self.pytmx_tiled_map.tileheight
+        self.num_chunks_x = math.ceil(self.pytmx_layer.width / self.chunk_size)
+        self.num_chunks_y = math.ceil(self.pytmx_layer.height / self.chunk_size)
+        # the already built chunk surfaces (key=(chunk-x, chunk-y))
+        self.chunks = {}
+        # tile images may be larger than one tile and then reach into the chunk to the right/bottom:
+        # the number of tiles we have to look back (left/up) when building a chunk
+        self.chunk_overlap_x = 0
+        self.chunk_overlap_y = 0
         if self.do_render:
-            self.pygame_sprite = self.build_sprite_surface()
+            for x, y, image in self.pytmx_layer.tiles():
+                self.chunk_overlap_x = max(self.chunk_overlap_x, math.ceil(image.get_width() / self.pytmx_tiled_map.tilewidth) - 1)
+                self.chunk_overlap_y = max(self.chunk_overlap_y, math.ceil(image.get_height() / self.pytmx_tiled_map.tileheight) - 1)
+
+    def build_occupancy_grids(self):
+        """
+        Builds the tile-class grid, the occupancy grid and the max-height grid from our tile_sprites ndarray.
+
+        :return: tuple of the tile-class grid (uint8), the occupancy grid (bool) and the max-height grid (float64), all indexed by [x, y]
+        :rtype: Tuple[np.ndarray,np.ndarray,np.ndarray]
+        """
+        tile_classes = np.zeros(shape=self.tile_sprites.shape, dtype=np.uint8)
+        max_heights = np.zeros(shape=self.tile_sprites.shape, dtype=np.float64)
+        for (x, y), tile_sprite in np.ndenumerate(self.tile_sprites):
+            if tile_sprite:
+                tile_classes[x, y] = TiledTileLayer.TILE_CLASS_FULL if getattr(tile_sprite, "is_full", False) else TiledTileLayer.TILE_CLASS_PARTIAL
+                max_heights[x, y] = getattr(tile_sprite, "max_y", 0)
+        return tile_classes, tile_classes != TiledTileLayer.TILE_CLASS_EMPTY, max_heights
 
-    def build_sprite_surface(self):
+    def build_chunk_surface(self, chunk_x, chunk_y):
         """
-        Builds the image (pygame.Surface) for this tile layer based on all found tiles in the layer.
+        Builds the image (pygame.Surface) for one chunk of this tile layer based on all tiles found in (or reaching into) the chunk.
+        The tile images need no conversion here: they were already converted to the display's pixel format when loading the tmx file (see load_tmx).
+
+        :param int chunk_x: the x-position of the chunk (in chunks)
+        :param int chunk_y: the y-position of the chunk (in chunks)
+        :return: the chunk's Surface (chunks at the right/bottom edge of the layer may be smaller than chunk_width/chunk_height)
+        :rtype: pygame.Surface
         """
-        surf = pygame.Surface((self.pytmx_layer.width * self.pytmx_tiled_map.tilewidth, self.pytmx_layer.height * self.pytmx_tiled_map.tileheight),
-                              flags=pygame.SRCALPHA)
+        tile_w = self.pytmx_tiled_map.tilewidth
+        tile_h = self.pytmx_tiled_map.tileheight
+        x_start = chunk_x * self.chunk_size
+        y_start = chunk_y * self.chunk_size
+        x_end = min(x_start + self.chunk_size, self.pytmx_layer.width)
+        y_end = min(y_start + self.chunk_size, self.pytmx_layer.height)
+        surf = pygame.Surface(((x_end - x_start) * tile_w, (y_end - y_start) * tile_h), flags=pygame.SRCALPHA)
+
         # rendered collision layer
-        if self.type != Sprite.get_type("none") and (DEBUG_FLAGS & DEBUG_RENDER_COLLISION_TILES):
-            # red for normal collisions, light-blue for touch collisions
-            color = DEBUG_RENDER_COLLISION_TILES_COLOR_DEFAULT if self.type & Sprite.get_type("default") else DEBUG_RENDER_COLLISION_TILES_COLOR_OTHER
-            for (x, y, image), (_, _, gid) in zip(self.pytmx_layer.tiles(), self.pytmx_layer.iter_data()):
-                surf.blit(image.convert_alpha(), (x * self.pytmx_tiled_map.tilewidth, y * self.pytmx_tiled_map.tileheight))
-                tile_props = self.pytmx_tiled_map.get_tile_properties_by_gid(gid) or {}
-                # normal collision tiles
-                if not tile_props.get("no_collision"):
-                    pygame.draw.rect(surf, color, pygame.Rect((x * self.pytmx_tiled_map.tilewidth, y * self.pytmx_tiled_map.tileheight),
-                                                              (self.pytmx_tiled_map.tilewidth, self.pytmx_tiled_map.tileheight)), 1)
-        # "normal" layer (and no debug rendering)
-        else:
-            for x, y, image in self.pytmx_layer.tiles():
-                surf.blit(image.convert_alpha(), (x * self.pytmx_tiled_map.tilewidth, y * self.pytmx_tiled_map.tileheight))
+        debug_render = self.type != Sprite.get_type("none") and (DEBUG_FLAGS & DEBUG_RENDER_COLLISION_TILES)
+        # red for normal collisions, light-blue for touch collisions
+        color = DEBUG_RENDER_COLLISION_TILES_COLOR_DEFAULT if self.type & Sprite.get_type("default") else DEBUG_RENDER_COLLISION_TILES_COLOR_OTHER
+        images = self.pytmx_tiled_map.images
+        # same order as pytmx_layer.tiles() (row by row) so that overlapping tile images are blitted exactly as for the entire layer
+        for y in range(max(y_start - self.chunk_overlap_y, 0), y_end):
+            row = self.pytmx_layer.data[y]
+            for x in range(max(x_start - self.chunk_overlap_x, 0), x_end):
+                gid = row[x]
+                if not gid or not images[gid]:
+                    continue
+                pos = ((x - x_start) * tile_w, (y - y_start) * tile_h)
+                surf.blit(images[gid], pos)
+                if debug_render and x >= x_start and y >= y_start:
+                    tile_props = self.pytmx_tiled_map.get_tile_properties_by_gid(gid) or {}
+                    # normal collision tiles
+                    if not tile_props.get("no_collision"):
+                        pygame.draw.rect(surf, color, pygame.Rect(pos, (tile_w, tile_h)), 1)
 
-        pygame_sprite = pygame.sprite.Sprite()
-        pygame_sprite.image = surf
-        pygame_sprite.rect = surf.get_rect()
-        return pygame_sprite
+        # fully opaque chunks (e.g. backgrounds) don't need per-pixel alpha
+        return convert_surface(surf)
+
+    def get_chunk_surface(self, chunk_x, chunk_y):
+        """
+        Returns the Surface of the given chunk (builds the chunk first if it hasn't been built yet).
+
+        :param int chunk_x: the x-position of the chunk (in chunks)
+        :param int chunk_y: the y-position of the chunk (in chunks)
+        :return: the chunk's Surface
+        :rtype: pygame.Surface
+        """
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is None:
+            chunk = self.chunks[(chunk_x, chunk_y)] = self.build_chunk_surface(chunk_x, chunk_y)
+        return chunk
 
     def render(self, display):
         """
-        Blits a part of our Sprite's image onto the Display's Surface using the Display's offset attributes.
+        Blits all chunks of this layer that intersect the Display's viewport (given by the Display's offset attributes) onto the Display's Surface.
 
         :param Display display: the Display object to render on
         """
         assert self.do_render, "ERROR: TiledTileLayer.render() called but self.do_render is False!"
-        assert not isinstance(self.pygame_sprite, Sprite), "ERROR: TiledTileLayer.render() called but self.pygame_sprite is not a Sprite!"
-        r = pygame.Rect(self.pygame_sprite.rect)  # make a clone so we don't change the original Rect
-        # apply the display offsets (camera)
-        r.x += display.offsets[0]
-        r.y += display.offsets[1]
-        r.width = display.width
-        r.height = display.height
-        display.surface.blit(self.pygame_sprite.image, dest=(0, 0), area=r)
+        # the viewport (camera) in layer coordinates (pygame.Rect truncates float offsets the same way)
+        offset_x, offset_y = int(display.offsets[0]), int(display.offsets[1])
+        chunk_x_start = max(offset_x // self.chunk_width, 0)
+        chunk_x_end = min((offset_x + display.width - 1) // self.chunk_width, self.num_chunks_x - 1)
+        chunk_y_start = max(offset_y // self.chunk_height, 0)
+        chunk_y_end = min((offset_y + display.height - 1) // self.chunk_height, self.num_chunks_y - 1)
+        for chunk_y in range(chunk_y_start, chunk_y_end + 1):
+            for chunk_x in range(chunk_x_start, chunk_x_end + 1):
+                display.surface.blit(self.get_chunk_surface(chunk_x, chunk_y),
+                                     dest=(chunk_x * self.chunk_width - offset_x, chunk_y * self.chunk_height - offset_y))
 
     def capture_autobuilds(self):
         """
@@ -1788,44 +3413,36 @@ class TiledTileLayer(TmxLayer):
         :return: list of generated autobuild objects
         :rtype: List[object]
         """
+        # the (translated) autobuild_class of each tile as an index into `classes` (0=no autobuild tile), indexed by [x, y] like our tile_sprites
+        # - only the existing tiles need to be looked at
+        classes = [None]
+        grid = np.zeros(shape=self.tile_sprites.shape, dtype=np.int32)
+        for x, y in np.argwhere(self.occupancy).tolist():
+            ctor = self.tile_sprites[(x, y)].tile_props.get("autobuild_class", False)
+            if ctor:
+                assert isinstance(ctor, type), "ERROR: translation of tile ({},{}) property `autobuild_class` did not yield a defined class!".format(x, y)
+                if ctor not in classes:
+                    classes.append(ctor)
+                grid[x, y] = classes.index(ctor)
+
         objects = []
-        # loop through each tile and look for ladder type property
-        for y in range(self.pytmx_layer.height):
-            for x in range(self.pytmx_layer.width):
-                tile_sprite = self.tile_sprites[(x, y)]  # type: TileSprite
-                if not tile_sprite:
-                    continue
-                props = tile_sprite.tile_props
-                # we hit the upper left corner of an autobuild object -> spread out to find more neighboring similar tiles
-                ctor = props.get("autobuild_class", False)
-                if ctor:
-                    assert isinstance(ctor, type), "ERROR: translation of tile ({},{}) property `autobuild_class` did not yield a defined class!".format(x, y)
-                    tile_left = self.tile_sprites[(x-1, y)]  # type: TileSprite
-                    tile_top = self.tile_sprites[(x, y-1)]  # type: TileSprite
-                    if tile_left and tile_left.tile_props.get("autobuild_class") == ctor or \
-                            tile_top and tile_top.tile_props.get("autobuild_class") == ctor:
-                        continue
-                    # measure width and height
-                    w = 1
-                    h = 1
-                    x2 = x+1
-                    while True and x2 < self.pytmx_layer.width:
-                        ts = self.tile_sprites[(x2, y)]
-                        if not (ts and ts.tile_props.get("autobuild_class") == ctor):
-                            break
-                        w += 1
-                        x2 += 1
-
-                    y2 = y+1
-                    while True and y2 < self.pytmx_layer.height:
-                        ts = self.tile_sprites[(x, y2)]
-                        if not (ts and ts.tile_props.get("autobuild_class") == ctor):
-                            break
-                        h += 1
-                        y2 += 1
-
-                    # insert new object (all autobuild objects need to accept x, y, w, h in their constructors)
-                    objects.append(ctor(x, y, w, h, self.pytmx_tiled_map.tilewidth, self.pytmx_tiled_map.tileheight, **props.get("autobuild_kwargs", {})))
+        width, height = grid.shape
+        # loop through all autobuild tiles (row by row)
+        for y, x in np.argwhere(grid.T).tolist():
+            class_ = grid[x, y]
+            # not the upper left corner of an autobuild object (note: x-1 and y-1 wrap around to the last column/row at x=0 and y=0)
+            if grid[x - 1, y] == class_ or grid[x, y - 1] == class_:
+                continue
+            # we hit the upper left corner of an autobuild object -> spread out to find more neighboring similar tiles and measure width and height
+            w = 1
+            while x + w < width and grid[x + w, y] == class_:
+                w += 1
+            h = 1
+            while y + h < height and grid[x, y + h] == class_:
+                h += 1
+            # insert new object (all autobuild objects need to accept x, y, w, h in their constructors)
+            props = self.tile_sprites[(x, y)].tile_props
+            objects.append(classes[class_](x, y, w, h, self.pytmx_tiled_map.tilewidth, self.pytmx_tiled_map.tileheight, **props.get("autobuild_kwargs", {})))
         return objects
 
     def get_overlapping_tiles(self, sprite):
@@ -1842,6 +3459,29 @@ class TiledTileLayer(TmxLayer):
         tile_end_y = max(0, min(self.pytmx_tiled_map.height - 1, (sprite.rect.bottom - 1) // self.pytmx_tiled_map.tileheight))
         return tile_start_x, tile_end_x, tile_start_y, tile_end_y
 
+    def get_tile_sprites_in_rect(self, rect, full_only=False):
+        """
+        Returns all TileSprites of this layer that overlap with the given rect (uses our occupancy/tile-class grids).
+
+        :param pygame.Rect rect: the rect (in absolute pixels) to look for tiles
+        :param bool full_only: whether to only return full collision tiles (TILE_CLASS_FULL)
+        :return: list of TileSprite objects
+        :rtype: List[TileSprite]
+        """
+        tw = self.pytmx_tiled_map.tilewidth
+        th = self.pytmx_tiled_map.tileheight
+        tile_start_x = max(0, rect.left // tw)
+        tile_end_x = min(self.pytmx_tiled_map.width - 1, (rect.right - 1) // tw)
+        tile_start_y = max(0, rect.top // th)
+        tile_end_y = min(self.pytmx_tiled_map.height - 1, (rect.bottom - 1) // th)
+        if tile_start_x > tile_end_x or tile_start_y > tile_end_y:
+            return []
+        if full_only:
+            area = self.tile_classes[tile_start_x:tile_end_x + 1, tile_start_y:tile_end_y + 1] == TiledTileLayer.TILE_CLASS_FULL
+        else:
+            area = self.occupancy[tile_start_x:tile_end_x + 1, tile_start_y:tile_end_y + 1]
+        return [self.tile_sprites[tile_start_x + x, tile_start_y + y] for x, y in np.argwhere(area)]
+
     def collide_simple_with_sprite(self, sprite, collision_detector):
         """
         Collides a Sprite (that only obeys simple physics rules) with a TiledTileLayer and solves all detected collisions.
@@ -1853,19 +3493,21 @@ class TiledTileLayer(TmxLayer):
         """
         tile_start_x, tile_end_x, tile_start_y, tile_end_y = self.get_overlapping_tiles(sprite)
 
+        # only look at those tiles that actually exist (most of the time: none at all)
+        occupied = np.argwhere(self.occupancy[tile_start_x:tile_end_x + 1, tile_start_y:tile_end_y + 1])
+        if len(occupied) == 0:
+            return None
+
         xy, v = Stage.estimate_sprite_direction(sprite)
 
         # very simple algo: look through tile list (in no particular order) and return first tile that collides
         # None if no colliding tile found
-        for tile_x in range(tile_start_x, tile_end_x + 1):
-            for tile_y in range(tile_start_y, tile_end_y + 1):
-                tile_sprite = self.tile_sprites[tile_x, tile_y]
-                if not tile_sprite:
-                    continue
-                col = collision_detector(sprite, tile_sprite, collision_objects=None,
-                                         direction=xy, direction_veloc=v, original_pos=(sprite.rect.x, sprite.rect.y))
-                if col:
-                    return col
+        for tile_x, tile_y in occupied:
+            tile_sprite = self.tile_sprites[tile_start_x + tile_x, tile_start_y + tile_y]
+            col = collision_detector(sprite, tile_sprite, collision_objects=None,
+                                     direction=xy, direction_veloc=v, original_pos=(sprite.rect.x, sprite.rect.y))
+            if col:
+                return col
         return None
 
 
@@ -1900,6 +3542,32 @@ class SlopedTileSprite(TileSprite):
     with the TileSprite
     - used by the PlatformerPhysics Component when detecting and handling slope collisions
     """
+    # the compiled height profiles (one tuple of y-values for each x-pixel) shared by all tiles with the same shape
+    # - key=(slope, offset, tile-width, tile-height)
+    height_profiles = {}
+
+    @staticmethod
+    def get_height_profile(slope, offset, width, height):
+        """
+        Returns the (shared) per-pixel height profile for the given slope shape (compiles it the first time the shape is asked for).
+
+        :param Union[float,None] slope: the slope (m in y=mx+b) of the tile
+        :param Union[float,None] offset: the offset (b in y=mx+b) of the tile (as a fraction of the tile's height)
+        :param int width: the width of the tile in px
+        :param int height: the height of the tile in px
+        :return: a tuple of width+1 y-values (for x=0 to x=width)
+        :rtype: Tuple[float]
+        """
+        key = (slope, offset, width, height)
+        profile = SlopedTileSprite.height_profiles.get(key)
+        if profile is None:
+            if slope is None or offset is None:
+                profile = (0,) * (width + 1)
+            else:
+                profile = tuple(slope * x + offset * height for x in range(width + 1))
+            SlopedTileSprite.height_profiles[key] = profile
+        return profile
+
     def __init__(self, layer, pytmx_tiled_map, id_, tile_props, rect):
         """
         :param TiledTileLayer layer: the TiledTileLayer object to which this tile belongs
@@ -1915,6 +3583,8 @@ class SlopedTileSprite(TileSprite):
         self.offset = tile_props.get("offset", None)  # the offset property of the tile in the tmx file (in px (b in y=mx+b))
         self.is_full = (self.slope == 0.0 and self.offset == 1.0)  # is this a full collision tile?
         self.max_x = self.pytmx_tiled_map.tilewidth
+        # the y-values for each x-pixel (x=0 to x=max_x) of this tile
+        self.height_profile = SlopedTileSprite.get_height_profile(self.slope, self.offset, self.max_x, self.rect.height)
         self.max_y = max(self.get_y(0), self.get_y(self.rect.width))  # store our highest y-value (height of this tile)
 
     def get_y(self, x):
@@ -1925,10 +3595,15 @@ class SlopedTileSprite(TileSprite):
         :return: the calculated y-value
         :rtype: int
         """
+        # look up the compiled y = mx + b
+        if x >= self.max_x:
+            return self.height_profile[-1]
+        elif x >= 0 and type(x) is int:
+            return self.height_profile[x]
         # y = mx + b
         if self.slope is None or self.offset is None:
             return 0
-        return self.slope * min(x, self.max_x) + self.offset * self.rect.height
+        return self.slope * x + self.offset * self.rect.height
 
     def sloped_xy_pull(self, sprite):
         """
@@ -2006,6 +3681,7 @@ class Collision(object):
         self.direction = None  # None, 'x' or 'y' (direction in which we measure the collision; the other direction is ignored)
         self.direction_veloc = 0  # velocity direction component (e.g. direction=='x' veloc==5 -> moving right, veloc==-10.4 -> moving left)
         self.original_pos = [0, 0]  # the original x/y-position of sprite1 before the move that lead to the collision happened
+        self.time_of_impact = 1.0  # for swept collisions: the fraction (0.0-1.0) of sprite1's motion vector after which the two Sprites touch
 
     def invert(self):
         """
@@ -2881,26 +4557,32 @@ class PhysicsComponent(Component, metaclass=ABCMeta):
         """
         # set up ndarray
         ret = np.ndarray(shape=(layer.pytmx_tiled_map.width, layer.pytmx_tiled_map.height), dtype=tile_sprite_class)
+        # the translated tile properties by gid (all tiles with the same gid share the same properties dict)
+        tile_props_by_gid = {}
         # loop through each tile and generate TileSprites
         for x, y, gid in layer.pytmx_layer.iter_data():
             # skip empty tiles (gid==0)
             if gid == 0:
                 continue
-            tile_props = layer.pytmx_tiled_map.get_tile_properties_by_gid(gid) or {}
-            # go through dict and translate data types into proper python types ("true" -> bool, 0.0 -> float, etc..)
-            # also keep autobuild kwargs in a separate dict
-            look_for_autobuild = (True if tile_props.get("autobuild_class") else False)
-            autobuild_kwargs = {}
-            for key, value in tile_props.items():
-                value = convert_type(value)
-                # a special autobuild kwarg (for the autobuild c'tor)
-                if look_for_autobuild and key[:2] == "P_":
-                    autobuild_kwargs[key[2:]] = value
-                else:
-                    tile_props[key] = value
+            tile_props = tile_props_by_gid.get(gid)
+            if tile_props is None:
+                tile_props = tile_props_by_gid[gid] = {}
+                # go through dict and translate data types into proper python types ("true" -> bool, 0.0 -> float, etc..)
+                # - translate into a new dict (leave the map's properties untouched, so a Level can be staged more than once)
+                # also keep autobuild kwargs in a separate dict
+                raw_props = layer.pytmx_tiled_map.get_tile_properties_by_gid(gid) or {}
+                look_for_autobuild = (True if raw_props.get("autobuild_class") else False)
+                autobuild_kwargs = {}
+                for key, value in raw_props.items():
+                    value = convert_type(value)
+                    # a special autobuild kwarg (for the autobuild c'tor)
+                    if look_for_autobuild and key[:2] == "P_":
+                        autobuild_kwargs[key[2:]] = value
+                    else:
+                        tile_props[key] = value
 
-            if look_for_autobuild:
-                tile_props["autobuild_kwargs"] = autobuild_kwargs
+                if look_for_autobuild:
+                    tile_props["autobuild_kwargs"] = autobuild_kwargs
 
             ret[x, y] = tile_sprite_class(layer, layer.pytmx_tiled_map, gid, tile_props,
                                           pygame.Rect(x * layer.pytmx_tiled_map.tilewidth, y * layer.pytmx_tiled_map.tileheight,
@@ -2942,6 +4624,11 @@ class ControlledPhysicsComponent(PhysicsComponent, metaclass=ABCMeta):
     def __init__(self, name="physics"):
         super().__init__(name)
         self.game_obj_cmp_brain = None  # the GameObject's HumanPlayerBrain component (used by Physics for steering and action control within `tick` method)
+        # if True: do only one physics step per tick (instead of steps of max. 1/30s) and clip each move at the first collision tile along the way
+        # (swept AABB) to avoid tunneling through thin tiles
+        # - PlatformerPhysics: x-moves are only clipped at full tiles; sloped tiles (as their full tile rects) and one-way platforms only clip
+        #   downward moves
+        self.continuous_collision = False
 
     def added(self):
         super().added()
@@ -3049,11 +4736,12 @@ class TopDownPhysics(ControlledPhysicsComponent):
             self.vx = 0
             self.vy = 0
 
+        # in continuous-collision mode, do only one step (moves are clipped by swept collision tests), otherwise steps of max. 1/30s
         # TODO: check the entity's magnitude of vx and vy,
         # reduce the max dt_step if necessary to prevent skipping through objects.
         dt_step = dt
         while dt_step > 0:
-            dt = min(1 / 30, dt_step)
+            dt = dt_step if self.continuous_collision else min(1 / 30, dt_step)
 
             # update x/y-velocity based on acceleration
             self.vx += ax * dt
@@ -3069,7 +4757,10 @@ class TopDownPhysics(ControlledPhysicsComponent):
             # first move in x-direction and solve x-collisions
             orig_pos = (obj.rect.x, obj.rect.y)
             if self.vx != 0.0:
-                obj.move(self.vx * dt, 0.0)
+                sx = self.vx * dt
+                if self.continuous_collision:
+                    sx, _ = stage.get_swept_motion(obj, sx, 0.0, Sprite.get_type("default"), False, obj.collision_mask & Sprite.get_type("default"))
+                obj.move(sx, 0.0)
                 if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_BEFORE_COLLISION_DETECTION:
                     obj.render(game_loop.display)
                     game_loop.display.debug_refresh()
@@ -3077,7 +4768,10 @@ class TopDownPhysics(ControlledPhysicsComponent):
 
             # then move in y-direction and solve y-collisions
             if self.vy != 0.0:
-                obj.move(0.0, self.vy * dt)
+                sy = self.vy * dt
+                if self.continuous_collision:
+                    _, sy = stage.get_swept_motion(obj, 0.0, sy, Sprite.get_type("default"), False, obj.collision_mask & Sprite.get_type("default"))
+                obj.move(0.0, sy)
                 if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_BEFORE_COLLISION_DETECTION:
                     obj.render(game_loop.display)
                     game_loop.display.debug_refresh()
@@ -3102,7 +4796,9 @@ class TopDownPhysics(ControlledPhysicsComponent):
                 if layer.type & Sprite.get_type("default"):
                     self.collide_with_collision_layer(sprite, layer, direction, direction_veloc, original_pos)
         # simple sprites (e.g. enemies)
-        for other_sprite in stage.sprites:
+        # - only those that are close to the rect we swept through during the move (from original_pos to our current position)
+        swept_rect = sprite.rect.union(pygame.Rect(original_pos, sprite.rect.size))
+        for other_sprite in stage.get_sprites_near(swept_rect, sprite.collision_mask):
             if sprite is other_sprite:
                 continue
             if sprite.collision_mask & other_sprite.type:
@@ -3122,29 +4818,31 @@ class TopDownPhysics(ControlledPhysicsComponent):
         """
         # determine the tile boundaries (which tiles does the sprite overlap with?)
         tile_start_x, tile_end_x, tile_start_y, tile_end_y = layer.get_overlapping_tiles(sprite)
+        # the existing tiles in that area (indexed by [x - tile_start_x, y - tile_start_y]) -> early out if there are none
+        occupied = layer.occupancy[tile_start_x:tile_end_x + 1, tile_start_y:tile_end_y + 1]
+        if not occupied.any():
+            return
 
         # if sprite is moving in +/-x-direction:
-        # 1) move in columns from left to right (right to left) to look for tiles
+        # 1) move in columns from left to right (right to left) to look for tiles (skip empty columns)
         if direction == 'x':
-            direction_x = int(math.copysign(1.0, direction_veloc))
-            for tile_x in range(tile_start_x if direction_x > 0 else tile_end_x, (tile_end_x if direction_x > 0 else tile_start_x) + direction_x, direction_x):
-                for tile_y in range(tile_start_y, tile_end_y + 1):  # y-order doesn't matter
-                    tile_sprite = layer.tile_sprites[tile_x, tile_y]
-                    if tile_sprite:
-                        col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
-                        if col:
-                            sprite.trigger_event("collision", col)
-                            return
+            columns = np.flatnonzero(occupied.any(axis=1))
+            for column in (columns if math.copysign(1.0, direction_veloc) > 0 else columns[::-1]):
+                for row in np.flatnonzero(occupied[column]):  # y-order doesn't matter
+                    tile_sprite = layer.tile_sprites[tile_start_x + column, tile_start_y + row]
+                    col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
+                    if col:
+                        sprite.trigger_event("collision", col)
+                        return
         else:
-            direction_y = int(math.copysign(1.0, direction_veloc))
-            for tile_y in range(tile_start_y if direction_y > 0 else tile_end_y, (tile_end_y if direction_y > 0 else tile_start_y) + direction_y, direction_y):
-                for tile_x in range(tile_start_x, tile_end_x + 1):  # x-order doesn't matter
-                    tile_sprite = layer.tile_sprites[tile_x, tile_y]
-                    if tile_sprite:
-                        col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
-                        if col:
-                            sprite.trigger_event("collision", col)
-                            return
+            rows = np.flatnonzero(occupied.any(axis=0))
+            for row in (rows if math.copysign(1.0, direction_veloc) > 0 else rows[::-1]):
+                for column in np.flatnonzero(occupied[:, row]):  # x-order doesn't matter
+                    tile_sprite = layer.tile_sprites[tile_start_x + column, tile_start_y + row]
+                    col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
+                    if col:
+                        sprite.trigger_event("collision", col)
+                        return
 
     def collision(self, col):
         obj = self.game_object
@@ -3190,7 +4888,7 @@ class PlatformerPhysics(ControlledPhysicsComponent):
     # collision_objects = (PlatformerCollision(), PlatformerCollision())
 
     @staticmethod
-    def get_highest_tile(tiles, direction, start_abs, end_abs):
+    def get_highest_tile(tiles, direction, start_abs, end_abs, center=None):
         """
         Returns the `highest` tile in a list (row or column) of sloped, full-collision or empty tiles.
 
@@ -3198,6 +4896,8 @@ class PlatformerPhysics(ControlledPhysicsComponent):
         :param str direction: the direction in which the list of tiles is arranged (x=row of tiles or y=column of tiles)
         :param int start_abs: the absolute leftmost x-value from where to check
         :param int end_abs: the absolute rightmost x-value from where to check
+        :param Union[Tuple[SlopedTileSprite,float],None] center: the (precomputed) first highest center tile (all tiles but the first and the last)
+            and its max_y value (e.g. from a TiledTileLayer's max_heights grid); None to loop through the center tiles
         :return: a tuple consisting of a) the highest SlopedTileSprite found in the list and b) the height value measured on a cartesian y-axis (positive=up)
         :rtype: Tuple[SlopedTileSprite,int]
         """
@@ -3211,12 +4911,16 @@ class PlatformerPhysics(ControlledPhysicsComponent):
             max_y = 0
 
         # then do all center tiles
-        for slot in range(1, len(tiles) - 1):
-            tile = tiles[slot]
-            max_ = tile.max_y if tile else 0
-            if max_ > max_y:
-                max_y = max_
-                best_tile = tile
+        if center is not None:
+            if center[1] > max_y:
+                best_tile, max_y = center
+        else:
+            for slot in range(1, len(tiles) - 1):
+                tile = tiles[slot]
+                max_ = tile.max_y if tile else 0
+                if max_ > max_y:
+                    max_y = max_
+                    best_tile = tile
 
         # then do the rightmost tile (max between tiles left edge and sprite's right edge)
         tile = tiles[-1]
@@ -3410,11 +5114,12 @@ class PlatformerPhysics(ControlledPhysicsComponent):
         else:
             self.vx = 0
 
+        # in continuous-collision mode, do only one step (moves are clipped by swept collision tests), otherwise steps of max. 1/30s
         # TODO: check the entity's magnitude of vx and vy,
         # reduce the max dt_step if necessary to prevent skipping through objects.
         dt_step = dt
         while dt_step > 0:
-            dt = min(1 / 30, dt_step)
+            dt = dt_step if self.continuous_collision else min(1 / 30, dt_step)
 
             # update x/y-velocity based on acceleration
             self.vx += ax * dt
@@ -3445,6 +5150,9 @@ class PlatformerPhysics(ControlledPhysicsComponent):
             orig_pos = (obj.rect.x, obj.rect.y)
             if self.vx != 0.0:
                 sx = self.vx * dt
+                # - only full tiles (and blocking Sprites) can stop us in x-direction (we walk up slopes and through one-way platforms)
+                if self.continuous_collision:
+                    sx, _ = obj.stage.get_swept_motion(obj, sx, 0.0, Sprite.get_type("default"), True, obj.collision_mask & Sprite.get_type("default"))
                 obj.move(sx, 0.0)
                 # if we were docked to a slope -> move y component according to that slope's shape independent of y-speed
                 # (and then still do the normal y-movement)
@@ -3460,7 +5168,14 @@ class PlatformerPhysics(ControlledPhysicsComponent):
 
             # then move in y-direction and solve y-collisions
             if self.vy != 0.0:
-                obj.move(0.0, self.vy * dt)
+                sy = self.vy * dt
+                # - falling: all tiles (slopes are swept as their full tile rects; the discrete collision then finds the slope's surface) and
+                #   one-way platforms can stop us; moving up: only full tiles (no ceiling slopes) and blocking Sprites
+                if self.continuous_collision:
+                    falling = sy > 0
+                    sprite_types = Sprite.get_type("default,one_way_platform") if falling else Sprite.get_type("default")
+                    _, sy = obj.stage.get_swept_motion(obj, 0.0, sy, Sprite.get_type("default"), not falling, obj.collision_mask & sprite_types)
+                obj.move(0.0, sy)
                 if DEBUG_FLAGS & DEBUG_RENDER_SPRITES_BEFORE_COLLISION_DETECTION:
                     obj.render(game_loop.display)
                     game_loop.display.debug_refresh()
@@ -3488,7 +5203,9 @@ class PlatformerPhysics(ControlledPhysicsComponent):
                 if layer.type & Sprite.get_type("default"):
                     self.collide_with_collision_layer(sprite, layer, direction, direction_veloc, original_pos)
         # simple sprites (e.g. enemies)
-        for other_sprite in stage.sprites:
+        # - only those that are close to the rect we swept through during the move (from original_pos to our current position)
+        swept_rect = sprite.rect.union(pygame.Rect(original_pos, sprite.rect.size))
+        for other_sprite in stage.get_sprites_near(swept_rect, sprite.collision_mask):
             if sprite is other_sprite:
                 continue
             if sprite.collision_mask & other_sprite.type:
@@ -3526,52 +5243,60 @@ class PlatformerPhysics(ControlledPhysicsComponent):
         # 2) if one found, move Sprite out of it and that's it
         # 3) move again from top to bottom and in each row look for the highest slope under the Sprite
         # 4) if on e found that's not 0-height -> process that (y-pull or y-push) and return
+        # the full collision tiles in the overlapping area (indexed by [x - tile_start_x, y - tile_start_y])
+        full_tiles = layer.tile_classes[tile_start_x:tile_end_x + 1, tile_start_y:tile_end_y + 1] == TiledTileLayer.TILE_CLASS_FULL
+
         if direction == 'x':
             # find full collision tiles (no reaching(!) slope neighbor in negative veloc direction)
             # - non-reaching slope neighbors are slopes whose highest point would not reach the full neighbor tile (is smaller than 1.0 * tileheight)
-            direction_x = int(math.copysign(1.0, direction_veloc))
-            for tile_x in range(tile_start_x if direction_x > 0 else tile_end_x, (tile_end_x if direction_x > 0 else tile_start_x) + direction_x, direction_x):
-                for tile_y in range(tile_start_y, tile_end_y + 1):  # y-order doesn't matter
-                    tile_sprite = layer.tile_sprites[tile_x, tile_y]
-                    # TODO: make this work for non-full slope==0 tiles (e.g. half tiles where top half is missing)
-                    if tile_sprite and tile_sprite.is_full:
-                        # is there a reaching slope in negative veloc direction? -> return the neighbor reaching slope tile instead
-                        neighbor = layer.tile_sprites[(tile_x - direction_x), tile_y]
-                        neighbor_border_y = neighbor.get_y(layer.pytmx_tiled_map.tilewidth if direction_x == 1 else 0) if neighbor else 0
-                        # neighbor slope reaches til top of full tile OR neighbor slope-tile is at least 1px high and `stairs` option is enabled
-                        # -> do a y-collision on the full tile with low vy (to avoid crash/high impact)
-                        if neighbor_border_y > 0:
-                            # neighbor slope reaches full tile OR stairs option enabled
-                            if neighbor_border_y >= tile_sprite.offset * layer.pytmx_tiled_map.tileheight or self.allow_stairs_climb:
-                                col = AABBCollision.collide(sprite, tile_sprite, None, "y", 0.1, original_pos)
-                            # neighbor slope not high enough AND stairs option disabled -> 1) bump up sprite on slope 2) solve x-collision against full tile
-                            else:
-                                # make sure the sprite is bumped up on the neighbor up-slope (this may already be done by the xy-pull if vx is not too high)
-                                if sprite.components["dockable"].is_docked():
-                                    sprite.move(0.0, -(sprite.rect.bottom - (neighbor.rect.bottom - neighbor_border_y)))
-                                # no stairs -> bump against full tile from the side
-                                col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
-                        # normal full-tile x-collision w/o neighbor slope
-                        else:
-                            col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
-
-                        assert col, "ERROR: there must be a col returned from collision detector for tile {},{} neighbored by {},{}!".\
-                            format(tile_sprite.tile_x, tile_sprite.tile_y, (neighbor.tile_x if neighbor else "none"), (neighbor.tile_y if neighbor else "none"))
+            # - we only need the first column (in veloc direction) that has a full tile in it and - in that column - the topmost full tile
+            full_columns = np.flatnonzero(full_tiles.any(axis=1))
+            if len(full_columns) > 0:
+                direction_x = int(math.copysign(1.0, direction_veloc))
+                column = full_columns[0] if direction_x > 0 else full_columns[-1]
+                tile_x = tile_start_x + int(column)
+                tile_y = tile_start_y + int(np.argmax(full_tiles[column]))  # y-order doesn't matter
+                tile_sprite = layer.tile_sprites[tile_x, tile_y]
+                # TODO: make this work for non-full slope==0 tiles (e.g. half tiles where top half is missing)
+                # is there a reaching slope in negative veloc direction? -> return the neighbor reaching slope tile instead
+                neighbor = layer.tile_sprites[(tile_x - direction_x), tile_y]
+                neighbor_border_y = neighbor.get_y(layer.pytmx_tiled_map.tilewidth if direction_x == 1 else 0) if neighbor else 0
+                # neighbor slope reaches til top of full tile OR neighbor slope-tile is at least 1px high and `stairs` option is enabled
+                # -> do a y-collision on the full tile with low vy (to avoid crash/high impact)
+                if neighbor_border_y > 0:
+                    # neighbor slope reaches full tile OR stairs option enabled
+                    if neighbor_border_y >= tile_sprite.offset * layer.pytmx_tiled_map.tileheight or self.allow_stairs_climb:
+                        col = AABBCollision.collide(sprite, tile_sprite, None, "y", 0.1, original_pos)
+                    # neighbor slope not high enough AND stairs option disabled -> 1) bump up sprite on slope 2) solve x-collision against full tile
+                    else:
+                        # make sure the sprite is bumped up on the neighbor up-slope (this may already be done by the xy-pull if vx is not too high)
+                        if sprite.components["dockable"].is_docked():
+                            sprite.move(0.0, -(sprite.rect.bottom - (neighbor.rect.bottom - neighbor_border_y)))
+                        # no stairs -> bump against full tile from the side
+                        col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
+                # normal full-tile x-collision w/o neighbor slope
+                else:
+                    col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
 
-                        sprite.trigger_event("collision", col)
-                        return
+                assert col, "ERROR: there must be a col returned from collision detector for tile {},{} neighbored by {},{}!".\
+                    format(tile_sprite.tile_x, tile_sprite.tile_y, (neighbor.tile_x if neighbor else "none"), (neighbor.tile_y if neighbor else "none"))
+
+                sprite.trigger_event("collision", col)
+                return
             # keep looking below (same algo as positive y-direction (falling))
 
         # if sprite is moving up: only check for full collision tiles (no upside-down/ceiling slopes supported yet)
+        # - we only need the lowest row that has a full tile in it and - in that row - the leftmost full tile
         elif direction_veloc < 0:
-            for tile_y in range(tile_end_y, tile_start_y - 1, -1):
-                for tile_x in range(tile_start_x, tile_end_x + 1):
-                    tile_sprite = layer.tile_sprites[tile_x, tile_y]
-                    if tile_sprite and tile_sprite.is_full:
-                        col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
-                        assert col, "ERROR: there must be a col returned from collision detector for tile {},{}!".format(tile_x, tile_y)
-                        sprite.trigger_event("collision", col)
-                        return
+            full_rows = np.flatnonzero(full_tiles.any(axis=0))
+            if len(full_rows) > 0:
+                row = full_rows[-1]
+                tile_x = tile_start_x + int(np.argmax(full_tiles[:, row]))
+                tile_y = tile_start_y + int(row)
+                tile_sprite = layer.tile_sprites[tile_x, tile_y]
+                col = AABBCollision.collide(sprite, tile_sprite, None, direction, direction_veloc, original_pos)
+                assert col, "ERROR: there must be a col returned from collision detector for tile {},{}!".format(tile_x, tile_y)
+                sprite.trigger_event("collision", col)
             # there was nothing above (no collision); have to return here not to go into following for-loop
             return
 
@@ -3583,9 +5308,20 @@ class PlatformerPhysics(ControlledPhysicsComponent):
         dockable = sprite.components["dockable"]
         is_docked = dockable.is_docked()
 
-        for tile_y in range(tile_start_y, tile_end_y + 1):
-            tiles_to_check = [layer.tile_sprites[tile_x, tile_y] for tile_x in range(tile_start_x, tile_end_x + 1)]
-            (highest_tile, highest_height) = self.get_highest_tile(tiles_to_check, "x", sprite.rect.left, sprite.rect.right)
+        # skip all rows that have no tiles in them
+        occupied_rows = np.flatnonzero(layer.occupancy[tile_start_x:tile_end_x + 1, tile_start_y:tile_end_y + 1].any(axis=0))
+        # the (first) highest center tile (all but the leftmost and rightmost column) in each row, taken from the layer's max-height grid
+        center_heights = layer.max_heights[tile_start_x + 1:tile_end_x, tile_start_y:tile_end_y + 1]
+        center_columns = center_heights.argmax(axis=0) if center_heights.shape[0] > 0 else None
+        for row in occupied_rows.tolist():
+            tile_y = tile_start_y + row
+            center = None
+            if center_columns is not None:
+                center_column = int(center_columns[row])
+                center = (layer.tile_sprites[tile_start_x + 1 + center_column, tile_y], float(center_heights[center_column, row]))
+            # only the leftmost and the rightmost tile have to be measured
+            tiles_to_check = (layer.tile_sprites[tile_start_x, tile_y], layer.tile_sprites[tile_end_x, tile_y])
+            (highest_tile, highest_height) = self.get_highest_tile(tiles_to_check, "x", sprite.rect.left, sprite.rect.right, center)
             # we found some high tile in this row -> process and return
             if highest_tile is not None:
                 # y-direction (falling): deal with impact/docking/etc..
@@ -4053,6 +5789,8 @@ class Level(Screen, metaclass=ABCMeta):
     """
     A Level class adds tmx file support to the Screen.
     TiledTileLayers (background, collision, foreground, etc..) as well as single Sprite objects can be defined in the tmx file.
+    Only the header of the tmx file (map size and properties) is read when the Level is constructed; the full tmx file is loaded when the Level gets
+    staged (see `load`) or - in the background - when the Level is about to be played next (see `prefetch`).
     """
     def __init__(self, name: str = "test", **kwargs):
         super().__init__(name, **kwargs)
@@ -4060,20 +5798,57 @@ class Level(Screen, metaclass=ABCMeta):
         # TODO: warn here if keyboard_inputs is given (should be given in tmx file exclusively)
 
         self.tmx_file = kwargs.get("tmx_file", "data/" + name.lower() + ".tmx")
-        # load in the world's tmx file
-        self.tmx_obj = pytmx.load_pygame(self.tmx_file)
-        self.width = self.tmx_obj.width * self.tmx_obj.tilewidth
-        self.height = self.tmx_obj.height * self.tmx_obj.tileheight
-
-        self.register_event("mastered", "aborted", "lost")
-
-        # get keyboard_inputs directly from the pytmx object
+        # whether to load the tmx file from its compiled cache file (see CompiledTiledMap)
+        self.tmx_cache = kwargs.get("tmx_cache", True)
+        # only read in the header of the world's tmx file for now
+        self.tmx_header = load_tmx_header(self.tmx_file)
+        self.tmx_obj = None  # the loaded tmx file (see `load`)
+        self.prefetch_thread = None  # the background thread currently parsing our tmx file (see `prefetch`)
+        self.prefetched_tmx_obj = None  # the tmx file parsed by the prefetch thread (still without images)
+        self.width = self.tmx_header["width"] * self.tmx_header["tilewidth"]
+        self.height = self.tmx_header["height"] * self.tmx_header["tileheight"]
+
+        self.register_event("mastered", "aborted", "lost", "started")
+
+        # get keyboard_inputs directly from the tmx file's properties
         if not self.keyboard_inputs:
-            key_list = self.tmx_obj.properties.get("keyboard_inputs", "")
+            key_list = self.tmx_header["properties"].get("keyboard_inputs", "")
             assert len(key_list) > 0, "ERROR: tmx file needs a global map property `keyboard_inputs` such as e.g. `up,down,left,right`"
             descriptions = key_list.split(",")
             self.keyboard_inputs = KeyboardInputs(descriptions)
 
+    def load(self):
+        """
+        Loads the full tmx file into self.tmx_obj (if it hasn't been loaded yet). Waits for a running prefetch to finish instead of parsing again.
+        The tile images are always loaded here (on the main thread).
+        """
+        if self.prefetch_thread:
+            self.prefetch_thread.join()
+            self.prefetch_thread = None
+        if self.tmx_obj is None:
+            # not prefetched (or the prefetch failed -> parse here again to raise the error)
+            tmx_obj = self.prefetched_tmx_obj if self.prefetched_tmx_obj is not None else parse_tmx(self.tmx_file, use_cache=self.tmx_cache)
+            self.prefetched_tmx_obj = None
+            self.tmx_obj = load_tmx_images(tmx_obj)
+
+    def prefetch(self):
+        """
+        Starts parsing the full tmx file on a background thread (if it hasn't been loaded yet), so that the Level can be staged quicker later.
+        Only the tmx data is parsed in the background (no pygame calls); the images get loaded when the Level is staged (see `load`).
+        """
+        if self.tmx_obj is not None or self.prefetched_tmx_obj is not None or self.prefetch_thread:
+            return
+
+        def prefetch_func():
+            try:
+                self.prefetched_tmx_obj = parse_tmx(self.tmx_file, use_cache=self.tmx_cache)
+            # the error will be raised again when loading in the main thread (see `load`)
+            except Exception as e:
+                print("WARNING: prefetching tmx file {} failed ({}: {})!".format(self.tmx_file, type(e).__name__, e))
+
+        self.prefetch_thread = threading.Thread(target=prefetch_func, name="prefetch_" + self.name, daemon=True)
+        self.prefetch_thread.start()
+
     # populates a Stage with this Level by going through the tmx file layer by layer and adding it
     # - unlike SimpleScreen, uses only the tmx file for adding things to the Stage
     @staticmethod
@@ -4084,6 +5859,8 @@ class Level(Screen, metaclass=ABCMeta):
         :param Stage stage:
         """
         assert isinstance(stage.screen, Level), "ERROR: screen property of a Stage that uses Level.screen_func to stage a Screen must be a Level object!"
+        # load the full tmx file now (if not already done or prefetched)
+        stage.screen.load()
 
         # force add the default physics functions to the Stage's options
         defaults(stage.options, {"components": [Viewport(stage.screen.display)],
@@ -4093,6 +5870,9 @@ class Level(Screen, metaclass=ABCMeta):
         for layer in stage.screen.tmx_obj.layers:
             stage.add_tiled_layer(layer, stage.screen.tmx_obj)
 
+        # let listeners (e.g. the Game) know that we are about to be played
+        stage.screen.trigger_event("started", stage.screen)
+
     def play(self):
         """
         Start level (stage the scene; will overwrite the old 0-stage (=main-stage)).
@@ -4125,7 +5905,8 @@ class Game(object):
 
     instantiated = False
 
-    def __init__(self, screens_and_levels, width=0, height=0, title="spygame Demo!", max_fps=60, debug_flags=DEBUG_NONE):
+    def __init__(self, screens_and_levels, width=0, height=0, title="spygame Demo!", max_fps=60, debug_flags=DEBUG_NONE, dirty_rect_rendering=False,
+                 headless=False):
         """
         :param list screens_and_levels: a list of Screen and Level definitions. Each item is a dict with
         :param int width: the width of the screen in pixels (0 for auto)
@@ -4133,9 +5914,14 @@ class Game(object):
         :param str title: the title of the game (will be displayed as the game Window caption)
         :param int max_fps: the max. number of frames in one second (could be less if Game runs slow, but never more)
         :param int debug_flags: a bitmap for setting different debug flags (see global variables DEBUG_...)
+        :param bool dirty_rect_rendering: whether to only redraw the changed regions of the Display each frame (see Stage.render_stages_dirty_rects)
+        :param bool headless: if True, use a HeadlessDisplay (no window, no video driver needed), which allows for more than one Game per process
+            (note: Stages are stored process-wide (Stage.stages), so only one Game can be played at a time)
         """
-        assert not Game.instantiated, "ERROR: can only create one {} object!".format(type(self).__name__)
-        Game.instantiated = True
+        # only one Game with a window (see Display)
+        assert headless or not Game.instantiated, "ERROR: can only create one {} object with a window (use headless=True)!".format(type(self).__name__)
+        if not headless:
+            Game.instantiated = True
 
         # init the pygame module (if this did not already happen)
         pygame.init()
@@ -4152,7 +5938,7 @@ class Game(object):
         DEBUG_FLAGS = debug_flags
 
         # create the Display object for the entire game: we pass it to all levels and screen objects
-        self.display = Display(width, height, title)  # use widthxheight for now (default); this will be reset to the largest Level dimensions further below
+        self.display = (HeadlessDisplay if headless else Display)(width, height, title, dirty_rect_rendering)  # use widthxheight for now (default); this will be reset to the largest Level dimensions further below
 
         # our levels (if any) determine the size of the display
         get_w_from_levels = True if width == 0 else False
@@ -4175,6 +5961,7 @@ class Game(object):
                 self.levels_by_name[name] = level
                 self.levels.append(level)
                 # register events
+                level.on_event("started", self, "level_started")
                 level.on_event("mastered", self, "level_mastered")
                 level.on_event("aborted", self, "level_aborted")
                 level.on_event("lost", self, "level_lost")
@@ -4208,6 +5995,16 @@ class Game(object):
             next_ = None
         return next_
 
+    def level_started(self, level):
+        """
+        a level has been staged -> prefetch the next one (in the background), so we can switch to it right away once this one is mastered
+
+        :param Level level: the Level object that has been staged
+        """
+        next_ = self.get_next_level(level)
+        if next_:
+            next_.prefetch()
+
     def level_mastered(self, level):
         """
         a level has been successfully finished -> play next one
@@ -4251,6 +6048,8 @@ class CollisionAlgorithm(object):
     # the default collision objects
     # - can be overridden via the collide method
     default_collision_objects = (Collision(), Collision())
+    # whether this algorithm implements `collide_all` (finding all Sprite-vs-Sprite collisions of a Stage in one pass)
+    batched = False
 
     @staticmethod
     @abstractmethod
@@ -4355,6 +6154,295 @@ class AABBCollision(CollisionAlgorithm):
 
         return collision_obj if collision_obj.is_collided else None
 
+    @staticmethod
+    def collide_swept(sprite1, sprite2, dx, dy, collision_obj=None):
+        """
+        Swept AABB test (continuous collision detection): moves sprite1 (from its current position) along the motion vector dx/dy and returns the
+        time of impact with the (static) sprite2.
+        Sprites that already overlap at the start of the motion are not reported (these are handled by the normal (discrete) collision detection).
+
+        :param Sprite sprite1: the moving Sprite (at the position before the move)
+        :param Sprite sprite2: the static Sprite
+        :param float dx: the x-component of sprite1's motion vector (in px)
+        :param float dy: the y-component of sprite1's motion vector (in px)
+        :param Union[Collision,None] collision_obj: the collision object to be populated (None for our default one)
+        :return: the populated Collision object (with time_of_impact and the normal of the face that was hit) or None if there is no contact
+        :rtype: Union[Collision,None]
+        """
+        r1 = sprite1.rect
+        r2 = sprite2.rect
+        # already overlapping -> not our business
+        if r1.right > r2.left and r1.left < r2.right and r1.bottom > r2.top and r1.top < r2.bottom:
+            return None
+
+        # entry and exit times on both axes
+        if dx > 0:
+            x_entry, x_exit = (r2.left - r1.right) / dx, (r2.right - r1.left) / dx
+        elif dx < 0:
+            x_entry, x_exit = (r2.right - r1.left) / dx, (r2.left - r1.right) / dx
+        elif r1.right > r2.left and r1.left < r2.right:
+            x_entry, x_exit = -math.inf, math.inf
+        else:
+            return None
+        if dy > 0:
+            y_entry, y_exit = (r2.top - r1.bottom) / dy, (r2.bottom - r1.top) / dy
+        elif dy < 0:
+            y_entry, y_exit = (r2.bottom - r1.top) / dy, (r2.top - r1.bottom) / dy
+        elif r1.bottom > r2.top and r1.top < r2.bottom:
+            y_entry, y_exit = -math.inf, math.inf
+        else:
+            return None
+
+        entry = max(x_entry, y_entry)
+        # no contact (or only touching) within this motion
+        if entry >= min(x_exit, y_exit) or entry < 0.0 or entry >= 1.0:
+            return None
+
+        if not collision_obj:
+            collision_obj = AABBCollision.default_collision_objects[0]
+        collision_obj.sprite1 = sprite1
+        collision_obj.sprite2 = sprite2
+        collision_obj.is_collided = True
+        collision_obj.time_of_impact = entry
+        collision_obj.original_pos = (r1.x, r1.y)
+        # the face we hit determines the normal and the direction
+        if x_entry > y_entry:
+            collision_obj.direction = "x"
+            collision_obj.direction_veloc = dx
+            collision_obj.normal_x = -math.copysign(1.0, dx)
+            collision_obj.normal_y = 0.0
+            collision_obj.distance = -abs(dx) * (1.0 - entry)  # how far would sprite1 penetrate sprite2 without stopping
+        else:
+            collision_obj.direction = "y"
+            collision_obj.direction_veloc = dy
+            collision_obj.normal_x = 0.0
+            collision_obj.normal_y = -math.copysign(1.0, dy)
+            collision_obj.distance = -abs(dy) * (1.0 - entry)
+        collision_obj.magnitude = abs(collision_obj.distance)
+        collision_obj.separate = [- collision_obj.distance * collision_obj.normal_x, - collision_obj.distance * collision_obj.normal_y]
+        return collision_obj
+
+    @staticmethod
+    def sweep(sprite1, others, dx, dy, collision_objects=None):
+        """
+        Returns the earliest contact of sprite1 (moving along dx/dy) with any of the given other Sprites.
+
+        :param Sprite sprite1: the moving Sprite (at the position before the move)
+        :param iterable others: the Sprites (e.g. TileSprites) to sweep against
+        :param float dx: the x-component of sprite1's motion vector (in px)
+        :param float dy: the y-component of sprite1's motion vector (in px)
+        :param Union[None,Tuple[Collision]] collision_objects: the two always-recycled returnable Collision instances; if None, use our default ones
+        :return: the Collision with the smallest time_of_impact (None if sprite1 can move freely)
+        :rtype: Union[Collision,None]
+        """
+        if not collision_objects:
+            collision_objects = AABBCollision.default_collision_objects
+        best, tmp = collision_objects
+        found = False
+        for other in others:
+            if other is sprite1:
+                continue
+            col = AABBCollision.collide_swept(sprite1, other, dx, dy, tmp)
+            if col and (not found or col.time_of_impact < best.time_of_impact):
+                # swap the recycled objects (keep the best one)
+                best, tmp = tmp, best
+                found = True
+        return best if found else None
+
+    @staticmethod
+    def clip_motion(dx, dy, col, penetration=1):
+        """
+        Shortens a motion vector so that the moving Sprite stops at the time of impact of a swept Collision (plus some penetration, so that the
+        normal collision detection will still see and solve the collision (e.g. for docking on the ground)).
+
+        :param float dx: the x-component of the motion vector (in px)
+        :param float dy: the y-component of the motion vector (in px)
+        :param Union[Collision,None] col: the Collision returned by `sweep` (None for no clipping)
+        :param int penetration: the number of pixels to move into the hit object (along the collision normal)
+        :return: the clipped motion vector
+        :rtype: Tuple[float,float]
+        """
+        if not col:
+            return dx, dy
+        t = col.time_of_impact
+        # move into the hit object by `penetration` px (but never farther than the original motion)
+        if col.normal_x != 0.0:
+            return math.copysign(min(abs(dx), abs(dx) * t + penetration), dx), dy * t
+        return dx * t, math.copysign(min(abs(dy), abs(dy) * t + penetration), dy)
+
+
+class SpriteArrays(object):
+    """
+    A persistent mirror of the rects, types, collision masks and "active" flags (see NumpyAABBCollision.collide_all) of a list of Sprites in
+    contiguous NumPy arrays (struct-of-arrays).
+    The arrays are kept between frames: `sync` only rebuilds them when Sprites were added or removed and otherwise just overwrites those rows
+    whose Sprite data has changed (e.g. the rects of the Sprites that moved).
+    """
+
+    def __init__(self):
+        self.sprites = []  # the Sprites that we currently mirror (row i belongs to self.sprites[i])
+        self.last_rects = []  # copies of the rects of all Sprites (as they are stored in self.rects)
+        self.last_data = []  # tuples of type, collision mask and active flag of all Sprites (as they are stored in our arrays)
+        self.rects = np.zeros(shape=(0, 4), dtype=np.int64)  # left, top, right, bottom
+        self.types = np.zeros(shape=(0,), dtype=np.int64)
+        self.masks = np.zeros(shape=(0,), dtype=np.int64)
+        self.active = np.zeros(shape=(0,), dtype=bool)
+
+    @staticmethod
+    def get_data(sprite):
+        """
+        Returns the type, collision mask and active flag (whether the Sprite actively collides with others, like sprite1 in Stage.solve_collisions)
+        of a Sprite.
+
+        :param Sprite sprite: the Sprite
+        :return: tuple of type, collision mask and active flag
+        :rtype: Tuple[int,int,bool]
+        """
+        return sprite.type, sprite.collision_mask, sprite.ignore_after_n_ticks > 0 and not sprite.handles_own_collisions and sprite.collision_mask > 0
+
+    def sync(self, sprites):
+        """
+        Brings our arrays up to date with the given Sprites.
+
+        :param List[Sprite] sprites: the list of Sprites to mirror (usually a Stage's Sprites)
+        """
+        # Sprites were added or removed -> rebuild all arrays
+        if sprites != self.sprites:
+            n = len(sprites)
+            self.sprites = list(sprites)
+            self.last_rects = [sprite.rect.copy() for sprite in sprites]
+            self.last_data = [SpriteArrays.get_data(sprite) for sprite in sprites]
+            self.rects = np.array([(r.left, r.top, r.right, r.bottom) for r in self.last_rects], dtype=np.int64).reshape((n, 4))
+            self.types = np.fromiter((data[0] for data in self.last_data), dtype=np.int64, count=n)
+            self.masks = np.fromiter((data[1] for data in self.last_data), dtype=np.int64, count=n)
+            self.active = np.fromiter((data[2] for data in self.last_data), dtype=bool, count=n)
+            return
+
+        # only overwrite what has changed (collect all changed rows first, then write them with one fancy-indexed assignment per array)
+        last_rects = self.last_rects
+        last_data = self.last_data
+        get_data = SpriteArrays.get_data
+        moved = []
+        new_rects = []
+        changed = []
+        new_data = []
+        for i, sprite in enumerate(sprites):
+            rect = sprite.rect
+            if rect != last_rects[i]:
+                last_rects[i] = rect = rect.copy()
+                moved.append(i)
+                new_rects.append((rect.left, rect.top, rect.right, rect.bottom))
+            data = get_data(sprite)
+            if data != last_data[i]:
+                last_data[i] = data
+                changed.append(i)
+                new_data.append(data)
+        if moved:
+            self.rects[moved] = new_rects
+        if changed:
+            types, masks, active = zip(*new_data)
+            self.types[changed] = types
+            self.masks[changed] = masks
+            self.active[changed] = active
+
+
+class NumpyAABBCollision(AABBCollision):
+    """
+    A batched version of AABBCollision: mirrors the rects, types and collision masks of all Sprites into contiguous NumPy arrays (see SpriteArrays)
+    and finds all overlapping, mask-compatible Sprite pairs of a frame in one vectorized pass (sort-and-sweep on the x-axis).
+    Single pairs (e.g. Sprite vs TileSprite) are still handled by AABBCollision.collide.
+    Select it via a Stage's options["physics_collision_detector"] = NumpyAABBCollision.
+    """
+    batched = True
+
+    @staticmethod
+    def collide_all(sprites, collision_objects=None, arrays=None):
+        """
+        Finds all collisions between the given Sprites (each active Sprite vs all others with matching masks).
+        All positions and velocities are taken from a snapshot at the beginning of the call.
+        Yields one populated (recycled) Collision object per colliding pair, in the order of the given Sprites list (sprite1 first, then sprite2), which
+        is the same order in which the Stage's non-batched loop would find them. The caller has to use each Collision object before asking for the next
+        one.
+
+        :param List[Sprite] sprites: the list of Sprites to collide with each other (usually a Stage's Sprites)
+        :param Union[None,Tuple[Collision]] collision_objects: the two always-recycled returnable Collision instances; if None, use our default ones
+        :param Union[SpriteArrays,None] arrays: the persistent SpriteArrays to mirror the Sprites' data into (only changed data is updated);
+            None for building temporary arrays
+        :return: a generator of populated Collision objects (the same recycled object each time)
+        :rtype: Generator[Collision]
+        """
+        n = len(sprites)
+        if n < 2:
+            return
+        if not collision_objects:
+            collision_objects = NumpyAABBCollision.default_collision_objects
+
+        # mirror all Sprite data into arrays (struct-of-arrays)
+        if arrays is None:
+            arrays = SpriteArrays()
+        arrays.sync(sprites)
+        left, top, right, bottom = arrays.rects.T
+        type_ = arrays.types
+        mask = arrays.masks
+        # only these Sprites actively collide with others (sprite1 in the Stage's loop)
+        active = arrays.active
+
+        # sort-and-sweep: for each active Sprite i, all Sprites j with left[j] in [left[i] - max-width, right[i]) are candidates
+        order = np.argsort(left, kind="stable")
+        sorted_left = left[order]
+        start = np.searchsorted(sorted_left, left - (right - left).max(), side="left")
+        end = np.searchsorted(sorted_left, right, side="left")
+        counts = np.where(active, end - start, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return
+        i = np.repeat(np.arange(n), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(start, counts) + offsets]
+
+        # narrow phase (overlap and both masks must match)
+        hit = (i != j) & (left[i] < right[j]) & (right[i] > left[j]) & (top[i] < bottom[j]) & (bottom[i] > top[j]) & \
+              (mask[i] & type_[j] != 0) & (mask[j] & type_[i] != 0)
+        i = i[hit]
+        j = j[hit]
+        if len(i) == 0:
+            return
+        # sort by sprite1, then sprite2 (Stage order)
+        pair_order = np.lexsort((j, i))
+        i = i[pair_order]
+        j = j[pair_order]
+
+        # the direction and velocity of each colliding sprite1 (0=x, 1=y)
+        directions = {}
+        for idx in np.unique(i).tolist():
+            directions[idx] = Stage.estimate_sprite_direction(sprites[idx])
+        is_y = np.fromiter((directions[idx][0] == "y" for idx in i.tolist()), dtype=bool, count=len(i))
+        veloc = np.fromiter((directions[idx][1] for idx in i.tolist()), dtype=np.float64, count=len(i))
+
+        # distances and normals (same as AABBCollision.try_collide)
+        positive = veloc > 0
+        distance = np.where(is_y, np.where(positive, -(bottom[i] - top[j]), -(bottom[j] - top[i])),
+                            np.where(positive, -(right[i] - left[j]), -(right[j] - left[i])))
+        normal = np.where(positive, -1.0, np.where(veloc < 0, 1.0, 0.0))
+
+        col = collision_objects[0]
+        for idx1, idx2, y, v, dist, norm in zip(i.tolist(), j.tolist(), is_y.tolist(), veloc.tolist(), distance.tolist(), normal.tolist()):
+            sprite1 = sprites[idx1]
+            col.sprite1 = sprite1
+            col.sprite2 = sprites[idx2]
+            col.is_collided = True
+            col.direction = directions[idx1][0]
+            col.direction_veloc = directions[idx1][1]
+            col.normal_x = 0.0 if y else norm
+            col.normal_y = norm if y else 0.0
+            # no velocity -> distance is not touched (same as in AABBCollision.try_collide)
+            if v != 0:
+                col.distance = dist
+            col.magnitude = abs(col.distance)
+            col.separate = [- col.distance * col.normal_x, - col.distance * col.normal_y]
+            col.original_pos = (sprite1.rect.x, sprite1.rect.y)
+            yield col
+
 
 # TODO: SATCollisions are WIP
 class SATCollision(CollisionAlgorithm):
@@ -4477,6 +6565,258 @@ class SATCollision(CollisionAlgorithm):
         return collision_obj if collision_obj.is_collided else None
 
 
+class BroadPhase(object, metaclass=ABCMeta):
+    """
+    A spatial index over all Sprites of a Stage.
+    Used by the Stage to quickly find those Sprites that are close to a given rect (the candidates for the more expensive
+    narrow-phase collision detection), instead of testing each Sprite against all other Sprites.
+    """
+
+    def __init__(self, stage):
+        """
+        :param Stage stage: the Stage whose Sprites we are indexing
+        """
+        self.stage = stage
+
+    @abstractmethod
+    def add(self, sprite):
+        """
+        Adds a Sprite to the index.
+
+        :param Sprite sprite: the Sprite to add
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, sprite):
+        """
+        Removes a Sprite from the index (does nothing if the Sprite is not indexed).
+
+        :param Sprite sprite: the Sprite to remove
+        """
+        pass
+
+    @abstractmethod
+    def update(self, sprite):
+        """
+        Re-indexes a Sprite after it has changed its position or size.
+
+        :param Sprite sprite: the Sprite to update
+        """
+        pass
+
+    @abstractmethod
+    def query(self, rect):
+        """
+        Returns all Sprites that are close to (or overlap with) the given rect.
+        The result may contain some false positives (Sprites that do not actually overlap with the rect), but never misses an overlapping Sprite.
+
+        :param pygame.Rect rect: the rect to find Sprites for
+        :return: an iterable of candidate Sprites
+        :rtype: iterable
+        """
+        pass
+
+    def update_all(self):
+        """
+        Re-indexes all Sprites of our Stage (e.g. once per frame before solving collisions).
+        """
+        for sprite in self.stage.sprites:
+            self.update(sprite)
+
+
+class SpatialHashGrid(BroadPhase):
+    """
+    A uniform-grid BroadPhase: each Sprite is stored in all grid cells that its rect overlaps with.
+    The cell size is derived from the tile size of the Stage's tmx file (if any), e.g. 4x4 tiles per cell.
+    A query returns all Sprites stored in the cells overlapping the given rect plus their direct neighbour cells.
+    """
+
+    def __init__(self, stage, tiles_per_cell=4, cell_w=None, cell_h=None):
+        """
+        :param Stage stage: the Stage whose Sprites we are indexing
+        :param int tiles_per_cell: the number of tiles (in x and y direction) that go into one cell (if cell_w/cell_h are not given)
+        :param Union[int,None] cell_w: the width of a cell in pixels (None for tilewidth * tiles_per_cell)
+        :param Union[int,None] cell_h: the height of a cell in pixels (None for tileheight * tiles_per_cell)
+        """
+        super().__init__(stage)
+        # Levels: use the tile size from the tmx file's header (the full tmx file only gets loaded when the Stage is populated)
+        tmx_header = getattr(stage.screen, "tmx_header", None)
+        self.cell_w = cell_w or (tmx_header["tilewidth"] if tmx_header else 16) * tiles_per_cell
+        self.cell_h = cell_h or (tmx_header["tileheight"] if tmx_header else 16) * tiles_per_cell
+        assert self.cell_w > 0 and self.cell_h > 0, "ERROR: SpatialHashGrid's cells must have a size > 0 ({}x{} given)!".format(self.cell_w, self.cell_h)
+        self.cells = {}  # key=(cell-x, cell-y); value=set of Sprites in that cell
+        self.sprite_cells = {}  # key=Sprite; value=tuple of cell-ranges (x-min, x-max, y-min, y-max) the Sprite is stored in
+
+    def get_cell_range(self, rect):
+        """
+        Returns the (inclusive) range of cells overlapped by the given rect.
+
+        :param pygame.Rect rect: the rect to get the cells for
+        :return: tuple of x-min, x-max, y-min, y-max cell indices
+        :rtype: Tuple[int,int,int,int]
+        """
+        # - zero-sized rects still occupy one cell
+        return rect.left // self.cell_w, max(rect.left, rect.right - 1) // self.cell_w, rect.top // self.cell_h, max(rect.top, rect.bottom - 1) // self.cell_h
+
+    def add(self, sprite):
+        cell_range = self.get_cell_range(sprite.rect)
+        self.sprite_cells[sprite] = cell_range
+        x_min, x_max, y_min, y_max = cell_range
+        for cx in range(x_min, x_max + 1):
+            for cy in range(y_min, y_max + 1):
+                cell = self.cells.get((cx, cy))
+                if cell is None:
+                    cell = self.cells[(cx, cy)] = set()
+                cell.add(sprite)
+
+    def remove(self, sprite):
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        x_min, x_max, y_min, y_max = cell_range
+        for cx in range(x_min, x_max + 1):
+            for cy in range(y_min, y_max + 1):
+                cell = self.cells[(cx, cy)]
+                cell.discard(sprite)
+                # keep the dict small
+                if not cell:
+                    del self.cells[(cx, cy)]
+
+    def update(self, sprite):
+        # only touch the cells if the Sprite actually moved into other cells
+        if self.sprite_cells.get(sprite) != self.get_cell_range(sprite.rect):
+            self.remove(sprite)
+            self.add(sprite)
+
+    def query(self, rect):
+        x_min, x_max, y_min, y_max = self.get_cell_range(rect)
+        ret = set()
+        # - also look into the direct neighbour cells (in case a Sprite just moved a little without being re-indexed yet)
+        for cx in range(x_min - 1, x_max + 2):
+            for cy in range(y_min - 1, y_max + 2):
+                cell = self.cells.get((cx, cy))
+                if cell:
+                    ret.update(cell)
+        return ret
+
+
+class SweepAndPrune(BroadPhase):
+    """
+    A sweep-and-prune BroadPhase: keeps all Sprites sorted by their rect's left edge (x-axis) between frames.
+    As most Sprites only move a few pixels per tick, the list is nearly sorted already and can be re-sorted very cheaply with insertion sort.
+    A query only looks at those Sprites whose x-interval overlaps with the given rect (plus some margin), which - unlike a fixed grid -
+    also works well for levels where Sprites cluster unevenly (e.g. long horizontal corridors).
+    Sprites that change their rect in place (instead of calling Sprite.move) between two re-indexings (see BroadPhase.update_all) are only found
+    by queries if they didn't move farther than the margin.
+    """
+
+    def __init__(self, stage, margin=16):
+        """
+        :param Stage stage: the Stage whose Sprites we are indexing
+        :param int margin: the number of pixels to extend each query rect by (in all directions) to account for Sprites that have moved
+            a little since they were last re-indexed
+        """
+        super().__init__(stage)
+        self.margin = margin
+        self.sorted_sprites = []  # all indexed Sprites sorted by their left edge
+        self.lefts = []  # the left edges (sort keys) of all Sprites in self.sorted_sprites (same order)
+        self.keys = {}  # key=Sprite; value=the left edge that the Sprite is currently sorted in with
+        self.max_width = 0  # the widest Sprite we have seen so far (used to find the first Sprite that could reach into a query rect)
+
+    def index_of(self, sprite):
+        """
+        Returns the current index of the given Sprite in our sorted list.
+
+        :param Sprite sprite: the Sprite to look for
+        :return: the index of the Sprite in self.sorted_sprites (-1 if not found)
+        :rtype: int
+        """
+        left = self.keys.get(sprite)
+        if left is None:
+            return -1
+        # there may be more than one Sprite with the same key
+        i = bisect.bisect_left(self.lefts, left)
+        while self.sorted_sprites[i] is not sprite:
+            i += 1
+        return i
+
+    def add(self, sprite):
+        left = sprite.rect.left
+        i = bisect.bisect_right(self.lefts, left)
+        self.lefts.insert(i, left)
+        self.sorted_sprites.insert(i, sprite)
+        self.keys[sprite] = left
+        self.max_width = max(self.max_width, sprite.rect.width)
+
+    def remove(self, sprite):
+        i = self.index_of(sprite)
+        if i == -1:
+            return
+        del self.lefts[i]
+        del self.sorted_sprites[i]
+        del self.keys[sprite]
+
+    def update(self, sprite):
+        left = sprite.rect.left
+        self.max_width = max(self.max_width, sprite.rect.width)
+        if self.keys.get(sprite) == left:
+            return
+        i = self.index_of(sprite)
+        if i == -1:
+            return
+        self.lefts[i] = self.keys[sprite] = left
+        self.move_into_place(i)
+
+    def move_into_place(self, i):
+        """
+        Moves the item at index i to its correct (sorted) position by swapping it with its neighbours (one insertion sort step).
+
+        :param int i: the index of the item (in self.sorted_sprites and self.lefts) whose key has changed
+        """
+        lefts = self.lefts
+        sprites = self.sorted_sprites
+        left = lefts[i]
+        sprite = sprites[i]
+        # move down
+        while i > 0 and lefts[i - 1] > left:
+            lefts[i] = lefts[i - 1]
+            sprites[i] = sprites[i - 1]
+            i -= 1
+        # move up
+        while i < len(lefts) - 1 and lefts[i + 1] < left:
+            lefts[i] = lefts[i + 1]
+            sprites[i] = sprites[i + 1]
+            i += 1
+        lefts[i] = left
+        sprites[i] = sprite
+
+    def update_all(self):
+        # refresh all keys, then re-sort with a single insertion sort pass (O(n) for a nearly sorted list)
+        lefts = self.lefts
+        keys = self.keys
+        max_width = 0
+        for i, sprite in enumerate(self.sorted_sprites):
+            lefts[i] = keys[sprite] = sprite.rect.left
+            if sprite.rect.width > max_width:
+                max_width = sprite.rect.width
+        self.max_width = max_width
+        for i in range(1, len(lefts)):
+            if lefts[i] < lefts[i - 1]:
+                self.move_into_place(i)
+
+    def query(self, rect):
+        margin = self.margin
+        left = rect.left - margin
+        right = rect.right + margin
+        top = rect.top - margin
+        bottom = rect.bottom + margin
+        # only Sprites whose left edge lies within [left - max_width, right] can overlap in x
+        start = bisect.bisect_left(self.lefts, left - self.max_width)
+        end = bisect.bisect_right(self.lefts, right)
+        return [s for s in self.sorted_sprites[start:end] if s.rect.right >= left and s.rect.top <= bottom and s.rect.bottom >= top]
+
+
 def defaults(dictionary, defaults_dict):
     """
     Adds all key/value pairs from defaults_dict into dictionary, but only if dictionary doesn't have the key defined yet.
@@ -4489,6 +6829,151 @@ def defaults(dictionary, defaults_dict):
             dictionary[key] = value
 
 
+def convert_surface(surface, colorkey=None, rle=True):
+    """
+    Converts the given (loaded or generated) Surface once to the pixel format of the pygame display for fast blitting:
+    - colorkey given (or already set on the Surface): plain `convert()` plus the colorkey (with RLEACCEL for faster blits of color-keyed art)
+    - fully opaque Surface (see `is_opaque`): plain `convert()` (no per-pixel alpha blending when blitting)
+    - otherwise: `convert_alpha()`
+    If no pygame display (window) exists (e.g. when running with a HeadlessDisplay), the Surface is not converted (only the colorkey gets set).
+
+    :param pygame.Surface surface: the Surface to convert
+    :param Union[pygame.Color,Tuple[int,int,int],None] colorkey: the colorkey to use for transparency (None for the Surface's own colorkey, if any)
+    :param bool rle: whether to use RLEACCEL for color-keyed Surfaces
+    :return: the converted Surface (or the given one)
+    :rtype: pygame.Surface
+    """
+    if colorkey is None:
+        colorkey = surface.get_colorkey()
+    colorkey_flags = pygame.RLEACCEL if rle else 0
+    if not (pygame.display.get_init() and pygame.display.get_surface()):
+        if colorkey is not None:
+            surface.set_colorkey(colorkey, colorkey_flags)
+        return surface
+    if colorkey is not None:
+        surface = surface.convert()
+        surface.set_colorkey(colorkey, colorkey_flags)
+        return surface
+    if is_opaque(surface):
+        return surface.convert()
+    return surface.convert_alpha()
+
+
+def is_opaque(surface):
+    """
+    Checks whether the given Surface is fully opaque (no colorkey, no surface alpha and all pixels with alpha=255).
+
+    :param pygame.Surface surface: the Surface to check
+    :return: whether the Surface is fully opaque
+    :rtype: bool
+    """
+    if surface.get_colorkey() is not None:
+        return False
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return surface.get_alpha() in (None, 255)
+    return pygame.mask.from_surface(surface, 254).count() == surface.get_width() * surface.get_height()
+
+
+def unconverted_image_loader(filename, colorkey, **kwargs):
+    """
+    A pytmx image loader (like pytmx.util_pygame.pygame_image_loader) that doesn't convert the tile images to the pygame display's pixel format.
+    Used when no pygame display (window) exists (e.g. when running with a HeadlessDisplay).
+
+    :param str filename: the image file to load
+    :param Union[str,None] colorkey: the colorkey (hex-string without '#') set in the tmx file (if any)
+    :return: a callable taking a Rect and (pytmx) flags that returns the tile image for that Rect
+    :rtype: callable
+    """
+    image = pygame.image.load(filename)
+    if colorkey:
+        image.set_colorkey(pygame.Color("#{}".format(colorkey)))
+
+    def load_image(rect=None, flags=None):
+        tile = image.subsurface(rect) if rect else image.copy()
+        if flags:
+            tile = pytmx.util_pygame.handle_transformation(tile, flags)
+        return tile
+
+    return load_image
+
+
+def load_tmx_header(tmx_file):
+    """
+    Reads only the header of a tmx file: the map's size, its tile size and its properties (stops parsing before the first tileset or layer).
+
+    :param str tmx_file: the tmx file to read
+    :return: dict with the keys width, height (in tiles), tilewidth, tileheight (in px) and properties (property values are not translated (str))
+    :rtype: dict
+    """
+    header = {"properties": {}}
+    depth = 0
+    with open(tmx_file, "rb") as f:
+        for event, elem in xml.etree.ElementTree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                # the map element
+                if depth == 1:
+                    for key in ("width", "height", "tilewidth", "tileheight"):
+                        header[key] = int(elem.get(key))
+                # the first child of the map that's not the map's properties -> we are done
+                elif depth == 2 and elem.tag != "properties":
+                    break
+            else:
+                # a single map property (its value may be given as text as well (multi-line properties))
+                if depth == 3 and elem.tag == "property":
+                    header["properties"][elem.get("name")] = elem.get("value", elem.text)
+                depth -= 1
+    return header
+
+
+def load_tmx(tmx_file, use_cache=False):
+    """
+    Loads a tmx file via pytmx (with pygame images). Doesn't convert the images if no pygame display (window) exists.
+
+    :param str tmx_file: the tmx file to load
+    :param bool use_cache: whether to load the tmx file from its compiled cache file (see CompiledTiledMap; the cache file gets (re)built if needed)
+    :return: the loaded map
+    :rtype: Union[pytmx.pytmx.TiledMap,CompiledTiledMap]
+    """
+    return load_tmx_images(parse_tmx(tmx_file, use_cache))
+
+
+def parse_tmx(tmx_file, use_cache=False):
+    """
+    Parses a tmx file without loading any of its images (see load_tmx_images). Makes no pygame calls and can thus run on a background thread.
+
+    :param str tmx_file: the tmx file to parse
+    :param bool use_cache: whether to load the tmx file from its compiled cache file (see CompiledTiledMap; the cache file gets (re)built if needed)
+    :return: the parsed map (without images)
+    :rtype: Union[pytmx.pytmx.TiledMap,CompiledTiledMap]
+    """
+    if use_cache:
+        return CompiledTiledMap.load(tmx_file)
+    # pytmx' default image loader doesn't load any images
+    return pytmx.TiledMap(tmx_file)
+
+
+def load_tmx_images(tmx_obj):
+    """
+    Loads the (pygame) images of a parsed tmx file (see parse_tmx). Doesn't convert the images if no pygame display (window) exists.
+    Must be called on the main thread.
+
+    :param Union[pytmx.pytmx.TiledMap,CompiledTiledMap] tmx_obj: the parsed map
+    :return: the same map (now with images)
+    :rtype: Union[pytmx.pytmx.TiledMap,CompiledTiledMap]
+    """
+    if pygame.display.get_init() and pygame.display.get_surface():
+        image_loader = pytmx.util_pygame.pygame_image_loader
+    else:
+        image_loader = unconverted_image_loader
+    if isinstance(tmx_obj, CompiledTiledMap):
+        tmx_obj.load_images(image_loader)
+    else:
+        tmx_obj.image_loader = image_loader
+        tmx_obj.reload_images()
+    return tmx_obj
+
+
 # OBSOLETE: use
 def extend(dictionary, extend_dict):
     """
@@ -4558,7 +7043,7 @@ def get_kwargs_from_obj_props(obj_props):
         # special cases
         # a spritesheet (filename)
         if key == "tsx":
-            kwargs["sprite_sheet"] = SpriteSheet("data/" + value + ".tsx")
+            kwargs["sprite_sheet"] = AssetCache.get_sprite_sheet("data/" + value + ".tsx")
         # an image_file
         elif key == "img":
             kwargs["image_file"] = "images/" + value + ".png"
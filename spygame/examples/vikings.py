@@ -295,7 +295,7 @@ class Viking(spyg.AnimatedSprite, metaclass=ABCMeta):
 # TODO make arrow spritesheet part of baleog.tsx
 class Baleog(Viking):
     def __init__(self, x, y):
-        super().__init__(x, y, spyg.SpriteSheet("data/baleog.tsx"), {
+        super().__init__(x, y, spyg.AssetCache.get_sprite_sheet("data/baleog.tsx"), {
             "default":           "stand",  # the default animation to play
             "stand":             {"frames": [0], "loop": False, "flags": spyg.Animation.get_flag("block_stand"), "priority": 0},
             "be_bored1":         {"frames": [1, 2, 2, 1, 1, 3, 4, 3, 4, 5, 6, 5, 6, 7, 8, 7, 8, 3, 4, 3, 4], "rate": 1 / 3, "loop": False, "next": "stand"},
@@ -387,7 +387,7 @@ class Baleog(Viking):
 # define player: Erik the Swift
 class Erik(Viking):
     def __init__(self, x, y):
-        super().__init__(x, y, spyg.SpriteSheet("data/erik.tsx"), {
+        super().__init__(x, y, spyg.AssetCache.get_sprite_sheet("data/erik.tsx"), {
             "default":           "stand",  # the default animation to play
             "stand":             {"frames": [0], "loop": False, "flags": spyg.Animation.get_flag("block_stand")},
             "be_bored1":         {"frames": [1], "rate": 1 / 2, "next": "stand", "flags": spyg.Animation.get_flag("block_stand")},
@@ -496,7 +496,7 @@ class Erik(Viking):
 # define player: Olaf the ???
 class Olaf(Viking):
     def __init__(self, x, y):
-        super().__init__(x, y, spyg.SpriteSheet("data/olaf.tsx"), {
+        super().__init__(x, y, spyg.AssetCache.get_sprite_sheet("data/olaf.tsx"), {
             "default":              "stand_shield_down",  # the default animation to play
             "stand_shield_down":    {"frames": [0], "loop": False},
             "stand_shield_up":      {"frames": [14], "loop": False},
@@ -635,7 +635,7 @@ class VikingLevel(spyg.Level):
         })
 
         # find all Vikings in the Stage and store them for us
-        for sprite in stage.sprites:
+        for sprite in stage.get_sprites_by_type(spyg.Sprite.get_type("friendly")):
             if isinstance(sprite, Viking):
                 self.vikings.append(sprite)
 
@@ -816,6 +816,9 @@ class Shot(spyg.AnimatedSprite):
         self.vy = 0
         self.damage = 1
         self.hit_something = False
+        # whether to clip our moves at the first obstacle along the way (so we don't fly through thin walls or enemies at low frame rates)
+        # - only obstacles that we would also collide with in the Stage's collision pass (both collision masks must match) stop us
+        self.continuous_collision = False
 
         self.type = spyg.Sprite.get_type("particle")
         self.collision_mask = spyg.Sprite.get_type("default,friendly")
@@ -834,9 +837,13 @@ class Shot(spyg.AnimatedSprite):
         """
         dt = game_loop.dt
         self.vx += self.ax * dt * (-1 if self.flip == "x" else 1)
-        self.rect.x += self.vx * dt
         self.vy += self.ay * dt
-        self.rect.y += self.vy * dt
+        dx = self.vx * dt
+        dy = self.vy * dt
+        if self.continuous_collision and self.stage:
+            dx, dy = self.stage.get_swept_motion(self, dx, dy, sprite_type_mask=self.collision_mask, ignore=self.shooter, mutual_masks=True)
+        self.rect.x += dx
+        self.rect.y += dy
 
         # tick the animation component
         self.cmp_animation.tick(game_loop)
@@ -878,17 +885,11 @@ class Arrow(Shot):
     """
     arrow class
     """
-    sprite_sheet = None
-
     def __init__(self, shooter):
         """
         :param Sprite shooter: the shooter that shoots this Arrow object
         """
-        # init our recyclable SpriteSheet
-        if not self.sprite_sheet:
-            self.sprite_sheet = spyg.SpriteSheet("data/baleog.tsx")
-
-        super().__init__(16, 16, self.sprite_sheet, {
+        super().__init__(16, 16, spyg.AssetCache.get_sprite_sheet("data/baleog.tsx"), {
             "default": "fly",  # the default animation to play
             "fly":     {"frames": [158, 159, 160, 161], "rate": 1 / 10},
         }, shooter, anim_settings_name="arrow", width_height=(16, 5), image_rect=pygame.Rect(-8, -13, 32, 32))
@@ -907,17 +908,11 @@ class Fireball(Shot):
     """
     fireball class
     """
-    sprite_sheet = None
-
     def __init__(self, shooter, direction="right"):
         """
         :param Sprite shooter: the shooter that shoots this FireBall object
         """
-        # init our recyclable SpriteSheet
-        if not self.sprite_sheet:
-            self.sprite_sheet = spyg.SpriteSheet("data/egpt.tsx")
-
-        super().__init__(0, 0, self.sprite_sheet, {
+        super().__init__(0, 0, spyg.AssetCache.get_sprite_sheet("data/egpt.tsx"), {
             "default": "fly",  # the default animation to play
             "fly":     {"frames": [0, 1], "rate": 1 / 5},
             "hit":     {"frames": [40, 41], "rate": 1 / 3, "loop": False, "trigger": "collision_done"}
@@ -959,6 +954,8 @@ class FireSpitter(spyg.Sprite, spyg.Autobuild):
         self.frequency = abs(kwargs.get("frequency", 0.3))  # shooting frequency (in 1/s) (0.0 means never shoot)
         self.direction = kwargs.get("direction", "right")  # right or left (the direction of the shooting)
         self.last_shot_fired = 0.0  # keep track of last shot fired
+        # keep the Fireballs' SpriteSheet cached as long as we are around (so spitting a Fireball never has to load it again)
+        self.acquire_asset(spyg.AssetCache.get_sprite_sheet("data/egpt.tsx"))
 
     def tick(self, game_loop):
         dt = game_loop.dt
@@ -973,15 +970,8 @@ class FireSpitter(spyg.Sprite, spyg.Autobuild):
 
 
 class Scorpion(spyg.AnimatedSprite):
-    # recyclable SpriteSheets
-    sprite_sheet = None
-
     def __init__(self, x, y):
-        # init our recyclable SpriteSheets
-        if not self.sprite_sheet:
-            self.sprite_sheet = spyg.SpriteSheet("data/enemies.tsx")
-
-        super().__init__(x, y, self.sprite_sheet, {
+        super().__init__(x, y, spyg.AssetCache.get_sprite_sheet("data/enemies.tsx"), {
             "default":  "stand",
             "stand":    {"frames": [72], "loop": False, "priority": 0},
             "get_hurt": {"frames": [72], "rate": 1 / 3, "loop": False, "next": "stand", "flags": spyg.Animation.get_flag("paralyzes"), "priority": 5},
@@ -1063,16 +1053,11 @@ class Scorpion(spyg.AnimatedSprite):
 
 
 class Dinosaur(spyg.AnimatedSprite):
-    sprite_sheet = None
-
     def __init__(self, x, y, color="blue"):
-        if not self.sprite_sheet:
-            self.sprite_sheet = spyg.SpriteSheet("data/enemies.tsx")
-
         self.color = color
         self.frame_offset = 0 if self.color == "blue" else 24 if self.color == "red" else 12
 
-        super().__init__(x, y, self.sprite_sheet, {
+        super().__init__(x, y, spyg.AssetCache.get_sprite_sheet("data/enemies.tsx"), {
             "default":  "stand",
             "stand":    {"frames": [4 + self.frame_offset], "loop": False, "priority": 0},
             "get_hurt": {"frames": [9 + self.frame_offset, 10 + self.frame_offset], "rate": 1 / 2, "loop": False,
@@ -1162,7 +1147,7 @@ class DinosaurBrain(spyg.AIBrain):
 
 class Coconut(spyg.AnimatedSprite):
     def __init__(self, x, y, **kwargs):
-        super().__init__(x, y, spyg.SpriteSheet("data/coconut.tsx"), {
+        super().__init__(x, y, spyg.AssetCache.get_sprite_sheet("data/coconut.tsx"), {
             "default": "stand",
             "stand": {"frames": [0]},
             "roll": {"frames": [0, 1, 2, 3], "rate": 1 / 5, "loop": True},
@@ -0,0 +1,12 @@
+"""
+ -------------------------------------------------------------------------
+ spygame - conftest.py
+
+ shared setup for the spygame tests (run with: python -m pytest tests)
+ -------------------------------------------------------------------------
+"""
+
+import os
+
+# we don't need a window for the tests
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
@@ -0,0 +1,137 @@
+"""
+ -------------------------------------------------------------------------
+ spygame - test_collisions.py
+
+ checks that the optimized Sprite-vs-Sprite collision paths find exactly the
+ same collisions (in the same order) as the brute-force loop
+ -------------------------------------------------------------------------
+"""
+
+import random
+
+import pytest
+
+import spygame as spyg
+
+
+class LogSprite(spyg.Sprite):
+    """
+    A 16x16 Sprite that logs all its collisions into a (shared) list.
+    """
+    def __init__(self, x, y, log):
+        super().__init__(x, y, width_height=(16, 16))
+        self.log = log
+        self.register_event("collision")
+        self.on_event("collision")
+
+    def collision(self, col):
+        self.log.append((col.sprite1.stage_order, col.sprite2.stage_order, col.direction, col.normal_x, col.normal_y, col.distance))
+
+
+def run_stage(options, num_sprites=300, frames=10, seed=0):
+    """
+    Runs a Stage with randomly placed (and randomly moving) Sprites in a corridor and returns the log of all collisions.
+
+    :param dict options: the options for the Stage (e.g. broad_phase and physics_collision_detector)
+    :param int num_sprites: the number of Sprites to add to the Stage
+    :param int frames: the number of frames to run
+    :param int seed: the random seed to use for placing and moving the Sprites
+    :return: the list of all logged collisions (with ("frame", i) markers)
+    :rtype: list
+    """
+    rnd = random.Random(seed)
+    log = []
+    stage = spyg.Stage(spyg.SimpleScreen("test", display=spyg.HeadlessDisplay(100, 100)), dict(options))
+    for _ in range(num_sprites):
+        stage.add_sprite(LogSprite(rnd.randrange(800), rnd.randrange(200), log), "test")
+    for frame in range(frames):
+        for sprite in stage.sprites:
+            # most Sprites don't move at all in a frame
+            if rnd.random() < 0.3:
+                sprite.rect.x += rnd.randint(-3, 3)
+                sprite.rect.y += rnd.randint(-3, 3)
+        # a Sprite leaving the Stage in the middle of the run
+        if frame == frames // 2:
+            stage.force_remove_sprite(stage.sprites[0])
+        log.append(("frame", frame))
+        stage.solve_collisions()
+    return log
+
+
+def test_sweep_and_prune_equals_brute_force():
+    expected = run_stage({"broad_phase": None})
+    assert len(expected) > 100  # make sure we actually test something
+    assert run_stage({"broad_phase": spyg.SweepAndPrune}) == expected
+
+
+def test_spatial_hash_grid_equals_brute_force():
+    expected = run_stage({"broad_phase": None})
+    assert run_stage({"broad_phase": spyg.SpatialHashGrid}) == expected
+
+
+def test_locate_with_broad_phase_equals_brute_force():
+    stages = [spyg.Stage(spyg.SimpleScreen("test", display=spyg.HeadlessDisplay(100, 100)), {"broad_phase": broad_phase})
+              for broad_phase in (None, spyg.SpatialHashGrid, spyg.SweepAndPrune)]
+    for stage in stages:
+        rnd = random.Random(0)
+        for _ in range(200):
+            stage.add_sprite(LogSprite(rnd.randrange(800), rnd.randrange(200), []), "test")
+        # move the Sprites' rects in place (no re-indexing call in between)
+        for sprite in stage.sprites:
+            sprite.rect.x += rnd.randint(-20, 20)
+
+    rnd = random.Random(1)
+    for _ in range(200):
+        x, y = rnd.randrange(800), rnd.randrange(200)
+        found = [stage.locate(x, y, 8, 8) for stage in stages]
+        expected = found[0].sprite2.stage_order if found[0] else None
+        for col in found[1:]:
+            assert (col.sprite2.stage_order if col else None) == expected
+
+
+def test_batched_collisions_equal_unbatched():
+    expected = run_stage({"physics_collision_detector": spyg.AABBCollision.collide})
+    assert run_stage({"physics_collision_detector": spyg.NumpyAABBCollision}) == expected
+
+
+@pytest.mark.parametrize("broad_phase", [None, spyg.SpatialHashGrid, spyg.SweepAndPrune])
+def test_temporal_coherence_equals_brute_force(broad_phase):
+    expected = run_stage({"broad_phase": broad_phase})
+    assert run_stage({"broad_phase": broad_phase, "temporal_coherence": True}) == expected
+
+
+@pytest.mark.parametrize("temporal_coherence", [False, True])
+def test_temporal_coherence_sees_changed_types_and_masks(temporal_coherence):
+    """
+    Two overlapping Sprites that never move, but change their type, collision_mask or ignored state.
+    """
+    log = []
+    stage = spyg.Stage(spyg.SimpleScreen("test", display=spyg.HeadlessDisplay(100, 100)), {"temporal_coherence": temporal_coherence})
+    a = LogSprite(0, 0, log)
+    b = LogSprite(5, 5, log)
+    stage.add_sprites([a, b], "test")
+    b.type = spyg.Sprite.get_type("ladder")
+    for change in (lambda: None, lambda: setattr(b, "type", spyg.Sprite.get_type("default")), lambda: setattr(a, "ignore_after_n_ticks", 0),
+                   lambda: setattr(a, "ignore_after_n_ticks", 1), lambda: setattr(b, "collision_mask", 0),
+                   lambda: setattr(b, "collision_mask", spyg.Sprite.get_type("default"))):
+        change()
+        stage.solve_collisions()
+        log.append("frame")
+    pairs = [tuple(entry[:2]) if entry != "frame" else entry for entry in log]
+    assert pairs == ["frame", (0, 1), (1, 0), (1, 0), (0, 1), "frame", (1, 0), (0, 1), "frame", (0, 1), (1, 0), (1, 0), (0, 1), "frame", "frame",
+                     (0, 1), (1, 0), (1, 0), (0, 1), "frame"]
+
+
+def test_temporal_coherence_counts_skipped_pair_tests():
+    stage = spyg.Stage(spyg.SimpleScreen("test", display=spyg.HeadlessDisplay(100, 100)), {"temporal_coherence": True})
+    rnd = random.Random(0)
+    for _ in range(100):
+        stage.add_sprite(LogSprite(rnd.randrange(400), rnd.randrange(100), []), "test")
+    stage.solve_collisions()
+    all_tests = stage.frame_stats["collision_tests"]
+    assert stage.frame_stats["pair_tests_skipped"] == 0
+    # only one Sprite moves: all pair tests of the other (unmoved) Sprites that didn't involve the moved one are skipped
+    stage.sprites[0].rect.x += 1
+    stage.solve_collisions()
+    assert stage.frame_stats["collision_tests"] < all_tests
+    assert stage.frame_stats["collision_tests"] + stage.frame_stats["pair_tests_skipped"] == all_tests
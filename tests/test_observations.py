@@ -0,0 +1,66 @@
+"""
+ -------------------------------------------------------------------------
+ spygame - test_observations.py
+
+ checks the numpy observations exported from the rendered frame
+ (Display.get_observation)
+ -------------------------------------------------------------------------
+"""
+
+import numpy as np
+import pygame
+import pytest
+
+import spygame as spyg
+
+
+# module scope: there can only be one Display (with a window) per process
+@pytest.fixture(scope="module", params=[spyg.Display, spyg.HeadlessDisplay], ids=lambda display_class: display_class.__name__)
+def display(request):
+    return request.param(64, 48)
+
+
+def render_frame(display, x):
+    """
+    Renders one frame (a red 8x8 square at x/0 on a blue background) and returns the expected RGB pixels.
+
+    :param spyg.Display display: the Display to render on
+    :param int x: the x-position of the red square
+    :return: the expected (height x width x 3) pixels
+    :rtype: np.ndarray
+    """
+    display.surface.fill((0, 0, 255))
+    display.surface.fill((255, 0, 0), pygame.Rect(x, 0, 8, 8))
+    expected = np.zeros((display.height, display.width, 3), dtype=np.uint8)
+    expected[:, :] = (0, 0, 255)
+    expected[0:8, x:x + 8] = (255, 0, 0)
+    return expected
+
+
+def test_observation_is_kept_over_frames(display):
+    expected = render_frame(display, 0)
+    observation = display.get_observation()
+    assert (observation == expected).all()
+    # the next frame doesn't change the returned array (and the Surface is not locked anymore)
+    assert not display.surface.get_locked()
+    render_frame(display, 20)
+    assert (observation == expected).all()
+
+
+def test_observation_region_and_downsample(display):
+    expected = render_frame(display, 10)
+    sprite = spyg.Sprite(12, 2, width_height=(4, 4))
+    # a region that would reach outside the Display (gets moved back in)
+    observation = display.get_observation(sprite=sprite, size=(32, 24), downsample=2)
+    assert observation.shape == (12, 16, 3)
+    assert (observation == expected[0:24:2, 0:32:2]).all()
+    assert observation.flags.owndata
+    assert not display.surface.get_locked()
+
+
+def test_grayscale_observation(display):
+    expected = render_frame(display, 0)
+    observation = display.get_observation(grayscale=True, downsample=4)
+    luminance = (expected[::4, ::4].astype(np.uint16) @ np.array([77, 150, 29], dtype=np.uint16)) >> 8
+    assert observation.dtype == np.uint8
+    assert (observation == luminance).all()
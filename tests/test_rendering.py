@@ -0,0 +1,104 @@
+"""
+ -------------------------------------------------------------------------
+ spygame - test_rendering.py
+
+ checks that the optimized render paths produce exactly the same pixels as
+ a full redraw
+ -------------------------------------------------------------------------
+"""
+
+import os
+import random
+
+import pygame
+import pytest
+
+import spygame as spyg
+
+
+SPRITE_SHEET = os.path.join(os.path.dirname(__file__), "..", "examples", "platformer_2d", "data", "baleog.tsx")
+
+
+def setup_stage(display, options, seed=0):
+    """
+    Creates a new Stage with overlapping Sprites on different render_orders: some with static (single color) images, some with SpriteSheet tiles.
+
+    :param spyg.HeadlessDisplay display: the Display to use for the Stage's Screen
+    :param dict options: the options for the Stage
+    :param int seed: the random seed to use for placing the Sprites
+    :return: the new Stage object
+    :rtype: spyg.Stage
+    """
+    rnd = random.Random(seed)
+    stage = spyg.Stage(spyg.SimpleScreen("test", display=display), dict(options))
+    sheet = spyg.SpriteSheet(SPRITE_SHEET)
+    sprites = []
+    for i in range(30):
+        if i % 2:
+            sprite = spyg.Sprite(rnd.randrange(160), rnd.randrange(120), sprite_sheet=sheet, tile=rnd.randrange(len(sheet.tiles)))
+        else:
+            sprite = spyg.Sprite(rnd.randrange(160), rnd.randrange(120), width_height=(6, 6))
+            sprite.image = pygame.Surface((6, 6))
+            sprite.image.fill((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+            sprite.image_rect = sprite.image.get_rect()
+            sprite.do_render = True
+        sprite.render_order = rnd.randrange(3)
+        sprites.append(sprite)
+    stage.add_sprites(sprites, "test")
+    return stage
+
+
+def run_frames(display, stage, frames=40, seed=1):
+    """
+    Moves, animates and removes Sprites of the given Stage and renders each frame onto the Display.
+
+    :param spyg.HeadlessDisplay display: the Display to render on
+    :param spyg.Stage stage: the Stage to render
+    :param int frames: the number of frames to run
+    :param int seed: the random seed to use for changing the Sprites
+    :return: the rendered pixels of each frame
+    :rtype: List[np.ndarray]
+    """
+    rnd = random.Random(seed)
+    spyg.Stage.stages = [stage]
+    pixels = []
+    for frame in range(frames):
+        for sprite in list(stage.sprites):
+            sprite.rect.move_ip(rnd.randint(-3, 3), rnd.randint(-3, 3))
+            if sprite.spritesheet and rnd.random() < 0.3:
+                sheet = sprite.spritesheet
+                tile = rnd.randrange(len(sheet.tiles))
+                sprite.image = sheet.tiles_flipped_x[tile] if rnd.random() < 0.5 else sheet.tiles[tile]
+        if frame == frames // 2:
+            stage.force_remove_sprite(stage.sprites[3])
+        spyg.Stage.render_stages(display)
+        pixels.append(display.get_pixels().copy())
+    return pixels
+
+
+def render(options, dirty_rect_rendering=False):
+    display = spyg.HeadlessDisplay(160, 120, dirty_rect_rendering=dirty_rect_rendering)
+    return run_frames(display, setup_stage(display, options))
+
+
+@pytest.fixture(autouse=True)
+def restore_stages():
+    stages = spyg.Stage.stages
+    yield
+    spyg.Stage.stages = stages
+
+
+@pytest.mark.parametrize("batched_rendering", [False, True])
+def test_dirty_rect_frames_equal_full_redraw(batched_rendering):
+    expected = render({"batched_rendering": batched_rendering})
+    actual = render({"batched_rendering": batched_rendering}, dirty_rect_rendering=True)
+    for frame, (a, b) in enumerate(zip(actual, expected)):
+        assert (a == b).all(), "dirty-rect frame {} differs from the full redraw".format(frame)
+
+
+@pytest.mark.parametrize("batched_rendering", [False, True])
+def test_texture_atlas_equals_plain_blits(batched_rendering):
+    expected = render({"batched_rendering": False, "texture_atlas": False})
+    actual = render({"batched_rendering": batched_rendering, "texture_atlas": True})
+    for frame, (a, b) in enumerate(zip(actual, expected)):
+        assert (a == b).all(), "frame {} differs when rendering from the texture atlas".format(frame)
@@ -0,0 +1,165 @@
+"""
+ -------------------------------------------------------------------------
+ spygame - test_tmx_cache.py
+
+ checks that loading a tmx file from its compiled cache file (.tmxc; see
+ CompiledTiledMap) reproduces the map loaded directly via pytmx
+ -------------------------------------------------------------------------
+"""
+
+import functools
+import os
+
+import numpy as np
+import pygame
+import pytest
+import pytmx
+
+import spygame as spyg
+
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), "..", "examples")
+TMX_FILES = [os.path.join(EXAMPLES, "tutorial", "data", "tutorial.tmx"),
+             os.path.join(EXAMPLES, "maze_runner", "data", "maze.tmx"),
+             os.path.join(EXAMPLES, "platformer_2d", "data", "slope_test.tmx")]
+
+
+@pytest.fixture(params=TMX_FILES, ids=os.path.basename)
+def tmx_file(request):
+    """
+    Yields a tmx file (without an existing cache file) and removes the cache file written by the test afterwards.
+    """
+    cache_file = spyg.CompiledTiledMap.get_cache_file(request.param)
+    if os.path.isfile(cache_file):
+        os.remove(cache_file)
+    yield request.param
+    if os.path.isfile(cache_file):
+        os.remove(cache_file)
+
+
+def assert_same_map(compiled, original):
+    assert isinstance(compiled, spyg.CompiledTiledMap)
+    for key in ("width", "height", "tilewidth", "tileheight", "properties"):
+        assert getattr(compiled, key) == getattr(original, key)
+
+    # the tile images (by gid)
+    assert len(compiled.images) >= len(original.images)
+    for gid, image in enumerate(original.images):
+        if image is None:
+            assert compiled.images[gid] is None
+        else:
+            assert compiled.images[gid].get_size() == image.get_size()
+            assert pygame.image.tostring(compiled.images[gid], "RGBA") == pygame.image.tostring(image, "RGBA")
+            assert compiled.get_tile_properties_by_gid(gid) == original.get_tile_properties_by_gid(gid)
+
+    # the layers
+    assert [layer.name for layer in compiled.layers] == [layer.name for layer in original.layers]
+    for compiled_layer, layer in zip(compiled.layers, original.layers):
+        assert compiled_layer.properties == layer.properties
+        if isinstance(layer, pytmx.pytmx.TiledTileLayer):
+            assert isinstance(compiled_layer, spyg.CompiledTiledTileLayer)
+            assert np.array_equal(compiled_layer.gids, np.array(layer.data))
+            assert list(compiled_layer.iter_data()) == list(layer.iter_data())
+        else:
+            assert isinstance(compiled_layer, spyg.CompiledTiledObjectGroup)
+            keys = ("name", "type", "x", "y", "width", "height", "visible", "properties")
+            assert [[getattr(obj, key) for key in keys] for obj in compiled_layer] == [[getattr(obj, key) for key in keys] for obj in layer]
+
+
+def test_compiled_map_equals_original(tmx_file):
+    original = spyg.load_tmx(tmx_file)
+    # first load: compiles the tmx file and writes the cache file
+    compiled = spyg.load_tmx(tmx_file, use_cache=True)
+    assert os.path.isfile(spyg.CompiledTiledMap.get_cache_file(tmx_file))
+    assert_same_map(compiled, original)
+    # second load: reads the cache file
+    assert_same_map(spyg.load_tmx(tmx_file, use_cache=True), original)
+
+
+def test_cache_file_is_data_only(tmx_file):
+    spyg.load_tmx(tmx_file, use_cache=True)
+    # must be readable without allowing pickled objects
+    with np.load(spyg.CompiledTiledMap.get_cache_file(tmx_file), allow_pickle=False) as npz:
+        assert "meta" in npz.files
+
+
+def test_tile_layers_equal_original(tmx_file):
+    """
+    Builds the TiledTileLayers (TileSprites, occupancy grids and autobuild objects) from the compiled and the original map.
+    """
+    handler = functools.partial(spyg.PhysicsComponent.tile_sprite_handler, spyg.TileSprite)
+    original = spyg.load_tmx(tmx_file)
+    compiled = spyg.load_tmx(tmx_file, use_cache=True)
+    for compiled_layer, layer in zip(compiled.layers, original.layers):
+        if not isinstance(layer, pytmx.pytmx.TiledTileLayer):
+            continue
+        a = spyg.TiledTileLayer(compiled_layer, compiled, handler)
+        b = spyg.TiledTileLayer(layer, original, handler)
+        assert np.array_equal(a.tile_classes, b.tile_classes)
+        assert np.array_equal(a.max_heights, b.max_heights)
+        for (x, y), tile_sprite in np.ndenumerate(b.tile_sprites):
+            if tile_sprite:
+                assert a.tile_sprites[(x, y)].tile_props == tile_sprite.tile_props
+        get_rects = lambda objects: [(type(obj), obj.x_in_tiles, obj.y_in_tiles, obj.w_in_tiles, obj.h_in_tiles) for obj in objects]
+        assert get_rects(a.capture_autobuilds()) == get_rects(b.capture_autobuilds())
+
+
+def test_stale_cache_file_is_recompiled(tmx_file):
+    spyg.load_tmx(tmx_file, use_cache=True)
+    cache_file = spyg.CompiledTiledMap.get_cache_file(tmx_file)
+    # a broken cache file (e.g. from an older version) must not break loading
+    with open(cache_file, "wb") as f:
+        f.write(b"not a cache file")
+    assert_same_map(spyg.load_tmx(tmx_file, use_cache=True), spyg.load_tmx(tmx_file))
+
+
+def scan_autobuilds(layer):
+    """
+    Finds all autobuild objects of a TiledTileLayer tile by tile (reference for TiledTileLayer.capture_autobuilds; note that the left/top neighbor
+    of tiles at x=0/y=0 is the last tile of the row/column (index -1)).
+
+    :param spyg.TiledTileLayer layer: the layer to scan
+    :return: list of (autobuild class, x, y, w, h)-tuples (in tiles)
+    :rtype: List[tuple]
+    """
+    def get_class(x, y):
+        tile_sprite = layer.tile_sprites[(x, y)]
+        return tile_sprite.tile_props.get("autobuild_class") if tile_sprite else None
+
+    rects = []
+    width, height = layer.tile_sprites.shape
+    for y in range(height):
+        for x in range(width):
+            class_ = get_class(x, y)
+            if not class_ or get_class(x - 1, y) == class_ or get_class(x, y - 1) == class_:
+                continue
+            w = 1
+            while x + w < width and get_class(x + w, y) == class_:
+                w += 1
+            h = 1
+            while y + h < height and get_class(x, y + h) == class_:
+                h += 1
+            rects.append((class_, x, y, w, h))
+    return rects
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_capture_autobuilds_matches_tile_scan(seed):
+    rnd = np.random.RandomState(seed)
+    tmx_obj = spyg.load_tmx(TMX_FILES[0])
+    layer = next(layer for layer in tmx_obj.layers if isinstance(layer, pytmx.pytmx.TiledTileLayer))
+    tiled_tile_layer = spyg.TiledTileLayer(layer, tmx_obj, functools.partial(spyg.PhysicsComponent.tile_sprite_handler, spyg.TileSprite))
+    # turn random tiles (also those at the edges) into autobuild tiles of two different classes
+    for (x, y), tile_sprite in np.ndenumerate(tiled_tile_layer.tile_sprites):
+        if tile_sprite:
+            tile_sprite.tile_props = {key: value for key, value in tile_sprite.tile_props.items() if key != "autobuild_class"}
+            r = rnd.rand()
+            if r < 0.3:
+                tile_sprite.tile_props["autobuild_class"] = spyg.Ladder
+            elif r < 0.5:
+                tile_sprite.tile_props["autobuild_class"] = spyg.LiquidBody
+
+    expected = scan_autobuilds(tiled_tile_layer)
+    assert len(expected) > 0
+    objects = tiled_tile_layer.capture_autobuilds()
+    assert [(type(obj), obj.x_in_tiles, obj.y_in_tiles, obj.w_in_tiles, obj.h_in_tiles) for obj in objects] == expected